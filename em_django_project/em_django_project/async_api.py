@@ -0,0 +1,135 @@
+"""
+Асинхронные представления только для чтения (list / retrieve) под ASGI.
+
+Синхронные ViewSet DRF под ASGI выполняются в пуле потоков и занимают поток
+на все время запроса. Представления этого модуля — нативные async-view
+Django: данные читаются асинхронным ORM, а аутентификация, права доступа,
+пагинация, сериализация и рендеринг — классы DRF из настроек и атрибутов
+представления, поэтому ответы совпадают с ответами синхронных эндпоинтов.
+Аутентификация и права проверяются синхронными классами DRF одним
+переходом в пул потоков; пагинация с методом apaginate_queryset читает
+страницу асинхронно, любая другая — тоже в пуле потоков.
+"""
+
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest, HttpResponse
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .tenancy import scope_to_company
+
+
+class AsyncReadOnlyView(View):
+    """
+    Базовое асинхронное представление списка и объекта модели.
+
+    Атрибуты:
+    - queryset: объекты модели; обязателен, если подкласс не переопределяет
+      get_queryset(request).
+    - serializer_class: сериализатор DRF для ответа.
+    - pagination_class: класс пагинации DRF или None.
+    - authentication_classes, permission_classes: как у APIView DRF.
+
+    Подклассы задают queryset или переопределяют get_queryset(request);
+    текущее действие (list или retrieve) доступно в self.action, как у
+    ViewSet. Queryset ограничивается компанией пользователя
+    (см. tenancy.scope_to_company).
+    """
+
+    http_method_names = ["get", "head", "options"]
+    queryset = None
+    serializer_class = None
+    pagination_class = None
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    permission_classes = [IsAuthenticated]
+    action = None
+    renderer = JSONRenderer()
+
+    def get_queryset(self, request: Request):
+        assert self.queryset is not None, (
+            f"'{self.__class__.__name__}' should either include a `queryset` "
+            "attribute, or override the `get_queryset()` method."
+        )
+        return self.queryset.all()
+
+    def get_scoped_queryset(self, request: Request):
+        return scope_to_company(self.get_queryset(request), request.user.company_id)
+
+    def initialize_request(self, request: HttpRequest) -> Request:
+        return Request(
+            request,
+            authenticators=[auth() for auth in self.authentication_classes],
+        )
+
+    def check_permissions(self, request: Request) -> None:
+        """
+        Аутентифицирует пользователя (при первом обращении к request.user)
+        и проверяет права, как APIView.check_permissions.
+        """
+        for permission in [permission() for permission in self.permission_classes]:
+            if not permission.has_permission(request, self):
+                if request.authenticators and not request.successful_authenticator:
+                    raise exceptions.NotAuthenticated
+                raise exceptions.PermissionDenied(
+                    getattr(permission, "message", None),
+                    getattr(permission, "code", None),
+                )
+
+    def get_authenticate_header(self, request: Request) -> str | None:
+        if request.authenticators:
+            return request.authenticators[0].authenticate_header(request)
+        return None
+
+    def render(self, data, status_code: int = status.HTTP_200_OK) -> HttpResponse:
+        return HttpResponse(
+            self.renderer.render(data),
+            status=status_code,
+            content_type=self.renderer.media_type,
+        )
+
+    async def get(self, request: HttpRequest, pk: str | None = None) -> HttpResponse:
+        drf_request = self.initialize_request(request)
+        try:
+            await sync_to_async(self.check_permissions)(drf_request)
+            if pk is None:
+                self.action = "list"
+                return await self.list(drf_request)
+            self.action = "retrieve"
+            return await self.retrieve(drf_request, pk)
+        except exceptions.APIException as exc:
+            detail = (
+                exc.detail if isinstance(exc.detail, dict) else {"detail": exc.detail}
+            )
+            response = self.render(detail, exc.status_code)
+            authenticate_header = self.get_authenticate_header(drf_request)
+            if exc.status_code == status.HTTP_401_UNAUTHORIZED and authenticate_header:
+                response["WWW-Authenticate"] = authenticate_header
+            return response
+
+    async def list(self, request: Request) -> HttpResponse:
+        queryset = self.get_scoped_queryset(request)
+        if self.pagination_class is None:
+            objects = [obj async for obj in queryset]
+            return self.render(self.serializer_class(objects, many=True).data)
+
+        paginator = self.pagination_class()
+        if hasattr(paginator, "apaginate_queryset"):
+            page = await paginator.apaginate_queryset(queryset, request, view=self)
+        else:
+            page = await sync_to_async(paginator.paginate_queryset)(
+                queryset, request, view=self
+            )
+        data = self.serializer_class(page, many=True).data
+        return self.render(paginator.get_paginated_response(data).data)
+
+    async def retrieve(self, request: Request, pk: str) -> HttpResponse:
+        if not pk.isdigit():
+            raise exceptions.NotFound
+        objects = [obj async for obj in self.get_scoped_queryset(request).filter(pk=pk)]
+        if not objects:
+            raise exceptions.NotFound
+        return self.render(self.serializer_class(objects[0]).data)
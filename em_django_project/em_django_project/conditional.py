@@ -0,0 +1,151 @@
+"""
+Условные HTTP-запросы (ETag / Last-Modified) для ModelViewSet.
+
+Версия объекта — пара (pk, updated_at), которую можно получить одним
+легким запросом без загрузки связей и без сериализации. Поэтому ответ
+304 Not Modified для объекта и проверка If-Match для изменений обходятся
+без сериализатора.
+
+ETag списка считается по сериализованному ответу: страница зависит
+не только от версий ее строк, но и от соседних (ссылки next/previous,
+строки, ушедшие со страницы). Для списка 304 экономит только передачу
+тела: запрос страницы, предзагрузка связей и сериализация выполняются.
+"""
+
+import hashlib
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def make_etag(*parts) -> str:
+    """Возвращает строгий ETag (в кавычках) для набора значений."""
+    digest = hashlib.md5(
+        "|".join(map(str, parts)).encode(), usedforsecurity=False
+    ).hexdigest()
+    return quote_etag(digest)
+
+
+def make_body_etag(data) -> str:
+    """Возвращает строгий ETag для данных ответа (до рендеринга)."""
+    return make_etag(json.dumps(data, cls=JSONEncoder, sort_keys=True))
+
+
+class ConditionalRequestMixin:
+    """
+    Примесь для ModelViewSet с поддержкой условных запросов.
+
+    - retrieve: ETag и Last-Modified; If-None-Match / If-Modified-Since
+      возвращают 304 без загрузки и сериализации объекта. Если ответ
+      зависит не только от версии объекта (uses_body_etag(), например
+      встроенные ?expand= связи), ETag считается по сериализованному
+      ответу, а Last-Modified не отдается.
+    - list: ETag по сериализованной странице вместе со ссылками пагинации;
+      If-None-Match возвращает 304 без тела ответа.
+    - update, partial_update, destroy: If-Match проверяется под блокировкой
+      строки, при несовпадении возвращается 412 Precondition Failed.
+
+    Модель должна иметь поле, обновляемое при каждом изменении
+    (по умолчанию updated_at).
+    """
+
+    version_field = "updated_at"
+
+    def get_object_version(self, lock: bool = False) -> tuple:
+        """
+        Возвращает версию (pk, updated_at) запрошенного объекта одним запросом.
+
+        Аргументы:
+        - lock: заблокировать строку до конца транзакции (SELECT ... FOR UPDATE).
+        """
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None)
+        # Как и get_object_or_404 DRF, значение не того типа — это 404, а не 500.
+        try:
+            queryset = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+            if lock:
+                queryset = queryset.select_for_update()
+            version = queryset.values_list("pk", self.version_field).first()
+        except (TypeError, ValueError, ValidationError):
+            raise Http404
+        if version is None:
+            raise Http404
+        return version
+
+    def uses_body_etag(self) -> bool:
+        """
+        Считать ли ETag объекта по сериализованному ответу, а не по версии.
+
+        Переопределяется, когда в ответ попадают данные других строк,
+        изменения которых не меняют версию объекта.
+        """
+        return False
+
+    def get_object_etag(self, version: tuple) -> str:
+        return make_etag(self.get_queryset().model._meta.label, *version)
+
+    def _conditional_response(
+        self, request: Request, etag: str, last_modified=None
+    ) -> Response | None:
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=last_modified and int(last_modified.timestamp()),
+        )
+        if response is not None:
+            response["ETag"] = etag
+        return response
+
+    def _body_etag_response(self, request: Request, response: Response) -> Response:
+        etag = make_body_etag(response.data)
+        conditional = self._conditional_response(request, etag)
+        if conditional is not None:
+            return conditional
+        response["ETag"] = etag
+        return response
+
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        if self.uses_body_etag():
+            return self._body_etag_response(
+                request, super().retrieve(request, *args, **kwargs)
+            )
+        version = self.get_object_version()
+        etag = self.get_object_etag(version)
+        updated_at = version[1]
+        response = self._conditional_response(request, etag, updated_at)
+        if response is None:
+            response = super().retrieve(request, *args, **kwargs)
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(updated_at.timestamp())
+        return response
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        return self._body_etag_response(request, super().list(request, *args, **kwargs))
+
+    def _write_with_precondition(self, write, request: Request, *args, **kwargs):
+        with transaction.atomic():
+            etag = self.get_object_etag(self.get_object_version(lock=True))
+            response = self._conditional_response(request, etag)
+            if response is not None:
+                return response
+            return write(request, *args, **kwargs)
+
+    def update(self, request: Request, *args, **kwargs) -> Response:
+        response = self._write_with_precondition(
+            super().update, request, *args, **kwargs
+        )
+        if response.status_code == 200:
+            response["ETag"] = self.get_object_etag(self.get_object_version())
+        return response
+
+    def destroy(self, request: Request, *args, **kwargs) -> Response:
+        return self._write_with_precondition(super().destroy, request, *args, **kwargs)
@@ -0,0 +1,124 @@
+"""
+Выбор полей ответа (?fields=) и встраивание связанных объектов (?expand=).
+
+- ``?fields=id,name`` оставляет в ответе только перечисленные поля;
+- ``?expand=user,department`` заменяет идентификаторы внешних ключей
+  вложенными объектами.
+
+Сериализатор объявляет встраиваемые поля атрибутом ``expandable_fields``
+(имя поля -> сериализатор вложенного объекта). Примесь представления
+по тем же параметрам добавляет к queryset select_related для встраиваемых
+связей и only() для запрошенных полей, поэтому количество запросов
+не растет, а из базы читаются только нужные столбцы.
+"""
+
+from rest_framework.exceptions import ValidationError
+
+
+def _split(value: str | None) -> list[str]:
+    return [name.strip() for name in (value or "").split(",") if name.strip()]
+
+
+def parse_field_options(query_params, serializer_class) -> tuple[set | None, set]:
+    """
+    Разбирает параметры fields и expand.
+
+    Возвращает:
+    - Кортеж (запрошенные поля или None, если ограничения нет; встраиваемые поля).
+
+    Исключения:
+    - ValidationError, если поле нельзя встроить.
+    """
+    expandable = getattr(serializer_class, "expandable_fields", {})
+    expand = set(_split(query_params.get("expand")))
+    unknown = expand - expandable.keys()
+    if unknown:
+        raise ValidationError(
+            {"expand": [f"Cannot expand: {', '.join(sorted(unknown))}"]}
+        )
+    fields = set(_split(query_params.get("fields"))) or None
+    if fields is not None:
+        fields |= expand
+    return fields, expand
+
+
+class DynamicFieldsSerializerMixin:
+    """Примесь для ModelSerializer: поддержка ?fields= и ?expand=."""
+
+    expandable_fields: dict = {}
+
+    def get_fields(self) -> dict:
+        fields = super().get_fields()
+        request = self.context.get("request")
+        if request is None or request.method != "GET":
+            return fields
+        requested, expand = parse_field_options(request.query_params, type(self))
+        if requested is not None:
+            fields = {
+                name: field for name, field in fields.items() if name in requested
+            }
+        for name in expand:
+            fields[name] = self.expandable_fields[name](read_only=True)
+        return fields
+
+
+def _model_field_names(model) -> set[str]:
+    return {field.name for field in model._meta.concrete_fields}
+
+
+def optimize_queryset(queryset, serializer_class, fields: set | None, expand: set):
+    """
+    Добавляет select_related для встраиваемых связей и only() для полей ответа.
+
+    Первичный ключ и поле версии updated_at загружаются всегда: они нужны
+    условным запросам (ETag).
+    """
+    model = queryset.model
+    concrete = _model_field_names(model)
+    if fields is None:
+        fields = (
+            set(serializer_class.Meta.fields)
+            if isinstance(serializer_class.Meta.fields, (list, tuple))
+            else concrete
+        )
+    only = {model._meta.pk.name} | ({"updated_at"} & concrete)
+    for name in fields:
+        if name in expand:
+            nested = serializer_class.expandable_fields[name]
+            nested_model = nested.Meta.model
+            queryset = queryset.select_related(name)
+            only |= {
+                f"{name}__{nested_name}"
+                for nested_name in nested.Meta.fields
+                if nested_name in _model_field_names(nested_model)
+            }
+        elif name in concrete:
+            only.add(name)
+    return queryset.only(*only)
+
+
+class DynamicFieldsViewMixin:
+    """
+    Примесь для ViewSet: queryset чтения подстраивается под ?fields= и ?expand=.
+
+    Встроенные объекты не меняют версию основного объекта, поэтому при
+    ?expand= ETag (см. conditional.ConditionalRequestMixin) считается
+    по сериализованному ответу.
+    """
+
+    def uses_body_etag(self) -> bool:
+        if self.request.method == "GET" and self.request.query_params.get("expand"):
+            return True
+        return super().uses_body_etag()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        if self.request.method != "GET" or not issubclass(
+            serializer_class, DynamicFieldsSerializerMixin
+        ):
+            return queryset
+        fields, expand = parse_field_options(
+            self.request.query_params, serializer_class
+        )
+        return optimize_queryset(queryset, serializer_class, fields, expand)
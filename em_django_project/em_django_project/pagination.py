@@ -0,0 +1,164 @@
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+from rest_framework.request import Request
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Курсорная пагинация по составному ключу (keyset pagination).
+
+    В отличие от стандартной CursorPagination, позиция курсора хранит значения
+    всех полей сортировки, а не только первого, поэтому выборка следующей
+    страницы — это всегда один запрос вида
+    ``WHERE a >= :a AND (a > :a OR (a = :a AND b > :b) OR ...)
+    ORDER BY a, b, id LIMIT n`` без OFFSET и без COUNT(*). Граница по
+    первому полю дает индексу диапазон для поиска, поэтому время ответа
+    не зависит от глубины прокрутки, если под каждую сортировку есть
+    составной индекс.
+
+    Атрибуты:
+    - orderings: допустимые сортировки, ключ — значение параметра ``ordering``.
+      Последним полем каждой сортировки должен быть уникальный ``id``.
+    - default_ordering: сортировка, если параметр не передан или неизвестен.
+    """
+
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+    ordering_query_param = "ordering"
+    orderings: dict[str, tuple[str, ...]] = {}
+    default_ordering: str = ""
+
+    def get_ordering(self, request: Request, queryset: QuerySet, view=None) -> tuple:
+        """
+        Возвращает кортеж полей сортировки по параметру ``ordering``.
+
+        Префикс ``-`` разворачивает все поля ключа, чтобы сортировка
+        по-прежнему обслуживалась тем же индексом (обратным сканированием).
+        """
+        name = request.query_params.get(self.ordering_query_param, "")
+        descending = name.startswith("-")
+        ordering = self.orderings.get(name.lstrip("-"))
+        if ordering is None:
+            descending = False
+            ordering = self.orderings[self.default_ordering]
+        return self._reverse_ordering(ordering) if descending else ordering
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view=None):
+        page_queryset = self.get_page_queryset(queryset, request, view)
+        if page_queryset is None:
+            return None
+        return self.set_page(list(page_queryset))
+
+    async def apaginate_queryset(self, queryset: QuerySet, request: Request, view=None):
+        """Асинхронный вариант paginate_queryset для асинхронных представлений."""
+        page_queryset = self.get_page_queryset(queryset, request, view)
+        if page_queryset is None:
+            return None
+        return self.set_page([obj async for obj in page_queryset])
+
+    def get_page_queryset(self, queryset: QuerySet, request: Request, view=None):
+        """
+        Возвращает запрос страницы (на одну запись больше размера страницы)
+        или None, если пагинация отключена.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+
+        if self.cursor is None:
+            reverse, position = False, None
+        else:
+            reverse = self.cursor.reverse
+            position = self._decode_position(queryset, self.cursor.position)
+
+        ordering = self._reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._keyset_filter(ordering, position))
+        self._reverse, self._position = reverse, position
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, results: list) -> list:
+        """Формирует страницу из результатов запроса get_page_queryset."""
+        self.page = results[: self.page_size]
+        has_more = len(results) > self.page_size
+
+        if self._reverse:
+            self.page.reverse()
+            self.has_next = self._position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self._position is not None
+        return self.page
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next:
+            return None
+        position = self._encode_position(self.page[-1])
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self) -> str | None:
+        if not self.has_previous:
+            return None
+        position = self._encode_position(self.page[0])
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    @staticmethod
+    def _reverse_ordering(ordering: tuple) -> tuple:
+        return tuple(
+            field[1:] if field.startswith("-") else f"-{field}" for field in ordering
+        )
+
+    @staticmethod
+    def _keyset_filter(ordering: tuple, position: list) -> Q:
+        """
+        Строит условие «строго после позиции» для составного ключа:
+        ``a >= x AND (a > x OR (a = x AND b > y) OR (a = x AND b = y AND id > z))``.
+
+        Django не умеет сравнивать строки значений ``(a, b, id) > (x, y, z)``,
+        а по одному OR-разложению планировщик не выделяет диапазон индекса и
+        читает префикс с начала. Избыточное ``a >= x`` задает этот диапазон.
+        """
+        first = ordering[0]
+        bound = "lte" if first.startswith("-") else "gte"
+        leading = Q(**{f"{first.lstrip('-')}__{bound}": position[0]})
+        condition = Q()
+        equal_prefix = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= equal_prefix & Q(**{f"{name}__{lookup}": value})
+            equal_prefix &= Q(**{name: value})
+        return leading & condition
+
+    def _encode_position(self, instance) -> str:
+        values = []
+        for field in self.ordering:
+            value = getattr(instance, field.lstrip("-"))
+            values.append(value.isoformat() if hasattr(value, "isoformat") else value)
+        return json.dumps(values)
+
+    def _decode_position(self, queryset: QuerySet, position: str | None) -> list | None:
+        if position is None:
+            return None
+        try:
+            values = json.loads(position)
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError
+            return [
+                queryset.model._meta.get_field(field.lstrip("-")).to_python(value)
+                for field, value in zip(self.ordering, values)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
@@ -0,0 +1,101 @@
+"""
+Контроль количества SQL-запросов (query budget).
+
+Представление объявляет бюджет запросов для своих действий атрибутом
+``query_budget``, например ``{"list": 4, "retrieve": 4}``. Бюджет проверяется:
+
+- в тестах — контекстным менеджером ``assert_max_queries``;
+- при DEBUG — middleware ``QueryBudgetMiddleware``, который падает,
+  если эндпоинт выполнил больше запросов, чем объявлено.
+"""
+
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Эндпоинт выполнил больше SQL-запросов, чем разрешено бюджетом."""
+
+
+def _check_budget(captured: CaptureQueriesContext, limit: int, label: str) -> None:
+    executed = len(captured.captured_queries)
+    if executed > limit:
+        queries = "\n".join(query["sql"] for query in captured.captured_queries)
+        raise QueryBudgetExceeded(
+            f"{label}: выполнено {executed} запросов при бюджете {limit}\n{queries}"
+        )
+
+
+@contextmanager
+def assert_max_queries(limit: int, label: str = "query budget"):
+    """
+    Проверяет, что блок кода выполняет не больше ``limit`` SQL-запросов.
+
+    Аргументы:
+    - limit: максимальное количество запросов.
+    - label: подпись для сообщения об ошибке.
+
+    Пример:
+        with assert_max_queries(4):
+            client.get("/tasks/api/v1/")
+    """
+    with CaptureQueriesContext(connection) as captured:
+        yield captured
+    _check_budget(captured, limit, label)
+
+
+def get_view_budget(view_func, method: str) -> tuple[int | None, str]:
+    """
+    Возвращает бюджет запросов, объявленный представлением для HTTP-метода.
+
+    Для ViewSet действие определяется по маршруту (list, retrieve, ...),
+    для обычных APIView — по имени метода (get, post, ...).
+    """
+    view_class = getattr(view_func, "cls", None) or getattr(
+        view_func, "view_class", None
+    )
+    budget = getattr(view_class, "query_budget", None)
+    if not budget:
+        return None, ""
+    actions = getattr(view_func, "actions", None) or {}
+    action = actions.get(method.lower(), method.lower())
+    return budget.get(action), f"{view_class.__name__}.{action}"
+
+
+class QueryBudgetMiddleware:
+    """
+    Middleware, проверяющий бюджет запросов эндпоинтов в режиме отладки.
+
+    Включается настройкой QUERY_BUDGET_ENABLED (по умолчанию равна DEBUG).
+    В асинхронной цепочке (ASGI) запросы не перехватываются: асинхронный ORM
+    выполняет их в других потоках, а синхронный middleware заставил бы
+    Django выполнять асинхронные представления в пуле потоков.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "QUERY_BUDGET_ENABLED", settings.DEBUG):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.get_response(request)
+        with CaptureQueriesContext(connection) as captured:
+            response = self.get_response(request)
+        limit, label = getattr(request, "_query_budget", (None, ""))
+        if limit is not None:
+            _check_budget(captured, limit, label)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._query_budget = get_view_budget(view_func, request.method)
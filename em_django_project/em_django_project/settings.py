@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
+import os
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 
@@ -53,8 +55,13 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "em_django_project.query_budget.QueryBudgetMiddleware",
+    "registration.hashing.HashingPoolBusyMiddleware",
 ]
 
+# Проверка бюджета SQL-запросов эндпоинтов (см. em_django_project/query_budget.py)
+QUERY_BUDGET_ENABLED = DEBUG
+
 ROOT_URLCONF = "em_django_project.urls"
 
 TEMPLATES = [
@@ -88,6 +95,9 @@ DATABASES = {
 
 AUTH_USER_MODEL = "registration.User"
 
+# Проверка пароля при входе выполняется в пуле хеширования
+AUTHENTICATION_BACKENDS = ["registration.backends.PooledPasswordBackend"]
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -110,6 +120,22 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
+    # Число доверенных прокси перед приложением: IP клиента для лимитов
+    # берется из X-Forwarded-For с их учетом. При 0 заголовок
+    # не используется (его может подставить сам клиент) — берется REMOTE_ADDR
+    "NUM_PROXIES": int(os.environ.get("NUM_PROXIES", 0)),
+    # Лимиты скользящего окна (em_django_project/throttling.py):
+    # <throttle_scope>.ip — на IP-адрес, <throttle_scope>.account — на почту
+    "DEFAULT_THROTTLE_RATES": {
+        "check_account.ip": "20/hour",
+        "check_account.account": "3/hour",
+        "sign_up.ip": "30/hour",
+        "sign_up.account": "10/hour",
+        "confirm_registration.ip": "30/hour",
+        "confirm_registration.account": "10/hour",
+        "login.ip": "60/min",
+        "login.account": "10/min",
+    },
 }
 
 SIMPLE_JWT = {
@@ -120,6 +146,73 @@ SIMPLE_JWT = {
     "SLIDING_TOKEN_LIFETIME_LATE_USER": timedelta(days=30),
 }
 
+# Пакетная запись задач (POST /tasks/api/v1/bulk/)
+TASKS_BULK_MAX_ITEMS = 1000
+TASKS_BULK_BATCH_SIZE = 500
+
+# Время жизни кэша статистики загрузки (GET /tasks/api/v1/stats/), секунды
+TASKS_STATS_CACHE_TIMEOUT = 60 * 60
+
+# Размер пачки при потоковой выгрузке задач (GET /tasks/api/v1/export/)
+TASKS_EXPORT_CHUNK_SIZE = 2000
+
+# Сканер просроченных задач (manage.py scan_deadlines)
+TASKS_DEADLINE_SCAN_BATCH_SIZE = 500
+TASKS_DEADLINE_SCAN_INTERVAL = 60
+
+# Инкрементальная синхронизация задач (GET /tasks/api/v1/changes/)
+TASKS_CHANGES_PAGE_SIZE = 500
+TASKS_CHANGES_RETENTION_DAYS = 30
+# Записи журнала моложе этого числа секунд не выдаются: транзакция
+# с меньшим id могла еще не зафиксироваться (см. tasks/changes.py)
+TASKS_CHANGES_SETTLE_SECONDS = 5
+
+# Общий для всех процессов кэш: версии и снимки должны быть видны
+# всем воркерам, иначе сброс в одном процессе не дойдет до остальных.
+# В рабочем окружении задается Redis, например
+# CACHE_BACKEND=django.core.cache.backends.redis.RedisCache и
+# CACHE_LOCATION=redis://127.0.0.1:6379/1; по умолчанию (для разработки) —
+# файловый кэш, общий для процессов одной машины
+CACHE_BACKEND = os.environ.get(
+    "CACHE_BACKEND", "django.core.cache.backends.filebased.FileBasedCache"
+)
+CACHE_LOCATION = os.environ.get(
+    "CACHE_LOCATION", os.path.join(tempfile.gettempdir(), "em_django_project_cache")
+)
+# Счетчики ограничения частоты запросов: отдельное хранилище, чтобы их
+# не вытесняли снимки и не сбрасывала очистка основного кэша. В рабочем
+# окружении — отдельная база Redis, например THROTTLE_CACHE_BACKEND=
+# django.core.cache.backends.redis.RedisCache и THROTTLE_CACHE_LOCATION=
+# redis://127.0.0.1:6379/2; по умолчанию — свой каталог файлового кэша
+THROTTLE_CACHE_BACKEND = os.environ.get(
+    "THROTTLE_CACHE_BACKEND", "django.core.cache.backends.filebased.FileBasedCache"
+)
+THROTTLE_CACHE_LOCATION = os.environ.get(
+    "THROTTLE_CACHE_LOCATION",
+    os.path.join(tempfile.gettempdir(), "em_django_project_throttle"),
+)
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": CACHE_LOCATION,
+    },
+    "throttle": {
+        "BACKEND": THROTTLE_CACHE_BACKEND,
+        "LOCATION": THROTTLE_CACHE_LOCATION,
+    },
+}
+THROTTLE_CACHE = "throttle"
+
+# Снимок оргструктуры компании (GET /organizations/api/v1/tree/), секунды
+ORG_SNAPSHOT_CACHE_TIMEOUT = 24 * 60 * 60
+ORG_SNAPSHOT_LOCK_TIMEOUT = 30
+ORG_SNAPSHOT_WAIT_TIMEOUT = 5
+ORG_SNAPSHOT_WAIT_INTERVAL = 0.05
+
+# Импорт оргструктуры из CSV или JSON (POST /organizations/api/v1/import/)
+ORG_IMPORT_MAX_ROWS = 50000
+ORG_IMPORT_BATCH_SIZE = 1000
+
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 EMAIL_HOST = "smtp.example.com"
 EMAIL_PORT = 587
@@ -127,6 +220,34 @@ EMAIL_USE_TLS = True
 EMAIL_HOST_USER = "email@example.com"
 EMAIL_HOST_PASSWORD = "email_password"
 
+# Приглашения для регистрации: срок действия, секунды, и размер пачки
+# при удалении истекших (команда purge_account_invites)
+REGISTRATION_INVITE_TTL = 24 * 60 * 60
+REGISTRATION_INVITE_PURGE_BATCH_SIZE = 1000
+
+# Пакетное приглашение пользователей (POST /auth/api/v1/invite_users/)
+REGISTRATION_INVITE_MAX_USERS = 1000
+REGISTRATION_INVITE_BATCH_SIZE = 500
+
+# Пул процессов для хеширования паролей (registration/hashing.py); 0 —
+# хешировать в потоке запроса. При заполненном пуле запрос ждет
+# PASSWORD_HASH_WAIT_TIMEOUT секунд и получает 503 с Retry-After
+PASSWORD_HASH_POOL_SIZE = os.cpu_count() or 1
+PASSWORD_HASH_MAX_PENDING = 4 * PASSWORD_HASH_POOL_SIZE
+PASSWORD_HASH_WAIT_TIMEOUT = 2
+PASSWORD_HASH_RETRY_AFTER = 1
+
+# Очередь исходящих писем (команда send_outbox). Для проверки без SMTP
+# команде можно передать --backend django.core.mail.backends.console.EmailBackend
+# или filebased.EmailBackend вместе с EMAIL_FILE_PATH
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_INTERVAL = 5
+# Попытки отправки: задержка перед повтором удваивается, начиная
+# с EMAIL_OUTBOX_RETRY_DELAY секунд; аренда пачки — EMAIL_OUTBOX_LEASE_TIMEOUT
+EMAIL_OUTBOX_MAX_ATTEMPTS = 6
+EMAIL_OUTBOX_RETRY_DELAY = 60
+EMAIL_OUTBOX_LEASE_TIMEOUT = 5 * 60
+
 LANGUAGE_CODE = "ru"
 
 TIME_ZONE = "Europe/Moscow"
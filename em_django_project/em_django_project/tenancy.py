@@ -0,0 +1,67 @@
+"""
+Разделение данных по компаниям (тенантам).
+
+Модель, данные которой принадлежат компании, объявляет атрибут
+``tenant_field`` — путь к внешнему ключу на Company, например "company"
+или "department__company". Примеси этого модуля ограничивают querysets
+представлений и связанные поля сериализаторов компанией текущего
+пользователя, поэтому один тенант не видит и не может сослаться
+на строки другого.
+"""
+
+from django.db.models import QuerySet
+
+
+def scope_to_company(queryset: QuerySet, company_id: int) -> QuerySet:
+    """
+    Ограничивает queryset строками компании.
+
+    Модели без ``tenant_field`` возвращаются без изменений.
+    """
+    tenant_field = getattr(queryset.model, "tenant_field", None)
+    if tenant_field is None:
+        return queryset
+    return queryset.filter(**{f"{tenant_field}_id": company_id})
+
+
+def _has_company_field(model) -> bool:
+    return any(field.name == "company" for field in model._meta.concrete_fields)
+
+
+class TenantScopedMixin:
+    """
+    Примесь для ViewSet: все операции выполняются в компании пользователя.
+
+    - get_queryset ограничивается компанией request.user;
+    - при создании объекта компания берется из request.user, если у модели
+      есть поле company.
+    """
+
+    def get_queryset(self) -> QuerySet:
+        return scope_to_company(super().get_queryset(), self.request.user.company_id)
+
+    def perform_create(self, serializer) -> None:
+        if _has_company_field(serializer.Meta.model):
+            serializer.save(company_id=self.request.user.company_id)
+        else:
+            serializer.save()
+
+
+class TenantScopedSerializerMixin:
+    """
+    Примесь для ModelSerializer: связанные поля принимают только объекты
+    компании пользователя из контекста запроса.
+    """
+
+    def get_fields(self) -> dict:
+        fields = super().get_fields()
+        request = self.context.get("request")
+        company_id = getattr(getattr(request, "user", None), "company_id", None)
+        if company_id is None:
+            return fields
+        for field in fields.values():
+            related = getattr(field, "child_relation", field)
+            queryset = getattr(related, "queryset", None)
+            if queryset is not None:
+                related.queryset = scope_to_company(queryset, company_id)
+        return fields
@@ -0,0 +1,44 @@
+"""
+Общие настройки и данные для тестов приложений.
+
+Тесты не зависят от внешних сервисов и работают быстро: кэши — в памяти
+процесса, пароли хешируются MD5 в потоке теста, без пула процессов.
+"""
+
+from unittest import mock
+
+from registration.models import Company, User
+
+TEST_SETTINGS = {
+    "CACHES": {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+        "throttle": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "throttle",
+        },
+    },
+    "PASSWORD_HASHERS": ["django.contrib.auth.hashers.MD5PasswordHasher"],
+    "PASSWORD_HASH_POOL_SIZE": 0,
+}
+
+
+def create_user(company: Company, account: str, **fields) -> User:
+    """Создает активного пользователя компании с паролем "password"."""
+    fields = {"first_name": "First", "last_name": "Last", "is_active": True, **fields}
+    return User.objects.create_user(
+        username=account,
+        account=account,
+        password="password",
+        company=company,
+        **fields,
+    )
+
+
+def broken_cache() -> mock.Mock:
+    """Кэш, каждый вызов которого падает, как при недоступном Redis."""
+    return mock.Mock(
+        **{
+            f"{name}.side_effect": ConnectionError
+            for name in ("get_or_set", "get", "set", "add", "delete", "incr")
+        }
+    )
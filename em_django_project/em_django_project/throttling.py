@@ -0,0 +1,119 @@
+"""
+Ограничение частоты запросов скользящим окном (sliding window counter).
+
+Представление объявляет ``throttle_scope``, лимиты задаются в
+``REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]`` по ключам ``<scope>.ip`` и
+``<scope>.account``, например ``{"login.ip": "60/min"}``. Scope без лимита
+не ограничивается.
+
+Для каждого окна хранится один счетчик в общем для всех процессов кэше
+(THROTTLE_CACHE). Число запросов за последние ``duration`` секунд
+оценивается как ``предыдущее окно * непрошедшая доля + текущее окно``:
+проверка — одно чтение двух ключей и одно атомарное увеличение, без
+хранения списка отметок времени, как в SimpleRateThrottle.
+
+Если хранилище счетчиков недоступно, запрос пропускается (fail open):
+сбой кэша не должен закрывать вход и регистрацию, ошибка пишется в лог.
+"""
+
+import hashlib
+import logging
+import time
+from abc import ABCMeta, abstractmethod
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle, SimpleRateThrottle
+
+logger = logging.getLogger(__name__)
+
+
+class SlidingWindowThrottle(BaseThrottle, metaclass=ABCMeta):
+    """Базовый класс: ограничивает запросы с одинаковым идентификатором."""
+
+    kind = None
+    parse_rate = SimpleRateThrottle.parse_rate
+
+    @abstractmethod
+    def get_identifier(self, request) -> str | None:
+        """Идентификатор клиента или None, если запрос не ограничивается."""
+
+    def allow_request(self, request, view) -> bool:
+        self.wait_seconds = None
+        scope = getattr(view, "throttle_scope", None)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(f"{scope}.{self.kind}")
+        if scope is None or rate is None:
+            return True
+        identifier = self.get_identifier(request)
+        if not identifier:
+            return True
+        limit, duration = self.parse_rate(rate)
+        try:
+            return self._allow(f"{scope}.{self.kind}:{identifier}", limit, duration)
+        except Exception:
+            logger.exception("Throttle cache is unavailable, request is allowed")
+            return True
+
+    def _allow(self, key_prefix: str, limit: int, duration: int) -> bool:
+        """Проверяет лимит и учитывает запрос в счетчике текущего окна."""
+        now = time.time()
+        window, elapsed = divmod(now, duration)
+        window = int(window)
+        prefix = f"throttle:{key_prefix}:"
+        cache = caches[settings.THROTTLE_CACHE]
+        counts = cache.get_many([f"{prefix}{window - 1}", f"{prefix}{window}"])
+        previous = counts.get(f"{prefix}{window - 1}", 0)
+        current = counts.get(f"{prefix}{window}", 0)
+        weight = 1 - elapsed / duration
+        if previous * weight + current >= limit:
+            self.wait_seconds = self._wait(limit, duration, elapsed, previous, current)
+            return False
+        key = f"{prefix}{window}"
+        # Счетчик живет два окна: в следующем он станет «предыдущим».
+        if not cache.add(key, 1, timeout=2 * duration):
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, 1, timeout=2 * duration)
+        return True
+
+    @staticmethod
+    def _wait(limit, duration, elapsed, previous, current) -> float:
+        """Через сколько секунд оценка опустится ниже лимита."""
+        if current >= limit:
+            # Ждать следующего окна, пока текущее (там — предыдущее) не «выветрится».
+            return duration - elapsed + duration * (1 - limit / current)
+        return duration * (1 - (limit - current) / previous) - elapsed
+
+    def wait(self) -> float | None:
+        return self.wait_seconds
+
+
+class IPRateThrottle(SlidingWindowThrottle):
+    """Лимит по IP-адресу клиента (ключ ``<scope>.ip``)."""
+
+    kind = "ip"
+
+    def get_identifier(self, request) -> str | None:
+        return self.get_ident(request)
+
+
+class AccountRateThrottle(SlidingWindowThrottle):
+    """
+    Лимит по почте из запроса (ключ ``<scope>.account``): параметр
+    account в строке запроса или в теле.
+    """
+
+    kind = "account"
+
+    def get_identifier(self, request) -> str | None:
+        account = request.query_params.get("account")
+        if not account and hasattr(request.data, "get"):
+            account = request.data.get("account")
+        if not account:
+            return None
+        # Ключ кэша фиксированной длины при любой почте.
+        return hashlib.md5(
+            str(account).strip().lower().encode(), usedforsecurity=False
+        ).hexdigest()
@@ -0,0 +1,99 @@
+"""
+Кэш производных данных с версионированными ключами.
+
+Значение хранится под ключом с номером версии области (например,
+компании). Изменение данных увеличивает версию после фиксации транзакции,
+и следующее чтение пересчитывает значение, не затирая его устаревшими
+данными: до фиксации параллельный запрос прочитал бы старые данные
+и сохранил их под новой версией. Начальная версия берется из текущего
+времени, чтобы после вытеснения счетчика из кэша не вернуться к старой.
+
+Кэш — только ускорение: при его недоступности операции не падают,
+ошибка записывается в лог, чтение возвращает промах (версию None),
+а вызывающий код считает значение по базе.
+"""
+
+import logging
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+class VersionedCache:
+    """
+    Версионированный кэш одного вида данных.
+
+    Аргументы:
+    - namespace: префикс ключей, например "tasks:stats".
+    """
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+
+    def _key(self, *parts) -> str:
+        return ":".join([self.namespace, *map(str, parts)])
+
+    def _call(self, default, method: str, *args, **kwargs):
+        """Вызывает метод кэша; при ошибке пишет ее в лог и возвращает default."""
+        try:
+            return getattr(cache, method)(*args, **kwargs)
+        except Exception:
+            logger.exception("Cache is unavailable: %s", self.namespace)
+            return default
+
+    def get_version(self, scope_id) -> int | None:
+        """Возвращает текущую версию области или None, если кэш недоступен."""
+        key = self._key("version", scope_id)
+        return self._call(None, "get_or_set", key, time.time_ns, timeout=None)
+
+    def get(self, scope_id, version: int | None):
+        """Возвращает значение версии или None при промахе и недоступном кэше."""
+        if version is None:
+            return None
+        return self._call(None, "get", self._key("value", scope_id, version))
+
+    def set(self, scope_id, version: int | None, value, timeout: int) -> None:
+        """Сохраняет значение версии."""
+        if version is not None:
+            key = self._key("value", scope_id, version)
+            self._call(None, "set", key, value, timeout=timeout)
+
+    def acquire(self, scope_id, version: int | None, timeout: int) -> bool:
+        """
+        Берет блокировку пересчета версии.
+
+        Возвращает:
+        - True, если блокировка взята или кэш недоступен (ждать некого);
+          False, если значение уже пересчитывает другой процесс.
+        """
+        if version is None:
+            return True
+        key = self._key("lock", scope_id, version)
+        return self._call(True, "add", key, 1, timeout=timeout)
+
+    def release(self, scope_id, version: int | None) -> None:
+        """Снимает блокировку пересчета версии."""
+        if version is not None:
+            self._call(None, "delete", self._key("lock", scope_id, version))
+
+    def _bump_versions(self, scope_ids) -> None:
+        for scope_id in scope_ids:
+            key = self._key("version", scope_id)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, time.time_ns(), timeout=None)
+
+    def invalidate(self, scope_ids) -> None:
+        """
+        Увеличивает версии областей после фиксации текущей транзакции.
+
+        Вне транзакции версии увеличиваются сразу. Ошибка кэша не отменяет
+        записи: robust=True только записывает ее в лог.
+        """
+        scope_ids = {scope_id for scope_id in scope_ids if scope_id is not None}
+        if scope_ids:
+            transaction.on_commit(lambda: self._bump_versions(scope_ids), robust=True)
@@ -4,7 +4,13 @@ from organization_structure.models import Department, Employee, Position
 
 @admin.register(Department)
 class DepartmentAdmin(admin.ModelAdmin):
-    list_display = ("name", "manager", "company")
+    list_display = (
+        "name",
+        "manager",
+        "company",
+        "headcount",
+        "subtree_headcount",
+    )
     search_fields = (
         "name",
         "manager__first_name",
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class OrganizationStructureConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "organization_structure"
+
+    def ready(self):
+        from . import signals  # noqa: F401
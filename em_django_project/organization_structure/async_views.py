@@ -0,0 +1,55 @@
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+
+from em_django_project.async_api import AsyncReadOnlyView
+
+from .models import Department, Employee, Position
+from .pagination import OrganizationCursorPagination
+from .serializers import DepartmentSerializer, EmployeeSerializer, PositionSerializer
+
+
+class DepartmentAsyncView(AsyncReadOnlyView):
+    """
+    Асинхронный эндпоинт для чтения подразделений под ASGI.
+
+    Доступные действия:
+    - GET /organizations/async/api/v1/department/: список подразделений с курсорной
+      пагинацией по ID.
+    - GET /organizations/async/api/v1/department/<id>/: подразделение по ID.
+    """
+
+    queryset = Department.objects.all()
+    serializer_class = DepartmentSerializer
+    permission_classes = [IsAuthenticated, IsAdminUser]
+    pagination_class = OrganizationCursorPagination
+
+
+class PositionAsyncView(AsyncReadOnlyView):
+    """
+    Асинхронный эндпоинт для чтения должностей под ASGI.
+
+    Доступные действия:
+    - GET /organizations/async/api/v1/position/: список должностей с курсорной
+      пагинацией по ID.
+    - GET /organizations/async/api/v1/position/<id>/: должность по ID.
+    """
+
+    queryset = Position.objects.all()
+    serializer_class = PositionSerializer
+    permission_classes = [IsAuthenticated, IsAdminUser]
+    pagination_class = OrganizationCursorPagination
+
+
+class EmployeeAsyncView(AsyncReadOnlyView):
+    """
+    Асинхронный эндпоинт для чтения сотрудников под ASGI.
+
+    Доступные действия:
+    - GET /organizations/async/api/v1/employee/: список сотрудников с курсорной
+      пагинацией по ID.
+    - GET /organizations/async/api/v1/employee/<id>/: сотрудник по ID.
+    """
+
+    queryset = Employee.objects.all()
+    serializer_class = EmployeeSerializer
+    permission_classes = [IsAuthenticated, IsAdminUser]
+    pagination_class = OrganizationCursorPagination
@@ -0,0 +1,112 @@
+"""
+Оргструктура компании одним деревом: подразделения → должности → сотрудники.
+
+Данные читаются тремя запросами (по одному на таблицу), дерево собирается
+в памяти за O(n) по словарям идентификаторов, а JSON формируется
+частями по одному подразделению. Готовый JSON кэшируется (см. snapshot).
+"""
+
+import json
+from collections import defaultdict
+
+from .models import Department, Employee, Position
+
+DEPARTMENT_FIELDS = (
+    "id",
+    "name",
+    "manager_id",
+    "parent_id",
+    "headcount",
+    "subtree_headcount",
+)
+POSITION_FIELDS = ("id", "name", "department_id")
+EMPLOYEE_FIELDS = (
+    "id",
+    "user_id",
+    "user__first_name",
+    "user__last_name",
+    "department_id",
+    "position_id",
+    "manager_id",
+)
+
+
+def load_chart(company_id: int) -> list[dict]:
+    """
+    Загружает оргструктуру компании и собирает ее в дерево.
+
+    Аргументы:
+    - company_id: ID компании.
+
+    Возвращает:
+    - Список корневых подразделений; у каждого подразделения есть списки
+      positions (с вложенными employees) и children.
+    """
+    departments = {}
+    roots = []
+    # Сортировка по материализованному пути дает обход в глубину:
+    # родитель всегда встречается раньше своих дочерних подразделений.
+    for row in (
+        Department.objects.filter(company_id=company_id)
+        .order_by("path")
+        .values(*DEPARTMENT_FIELDS)
+    ):
+        department = {
+            "id": row["id"],
+            "name": row["name"],
+            "manager": row["manager_id"],
+            "headcount": row["headcount"],
+            "subtree_headcount": row["subtree_headcount"],
+            "positions": [],
+            "children": [],
+        }
+        departments[row["id"]] = department
+        parent = departments.get(row["parent_id"])
+        (parent["children"] if parent else roots).append(department)
+
+    employees = defaultdict(list)
+    for row in (
+        Employee.objects.filter(company_id=company_id)
+        .order_by("id")
+        .values(*EMPLOYEE_FIELDS)
+    ):
+        employees[row["position_id"]].append(
+            {
+                "id": row["id"],
+                "user": row["user_id"],
+                "first_name": row["user__first_name"],
+                "last_name": row["user__last_name"],
+                "department": row["department_id"],
+                "manager": row["manager_id"],
+            }
+        )
+
+    for row in (
+        Position.objects.filter(department__company_id=company_id)
+        .order_by("id")
+        .values(*POSITION_FIELDS)
+    ):
+        departments[row["department_id"]]["positions"].append(
+            {"id": row["id"], "name": row["name"], "employees": employees[row["id"]]}
+        )
+    return roots
+
+
+def _iter_department(department: dict):
+    head = {key: value for key, value in department.items() if key != "children"}
+    yield json.dumps(head, ensure_ascii=False)[:-1] + ', "children": ['
+    for index, child in enumerate(department["children"]):
+        if index:
+            yield ", "
+        yield from _iter_department(child)
+    yield "]}"
+
+
+def iter_chart_json(company_id: int, roots: list[dict]):
+    """Отдает дерево оргструктуры частями JSON-документа."""
+    yield f'{{"company": {company_id}, "departments": ['
+    for index, department in enumerate(roots):
+        if index:
+            yield ", "
+        yield from _iter_department(department)
+    yield "]}"
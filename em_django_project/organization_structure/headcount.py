@@ -0,0 +1,142 @@
+"""
+Денормализованная численность подразделений.
+
+Каждое подразделение хранит два счетчика:
+
+- headcount — сотрудники самого подразделения;
+- subtree_headcount — сотрудники подразделения и всех вложенных в него.
+
+Счетчики изменяются относительными UPDATE (F() + delta) при добавлении,
+переводе и удалении сотрудников и при переносе подразделений, поэтому
+чтение численности не требует обхода дерева. Вышестоящие подразделения
+берутся из материализованного пути. Модуль также пересчитывает счетчики
+целиком — для миграции, проверки согласованности и восстановления.
+"""
+
+from collections import Counter, defaultdict
+
+from django.db.models import Count, F
+from django.utils import timezone
+
+from .tree import path_ids
+
+
+def _apply(department_model, field: str, deltas: Counter) -> None:
+    """Прибавляет приращения к счетчику: один UPDATE на каждое значение приращения."""
+    groups = defaultdict(list)
+    for department_id, delta in deltas.items():
+        if delta:
+            groups[delta].append(department_id)
+    for delta, department_ids in groups.items():
+        department_model.objects.filter(pk__in=department_ids).update(
+            **{field: F(field) + delta}, updated_at=timezone.now()
+        )
+
+
+def apply_deltas(department_model, direct: Counter, paths: dict[int, str]) -> None:
+    """
+    Изменяет численность подразделений и всех вышестоящих.
+
+    Аргументы:
+    - direct: ID подразделения -> изменение числа его сотрудников.
+    - paths: ID подразделения -> материализованный путь.
+    """
+    subtree = Counter()
+    for department_id, delta in direct.items():
+        for ancestor_id in path_ids(paths[department_id]):
+            subtree[ancestor_id] += delta
+    _apply(department_model, "headcount", direct)
+    _apply(department_model, "subtree_headcount", subtree)
+
+
+def add_employee(department_model, department_id: int, delta: int = 1) -> None:
+    """
+    Учитывает сотрудника, добавленного в подразделение (delta=-1 — удаленного).
+
+    Строка подразделения блокируется: параллельный перенос ветки не изменит
+    путь, пока счетчики вышестоящих подразделений не обновлены.
+    """
+    path = (
+        department_model.objects.select_for_update()
+        .filter(pk=department_id)
+        .values_list("path", flat=True)
+        .first()
+    )
+    # Подразделение уже удалено каскадом вместе с сотрудником.
+    if path is None:
+        return
+    apply_deltas(
+        department_model, Counter({department_id: delta}), {department_id: path}
+    )
+
+
+def move_subtree(
+    department_model, old_path: str, new_parent_path: str, count: int
+) -> None:
+    """
+    Переносит численность ветки при смене родителя.
+
+    Аргументы:
+    - old_path: путь переносимого подразделения до переноса.
+    - new_parent_path: путь нового родителя ("/" для корня).
+    - count: subtree_headcount переносимого подразделения.
+    """
+    if not count:
+        return
+    old_ancestors = set(path_ids(old_path)[:-1])
+    new_ancestors = set(path_ids(new_parent_path))
+    subtree = Counter()
+    for department_id in old_ancestors - new_ancestors:
+        subtree[department_id] -= count
+    for department_id in new_ancestors - old_ancestors:
+        subtree[department_id] += count
+    _apply(department_model, "subtree_headcount", subtree)
+
+
+def find_mismatches(department_model, employee_model) -> list:
+    """
+    Сравнивает сохраненные счетчики с пересчитанными по сотрудникам.
+
+    Возвращает:
+    - Подразделения с неверными счетчиками (с уже пересчитанными значениями).
+    """
+    direct = Counter(
+        dict(
+            employee_model.objects.order_by()
+            .values_list("department_id")
+            .annotate(count=Count("id"))
+        )
+    )
+    rows = list(
+        department_model.objects.values_list(
+            "id", "path", "headcount", "subtree_headcount"
+        )
+    )
+    subtree = Counter()
+    for department_id, path, _, _ in rows:
+        for ancestor_id in path_ids(path):
+            subtree[ancestor_id] += direct[department_id]
+    return [
+        department_model(
+            id=department_id,
+            headcount=direct[department_id],
+            subtree_headcount=subtree[department_id],
+        )
+        for department_id, _, headcount, subtree_headcount in rows
+        if (headcount, subtree_headcount)
+        != (direct[department_id], subtree[department_id])
+    ]
+
+
+def repair(department_model, employee_model, batch_size: int = 1000) -> int:
+    """
+    Перезаписывает неверные счетчики пересчитанными.
+
+    Возвращает:
+    - Количество исправленных подразделений.
+    """
+    mismatched = find_mismatches(department_model, employee_model)
+    department_model.objects.bulk_update(
+        mismatched, ["headcount", "subtree_headcount"], batch_size=batch_size
+    )
+    return len(mismatched)
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from organization_structure import headcount
+from organization_structure.models import Department, Employee
+
+
+class Command(BaseCommand):
+    help = (
+        "Проверяет счетчики численности подразделений "
+        "и при --repair пересчитывает неверные."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--repair",
+            action="store_true",
+            help="Исправить найденные расхождения.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options["repair"]:
+                count = headcount.repair(Department, Employee)
+                self.stdout.write(self.style.SUCCESS(f"Repaired {count} departments"))
+                return
+            count = len(headcount.find_mismatches(Department, Employee))
+        if count:
+            raise CommandError(f"{count} departments have inconsistent headcounts")
+        self.stdout.write(self.style.SUCCESS("Department headcounts are consistent"))
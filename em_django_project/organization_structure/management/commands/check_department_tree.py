@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from organization_structure import tree
+from organization_structure.models import Department
+
+
+class Command(BaseCommand):
+    help = (
+        "Проверяет материализованные пути дерева подразделений "
+        "и при --repair пересчитывает неверные."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--repair",
+            action="store_true",
+            help="Исправить найденные расхождения.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options["repair"]:
+                count, cyclic = tree.repair(Department)
+                self.stdout.write(self.style.SUCCESS(f"Repaired {count} departments"))
+            else:
+                mismatched, cyclic = tree.find_mismatches(Department)
+                count = len(mismatched)
+        if cyclic:
+            raise CommandError(
+                "Departments in parent cycles: "
+                + ", ".join(str(pk) for pk in sorted(cyclic))
+            )
+        if count and not options["repair"]:
+            raise CommandError(f"{count} departments have inconsistent paths")
+        if not options["repair"]:
+            self.stdout.write(self.style.SUCCESS("Department tree is consistent"))
@@ -0,0 +1,45 @@
+import codecs
+
+from django.core.management.base import BaseCommand, CommandError
+from organization_structure import importer
+from registration.models import Company
+
+
+class Command(BaseCommand):
+    help = (
+        "Импортирует подразделения, должности и сотрудников компании "
+        "из CSV- или JSON-файла (формат описан в organization_structure.importer)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Путь к CSV- или JSON-файлу.")
+        parser.add_argument(
+            "--format",
+            choices=importer.IMPORT_FORMATS,
+            help="Формат файла; по умолчанию определяется по расширению.",
+        )
+        parser.add_argument("--company", type=int, required=True, help="ID компании.")
+
+    def handle(self, *args, **options):
+        if not Company.objects.filter(pk=options["company"]).exists():
+            raise CommandError(f"Company {options['company']} does not exist")
+        file_format = options["format"] or (
+            "json" if options["path"].lower().endswith(".json") else "csv"
+        )
+        with open(options["path"], "rb") as file:
+            source = (
+                file if file_format == "json" else codecs.iterdecode(file, "utf-8-sig")
+            )
+            report = importer.import_org_structure(
+                source, options["company"], file_format
+            )
+        for error in report["errors"]:
+            self.stderr.write(f"Row {error['row']}: {'; '.join(error['errors'])}")
+        if report["errors"]:
+            raise CommandError(
+                f"{len(report['errors'])} rows have errors, nothing imported"
+            )
+        created = ", ".join(
+            f"{name}: {count}" for name, count in report["created"].items()
+        )
+        self.stdout.write(self.style.SUCCESS(f"Imported {created}"))
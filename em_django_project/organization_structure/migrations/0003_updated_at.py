@@ -0,0 +1,28 @@
+# Generated by Django 5.0.4 on 2026-10-18 16:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("organization_structure", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="department",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="employee",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="position",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
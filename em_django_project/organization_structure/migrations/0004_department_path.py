@@ -0,0 +1,31 @@
+# Generated by Django 5.0.4 on 2026-10-18 16:35
+
+from django.db import migrations, models
+from organization_structure import tree
+
+
+def fill_paths(apps, schema_editor):
+    tree.repair(apps.get_model("organization_structure", "Department"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("organization_structure", "0003_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="department",
+            name="depth",
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="department",
+            name="path",
+            field=models.CharField(
+                db_index=True, default="", editable=False, max_length=255
+            ),
+        ),
+        migrations.RunPython(fill_paths, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.0.4 on 2026-10-18 16:44
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_company(apps, schema_editor):
+    Department = apps.get_model("organization_structure", "Department")
+    Employee = apps.get_model("organization_structure", "Employee")
+    Employee.objects.update(
+        company_id=Subquery(
+            Department.objects.filter(pk=OuterRef("department_id")).values(
+                "company_id"
+            )[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("organization_structure", "0004_department_path"),
+        ("registration", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="employee",
+            name="company",
+            field=models.ForeignKey(
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="registration.company",
+            ),
+        ),
+        migrations.RunPython(fill_company, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="employee",
+            name="company",
+            field=models.ForeignKey(
+                editable=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="registration.company",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="department",
+            index=models.Index(
+                fields=["company", "path"], name="department_company_path_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="employee",
+            index=models.Index(
+                fields=["company", "id"], name="employee_company_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.4 on 2026-10-18 16:50
+
+from django.db import migrations, models
+from organization_structure import headcount
+
+
+def fill_headcounts(apps, schema_editor):
+    headcount.repair(
+        apps.get_model("organization_structure", "Department"),
+        apps.get_model("organization_structure", "Employee"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("organization_structure", "0005_employee_company"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="department",
+            name="headcount",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="department",
+            name="subtree_headcount",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_headcounts, migrations.RunPython.noop),
+    ]
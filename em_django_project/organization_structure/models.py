@@ -1,8 +1,37 @@
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Substr
+from django.utils import timezone
 from registration.models import Company, User
 
+from . import headcount
+from .tree import path_ids, subtree_range
+
+HEADCOUNT_FIELDS = ("headcount", "subtree_headcount")
+# Поля, которые вычисляются из дерева и не записываются обычным save()
+DERIVED_FIELDS = ("path", "depth", *HEADCOUNT_FIELDS)
+
+
+class DepartmentQuerySet(models.QuerySet):
+    def subtree(self, department: "Department", include_self: bool = True):
+        """Подразделение и все вложенные в него на любую глубину, одним запросом."""
+        queryset = self.filter(**subtree_range(department.path))
+        if not include_self:
+            queryset = queryset.exclude(pk=department.pk)
+        return queryset
+
+    def ancestors(self, department: "Department", include_self: bool = False):
+        """Вышестоящие подразделения от корня, одним запросом по первичному ключу."""
+        ids = path_ids(department.path)
+        if not include_self:
+            ids = ids[:-1]
+        return self.filter(pk__in=ids).order_by("depth")
+
 
 class Department(models.Model):
+    tenant_field = "company"
+
     name = models.CharField(max_length=100)
     manager = models.OneToOneField(
         User,
@@ -17,6 +46,15 @@ class Department(models.Model):
     company = models.ForeignKey(
         Company, related_name="departments", on_delete=models.CASCADE
     )
+    updated_at = models.DateTimeField(auto_now=True)
+    # Материализованный путь от корня: "/<id корня>/.../<id>/".
+    path = models.CharField(max_length=255, db_index=True, default="", editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+    # Численность: сотрудники самого подразделения и всего его поддерева.
+    headcount = models.PositiveIntegerField(default=0, editable=False)
+    subtree_headcount = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = DepartmentQuerySet.as_manager()
 
     def __str__(self):
         return self.name
@@ -24,13 +62,104 @@ class Department(models.Model):
     class Meta:
         verbose_name = "Подразделение"
         verbose_name_plural = "Подразделения"
+        indexes = [
+            models.Index(
+                fields=["company", "path"], name="department_company_path_idx"
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Путь, глубина и счетчики численности изменяются только UPDATE
+        # в _update_path и headcount: обычное сохранение не должно
+        # перезаписывать их значениями, прочитанными раньше. Иначе устаревший
+        # путь вернулся бы в _update_path как прежний, и численность ветки
+        # перенеслась бы повторно.
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in DERIVED_FIELDS
+            ]
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self._update_path()
+
+    def _update_path(self) -> None:
+        """
+        Пересчитывает путь подразделения после сохранения.
+
+        При переносе в другое подразделение пути и глубины всего поддерева
+        обновляются одним UPDATE, а численность ветки переносится
+        от прежних вышестоящих подразделений к новым. Строки родителя
+        и самого подразделения блокируются до конца транзакции, чтобы
+        параллельные переносы не записали устаревшие пути и счетчики.
+        """
+        parent_path, parent_depth = "/", -1
+        if self.parent_id is not None:
+            parent_path, parent_depth = (
+                Department.objects.select_for_update()
+                .values_list("path", "depth")
+                .get(pk=self.parent_id)
+            )
+        old_path, old_depth, self.headcount, self.subtree_headcount = (
+            Department.objects.select_for_update()
+            .values_list("path", "depth", *HEADCOUNT_FIELDS)
+            .get(pk=self.pk)
+        )
+        new_path, new_depth = f"{parent_path}{self.pk}/", parent_depth + 1
+        if new_path == old_path:
+            self.path, self.depth = old_path, old_depth
+            return
+        if old_path and parent_path.startswith(old_path):
+            raise ValidationError(
+                "Подразделение нельзя перенести в собственное поддерево."
+            )
+        if old_path:
+            Department.objects.filter(**subtree_range(old_path)).update(
+                path=Concat(Value(new_path), Substr("path", len(old_path) + 1)),
+                depth=F("depth") + (new_depth - old_depth),
+                updated_at=timezone.now(),
+            )
+            headcount.move_subtree(
+                Department, old_path, parent_path, self.subtree_headcount
+            )
+        else:
+            Department.objects.filter(pk=self.pk).update(path=new_path, depth=new_depth)
+        self.path, self.depth = new_path, new_depth
+
+    def move_to(self, parent: "Department | None") -> None:
+        """
+        Переносит подразделение со всем поддеревом под другого родителя.
+
+        Выполняется в одной транзакции за постоянное число запросов
+        независимо от размера ветки: проверка цикла по заблокированному
+        пути родителя, один UPDATE путей поддерева и обновление счетчиков
+        численности вышестоящих подразделений.
+
+        Аргументы:
+        - parent: новый родитель или None, чтобы сделать подразделение корневым.
+
+        Исключения:
+        - ValidationError, если parent лежит в поддереве подразделения.
+        """
+        self.parent = parent
+        self.save(update_fields=["parent", "updated_at"])
+
+    def get_descendants(self, include_self: bool = False):
+        return Department.objects.subtree(self, include_self=include_self)
+
+    def get_ancestors(self, include_self: bool = False):
+        return Department.objects.ancestors(self, include_self=include_self)
 
 
 class Position(models.Model):
+    tenant_field = "department__company"
+
     name = models.CharField(max_length=100)
     department = models.ForeignKey(
         Department, related_name="positions", on_delete=models.CASCADE
     )
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
@@ -41,6 +170,8 @@ class Position(models.Model):
 
 
 class Employee(models.Model):
+    tenant_field = "company"
+
     user = models.OneToOneField(
         User, on_delete=models.CASCADE, related_name="employee_profile"
     )
@@ -57,6 +188,12 @@ class Employee(models.Model):
         blank=True,
         related_name="subordinates",
     )
+    updated_at = models.DateTimeField(auto_now=True)
+    # Денормализованная компания подразделения: списки сотрудников компании
+    # читаются по индексу без соединения с подразделениями.
+    company = models.ForeignKey(
+        Company, on_delete=models.CASCADE, related_name="+", editable=False
+    )
 
     def __str__(self):
         return str(self.user)
@@ -64,3 +201,31 @@ class Employee(models.Model):
     class Meta:
         verbose_name = "Сотрудник"
         verbose_name_plural = "Сотрудники"
+        indexes = [
+            models.Index(fields=["company", "id"], name="employee_company_id_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        """
+        Сохраняет сотрудника и обновляет численность подразделений
+        при добавлении или переводе. Удаление учитывается сигналом
+        post_delete: каскадное удаление не вызывает Employee.delete().
+        """
+        with transaction.atomic():
+            previous_department_id = (
+                Employee.objects.filter(pk=self.pk)
+                .values_list("department_id", flat=True)
+                .first()
+                if self.pk is not None
+                else None
+            )
+            self.company_id = (
+                Department.objects.filter(pk=self.department_id)
+                .values_list("company_id", flat=True)
+                .get()
+            )
+            super().save(*args, **kwargs)
+            if previous_department_id != self.department_id:
+                if previous_department_id is not None:
+                    headcount.add_employee(Department, previous_department_id, -1)
+                headcount.add_employee(Department, self.department_id)
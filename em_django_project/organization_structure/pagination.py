@@ -0,0 +1,10 @@
+from em_django_project.pagination import KeysetCursorPagination
+
+
+class OrganizationCursorPagination(KeysetCursorPagination):
+    """
+    Пагинация списков подразделений, должностей и сотрудников по ID.
+    """
+
+    orderings = {"id": ("id",)}
+    default_ordering = "id"
@@ -0,0 +1,115 @@
+"""
+Линии подчинения сотрудников (Employee.manager).
+
+Подчиненные на любую глубину, цепочка руководителей и охват управления
+читаются одним рекурсивным CTE-запросом (WITH RECURSIVE поддерживают
+SQLite и PostgreSQL). Глубина рекурсии ограничена REPORTING_MAX_DEPTH,
+поэтому запрос завершается даже на данных с циклом, записанных в обход
+проверки.
+"""
+
+from django.db import connection
+from django.db.models.query import RawQuerySet
+
+from .models import Employee
+
+REPORTING_MAX_DEPTH = 100
+
+
+def _table() -> str:
+    return connection.ops.quote_name(Employee._meta.db_table)
+
+
+def _subordinates_cte() -> str:
+    table = _table()
+    return (
+        f"WITH RECURSIVE chain(id, depth) AS ("
+        f"SELECT id, 1 FROM {table} WHERE manager_id = %s "
+        f"UNION SELECT e.id, chain.depth + 1 FROM {table} e "
+        f"JOIN chain ON e.manager_id = chain.id "
+        f"WHERE chain.depth < {REPORTING_MAX_DEPTH}) "
+    )
+
+
+def _managers_cte() -> str:
+    table = _table()
+    return (
+        f"WITH RECURSIVE chain(id, manager_id, depth) AS ("
+        f"SELECT id, manager_id, 1 FROM {table} "
+        f"WHERE id = (SELECT manager_id FROM {table} WHERE id = %s) "
+        f"UNION SELECT e.id, e.manager_id, chain.depth + 1 FROM {table} e "
+        f"JOIN chain ON e.id = chain.manager_id "
+        f"WHERE chain.depth < {REPORTING_MAX_DEPTH}) "
+    )
+
+
+def get_subordinates(employee_id: int) -> RawQuerySet:
+    """
+    Прямые и косвенные подчиненные сотрудника.
+
+    Аргументы:
+    - employee_id: ID сотрудника.
+
+    Возвращает:
+    - Сотрудников с атрибутом depth (1 — прямой подчиненный),
+      упорядоченных по depth и id.
+    """
+    return Employee.objects.raw(
+        _subordinates_cte() + f"SELECT e.*, levels.depth FROM {_table()} e "
+        f"JOIN (SELECT id, MIN(depth) AS depth FROM chain GROUP BY id) levels "
+        f"ON e.id = levels.id ORDER BY levels.depth, e.id",
+        [employee_id],
+    )
+
+
+def get_managers(employee_id: int) -> RawQuerySet:
+    """
+    Цепочка руководителей сотрудника до верхнего уровня.
+
+    Возвращает:
+    - Руководителей с атрибутом depth (1 — непосредственный руководитель),
+      от ближайшего к верхнему.
+    """
+    return Employee.objects.raw(
+        _managers_cte() + f"SELECT e.*, levels.depth FROM {_table()} e "
+        f"JOIN (SELECT id, MIN(depth) AS depth FROM chain GROUP BY id) levels "
+        f"ON e.id = levels.id ORDER BY levels.depth",
+        [employee_id],
+    )
+
+
+def get_span_of_control(employee_id: int) -> dict:
+    """
+    Охват управления сотрудника.
+
+    Возвращает:
+    - Словарь: direct — прямые подчиненные, total — все подчиненные,
+      depth — количество уровней подчинения.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            _subordinates_cte()
+            + "SELECT COUNT(*), COALESCE(SUM(CASE WHEN depth = 1 THEN 1 ELSE 0 END), 0), "
+            "COALESCE(MAX(depth), 0) "
+            "FROM (SELECT id, MIN(depth) AS depth FROM chain GROUP BY id) levels",
+            [employee_id],
+        )
+        total, direct, depth = cursor.fetchone()
+    return {"employee": employee_id, "direct": direct, "total": total, "depth": depth}
+
+
+def creates_cycle(employee_id: int, manager_id: int) -> bool:
+    """
+    Проверяет, замкнет ли назначение руководителя цикл подчинения.
+
+    Цикл возникает, если сотрудник назначается руководителем самому себе
+    или сам входит в цепочку руководителей нового руководителя.
+    """
+    if employee_id == manager_id:
+        return True
+    with connection.cursor() as cursor:
+        cursor.execute(
+            _managers_cte() + "SELECT 1 FROM chain WHERE id = %s LIMIT 1",
+            [manager_id, employee_id],
+        )
+        return cursor.fetchone() is not None
@@ -1,24 +1,124 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from registration.models import User
 from rest_framework import serializers
 
+from em_django_project.dynamic_fields import DynamicFieldsSerializerMixin
+from em_django_project.tenancy import TenantScopedSerializerMixin
+
+from . import reporting
 from .models import Department, Employee, Position
 
 
-class DepartmentSerializer(serializers.ModelSerializer):
+class UserBriefSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = User
+        fields = ("id", "account", "first_name", "last_name")
+
+
+class DepartmentBriefSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = Department
+        fields = ("id", "name", "parent")
+
+
+class PositionBriefSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = Position
+        fields = ("id", "name", "department")
+
+
+class EmployeeBriefSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = Employee
+        fields = ("id", "user", "department", "position")
+
+
+class DepartmentSerializer(
+    DynamicFieldsSerializerMixin,
+    TenantScopedSerializerMixin,
+    serializers.ModelSerializer,
+):
+    expandable_fields = {
+        "manager": UserBriefSerializer,
+        "parent": DepartmentBriefSerializer,
+    }
 
     class Meta:
         model = Department
         fields = "__all__"
+        read_only_fields = ("company",)
+
+    def validate_parent(self, value):
+        if (
+            value is not None
+            and self.instance is not None
+            and value.path.startswith(self.instance.path)
+        ):
+            raise serializers.ValidationError(
+                "Подразделение нельзя перенести в собственное поддерево."
+            )
+        return value
 
 
-class PositionSerializer(serializers.ModelSerializer):
+class DepartmentMoveSerializer(DepartmentSerializer):
+    """Перенос подразделения: принимает только нового родителя."""
+
+    class Meta:
+        model = Department
+        fields = ("parent",)
+        extra_kwargs = {"parent": {"required": True, "allow_null": True}}
+
+    def update(self, instance: Department, validated_data: dict) -> Department:
+        try:
+            instance.move_to(validated_data["parent"])
+        except DjangoValidationError as error:
+            raise serializers.ValidationError({"parent": error.messages})
+        return instance
+
+
+class PositionSerializer(
+    DynamicFieldsSerializerMixin,
+    TenantScopedSerializerMixin,
+    serializers.ModelSerializer,
+):
+    expandable_fields = {"department": DepartmentBriefSerializer}
 
     class Meta:
         model = Position
         fields = "__all__"
 
 
-class EmployeeSerializer(serializers.ModelSerializer):
+class EmployeeSerializer(
+    DynamicFieldsSerializerMixin,
+    TenantScopedSerializerMixin,
+    serializers.ModelSerializer,
+):
+    expandable_fields = {
+        "user": UserBriefSerializer,
+        "department": DepartmentBriefSerializer,
+        "position": PositionBriefSerializer,
+        "manager": EmployeeBriefSerializer,
+    }
 
     class Meta:
         model = Employee
         fields = "__all__"
+
+    def validate_manager(self, value):
+        if (
+            value is not None
+            and self.instance is not None
+            and reporting.creates_cycle(self.instance.pk, value.pk)
+        ):
+            raise serializers.ValidationError(
+                "Назначение руководителя замыкает цикл подчинения."
+            )
+        return value
+
+
+class ReportingEmployeeSerializer(EmployeeSerializer):
+    depth = serializers.IntegerField(read_only=True)
@@ -0,0 +1,67 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from registration.models import User
+
+from . import headcount, snapshot
+from .models import Department, Employee, Position
+
+
+def _department_company_id(department_id: int) -> int | None:
+    return (
+        Department.objects.filter(pk=department_id)
+        .values_list("company_id", flat=True)
+        .first()
+    )
+
+
+def _company_id(instance) -> int | None:
+    if isinstance(instance, Position):
+        return _department_company_id(instance.department_id)
+    return instance.company_id
+
+
+@receiver(pre_save, sender=Department)
+@receiver(pre_save, sender=Position)
+@receiver(pre_save, sender=Employee)
+def remember_previous_company(sender, instance, **kwargs) -> None:
+    """Запоминает компанию до изменения: при переносе сбрасываются обе."""
+    instance._previous_company_id = None
+    if instance.pk is None:
+        return
+    field = f"{sender.tenant_field}_id"
+    instance._previous_company_id = (
+        sender.objects.filter(pk=instance.pk).values_list(field, flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Department)
+@receiver(post_save, sender=Position)
+@receiver(post_save, sender=Employee)
+def invalidate_snapshot_on_save(sender, instance, **kwargs) -> None:
+    """Сбрасывает снимок оргструктуры компании."""
+    snapshot.invalidate_companies(
+        [_company_id(instance), getattr(instance, "_previous_company_id", None)]
+    )
+
+
+@receiver(post_delete, sender=Department)
+@receiver(post_delete, sender=Position)
+@receiver(post_delete, sender=Employee)
+def invalidate_snapshot_on_delete(sender, instance, **kwargs) -> None:
+    """Сбрасывает снимок оргструктуры компании."""
+    snapshot.invalidate_companies([_company_id(instance)])
+
+
+@receiver(post_delete, sender=Employee)
+def decrement_headcount_on_delete(sender, instance: Employee, **kwargs) -> None:
+    """Уменьшает численность подразделения сотрудника и всех вышестоящих."""
+    headcount.add_employee(Department, instance.department_id, -1)
+
+
+@receiver(post_save, sender=User)
+def invalidate_snapshot_on_user_save(sender, instance: User, **kwargs) -> None:
+    """Сбрасывает снимок компании пользователя: в снимке есть имена сотрудников."""
+    update_fields = kwargs.get("update_fields")
+    if update_fields and set(update_fields) <= {"last_login"}:
+        return
+    snapshot.invalidate_companies([instance.company_id])
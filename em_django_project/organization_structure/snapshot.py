@@ -0,0 +1,70 @@
+"""
+Кэшированный снимок оргструктуры компании.
+
+Снимок — готовый JSON дерева подразделений (см. chart), хранится
+в версионированном кэше компании (em_django_project.versioned_cache).
+Изменение подразделений, должностей, сотрудников или пользователей
+увеличивает версию компании после фиксации транзакции, и следующее
+чтение пересобирает снимок.
+
+Пересборку после сброса выполняет один процесс: он берет блокировку,
+остальные ждут появления снимка и только по истечении ожидания собирают
+его сами, не сохраняя в кэш. Если кэш недоступен, снимок собирается
+из базы при каждом запросе.
+"""
+
+import time
+
+from django.conf import settings
+
+from em_django_project.versioned_cache import VersionedCache
+
+from . import chart
+
+snapshots = VersionedCache("org:snapshot")
+
+
+def build_snapshot(company_id: int) -> bytes:
+    """Собирает JSON дерева оргструктуры компании."""
+    roots = chart.load_chart(company_id)
+    return "".join(chart.iter_chart_json(company_id, roots)).encode()
+
+
+def get_snapshot(company_id: int) -> tuple[int | None, bytes]:
+    """
+    Возвращает снимок оргструктуры компании, пересобирая его при промахе.
+
+    Аргументы:
+    - company_id: ID компании.
+
+    Возвращает:
+    - Кортеж (версия снимка, JSON дерева оргструктуры); версия None,
+      если кэш недоступен и снимок собран из базы.
+    """
+    version = snapshots.get_version(company_id)
+    snapshot = snapshots.get(company_id, version)
+    if snapshot is not None:
+        return version, snapshot
+
+    if snapshots.acquire(company_id, version, settings.ORG_SNAPSHOT_LOCK_TIMEOUT):
+        try:
+            snapshot = build_snapshot(company_id)
+            snapshots.set(
+                company_id, version, snapshot, settings.ORG_SNAPSHOT_CACHE_TIMEOUT
+            )
+        finally:
+            snapshots.release(company_id, version)
+        return version, snapshot
+
+    deadline = time.monotonic() + settings.ORG_SNAPSHOT_WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(settings.ORG_SNAPSHOT_WAIT_INTERVAL)
+        snapshot = snapshots.get(company_id, version)
+        if snapshot is not None:
+            return version, snapshot
+    return version, build_snapshot(company_id)
+
+
+def invalidate_companies(company_ids) -> None:
+    """Сбрасывает снимки компаний после фиксации текущей транзакции."""
+    snapshots.invalidate(company_ids)
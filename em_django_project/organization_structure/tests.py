@@ -0,0 +1,297 @@
+import io
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from registration.models import Company, User
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from em_django_project.testing import TEST_SETTINGS, broken_cache, create_user
+
+from . import headcount, importer
+from .models import Department, Employee, Position
+
+EMPLOYEE_URL = "/organizations/api/v1/employee/"
+
+
+@override_settings(**TEST_SETTINGS)
+class EmployeeExpandTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = Company.objects.create(company_name="Company")
+        cls.admin = create_user(cls.company, "admin@example.com", is_staff=True)
+        department = Department.objects.create(name="Department", company=cls.company)
+        position = Position.objects.create(name="Position", department=department)
+        cls.employee = Employee.objects.create(
+            user=cls.admin, department=department, position=position
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def assert_expanded_change_is_visible(self, url: str) -> None:
+        params = {"expand": "user"}
+        etag = self.client.get(url, params)["ETag"]
+        response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # Версия сотрудника не меняется, меняется только встроенный объект.
+        User.objects.filter(pk=self.admin.pk).update(first_name="Changed")
+        response = self.client.get(url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("Changed", str(response.data))
+
+    def test_list_etag_covers_expanded_relations(self):
+        self.assert_expanded_change_is_visible(EMPLOYEE_URL)
+
+    def test_retrieve_etag_covers_expanded_relations(self):
+        self.assert_expanded_change_is_visible(f"{EMPLOYEE_URL}{self.employee.pk}/")
+
+    def test_retrieve_without_expand_uses_version(self):
+        url = f"{EMPLOYEE_URL}{self.employee.pk}/"
+        response = self.client.get(url)
+        self.assertIn("Last-Modified", response)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+@override_settings(**TEST_SETTINGS)
+class OrganizationTreeTests(TestCase):
+    url = "/organizations/api/v1/tree/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = Company.objects.create(company_name="Company")
+        cls.admin = create_user(cls.company, "admin@example.com", is_staff=True)
+        cls.department = Department.objects.create(
+            name="Department", company=cls.company
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_snapshot_invalidated_after_commit(self):
+        response = self.client.get(self.url)
+        self.assertContains(response, "Department")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.department.name = "Renamed"
+            self.department.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertContains(response, "Renamed")
+
+    def test_cache_outage_falls_back_to_database(self):
+        with mock.patch(
+            "em_django_project.versioned_cache.cache", broken_cache()
+        ), self.assertLogs("em_django_project.versioned_cache", "ERROR"):
+            response = self.client.get(self.url)
+            self.assertContains(response, "Department")
+            etag = response["ETag"]
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+            with self.captureOnCommitCallbacks(execute=True):
+                self.department.name = "Renamed"
+                self.department.save()
+            self.assertContains(self.client.get(self.url), "Renamed")
+
+
+@override_settings(**TEST_SETTINGS)
+class OrganizationImportTests(TestCase):
+    header = ",".join(importer.IMPORT_COLUMNS)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = Company.objects.create(company_name="Company")
+
+    def import_csv(self, *lines: str) -> dict:
+        return importer.import_org_structure(
+            iter([self.header, *lines]), self.company.pk
+        )
+
+    def test_import_csv(self):
+        report = self.import_csv(
+            "boss@example.com,Boss,Last,Head,,Director,,yes",
+            "dev@example.com,Dev,Last,Development,Head,Developer,boss@example.com,",
+        )
+        self.assertEqual(report["errors"], [])
+        self.assertEqual(
+            report["created"],
+            {"departments": 2, "positions": 2, "users": 2, "employees": 2},
+        )
+        head = Department.objects.get(name="Head")
+        development = Department.objects.get(name="Development")
+        self.assertEqual(development.path, f"/{head.pk}/{development.pk}/")
+        self.assertEqual(head.manager.account, "boss@example.com")
+        self.assertEqual(head.subtree_headcount, 2)
+        dev = Employee.objects.get(user__account="dev@example.com")
+        self.assertEqual(dev.manager.user.account, "boss@example.com")
+
+    def test_import_json(self):
+        rows = [
+            {
+                "account": "dev@example.com",
+                "first_name": "Dev",
+                "last_name": "Last",
+                "department": "Development",
+                "position": "Developer",
+            },
+            ["not an object"],
+        ]
+        source = io.BytesIO(json.dumps(rows).encode())
+        report = importer.import_org_structure(source, self.company.pk, "json")
+        self.assertEqual(
+            report["errors"], [{"row": 2, "errors": ["Row must be an object"]}]
+        )
+        self.assertFalse(User.objects.exists())
+
+        source = io.BytesIO(json.dumps(rows[:1]).encode())
+        report = importer.import_org_structure(source, self.company.pk, "json")
+        self.assertEqual(report["created"]["employees"], 1)
+
+    def test_undecodable_row_is_an_error(self):
+        def lines():
+            yield self.header
+            yield "dev@example.com,Dev,Last,Development,,Developer,,"
+            raise UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid start byte")
+
+        report = importer.import_org_structure(lines(), self.company.pk)
+        self.assertEqual(
+            report["errors"], [{"row": 3, "errors": [importer.DECODE_ERROR]}]
+        )
+        self.assertFalse(Department.objects.exists())
+
+    def test_ambiguous_department_name_is_rejected(self):
+        first = Department.objects.create(name="Sales", company=self.company)
+        Department.objects.create(name="Sales", parent=first, company=self.company)
+
+        report = self.import_csv(
+            "a@example.com,A,Last,Sales,,Manager,,",
+            "b@example.com,B,Last,Regional,Sales,Manager,,",
+        )
+        self.assertEqual([error["row"] for error in report["errors"]], [2, 3])
+        self.assertIn("Sales", report["errors"][0]["errors"][0])
+        self.assertFalse(Employee.objects.exists())
+        self.assertEqual(Department.objects.count(), 2)
+
+
+@override_settings(**TEST_SETTINGS)
+class AsyncEmployeeViewTests(TestCase):
+    url = "/organizations/async/api/v1/employee/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = Company.objects.create(company_name="Company")
+        cls.admin = create_user(cls.company, "admin@example.com", is_staff=True)
+        cls.user = create_user(cls.company, "user@example.com")
+        department = Department.objects.create(name="Department", company=cls.company)
+        position = Position.objects.create(name="Position", department=department)
+        cls.employees = [
+            Employee.objects.create(user=user, department=department, position=position)
+            for user in (cls.admin, cls.user)
+        ]
+
+    def get(self, url: str, user: User | None = None, **params):
+        headers = {}
+        if user is not None:
+            headers["Authorization"] = f"Bearer {AccessToken.for_user(user)}"
+        return self.async_client.get(url, params, headers=headers)
+
+    async def test_list_is_paginated(self):
+        response = await self.get(self.url, self.admin, page_size=1)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        first = response.json()
+        self.assertEqual(
+            [employee["id"] for employee in first["results"]], [self.employees[0].pk]
+        )
+
+        response = await self.get(first["next"], self.admin)
+        second = response.json()
+        self.assertEqual(
+            [employee["id"] for employee in second["results"]], [self.employees[1].pk]
+        )
+        self.assertIsNone(second["next"])
+
+    async def test_retrieve(self):
+        employee = self.employees[1]
+        response = await self.get(f"{self.url}{employee.pk}/", self.admin)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["id"], employee.pk)
+
+    async def test_permissions(self):
+        response = await self.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("Bearer", response["WWW-Authenticate"])
+
+        response = await self.get(self.url, self.user)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    async def test_inactive_user_is_rejected(self):
+        self.admin.is_active = False
+        await self.admin.asave()
+        response = await self.get(self.url, self.admin)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+@override_settings(**TEST_SETTINGS)
+class DepartmentHeadcountTests(TestCase):
+    def setUp(self):
+        self.company = Company.objects.create(company_name="Company")
+        self.root = self.create_department("Root")
+        self.left = self.create_department("Left", self.root)
+        self.right = self.create_department("Right", self.root)
+        self.leaf = self.create_department("Leaf", self.left)
+        self.position = Position.objects.create(name="Position", department=self.leaf)
+        self.employees = [
+            Employee.objects.create(
+                user=create_user(self.company, f"user{number}@example.com"),
+                department=self.leaf,
+                position=self.position,
+            )
+            for number in range(3)
+        ]
+
+    def create_department(self, name: str, parent=None) -> Department:
+        return Department.objects.create(name=name, parent=parent, company=self.company)
+
+    def assert_headcounts(self, expected: dict) -> None:
+        actual = dict(Department.objects.values_list("name", "subtree_headcount"))
+        self.assertEqual(actual, expected)
+        self.assertEqual(headcount.find_mismatches(Department, Employee), [])
+
+    def test_employees_counted_in_ancestors(self):
+        self.assert_headcounts({"Root": 3, "Left": 3, "Right": 0, "Leaf": 3})
+        self.assertEqual(Department.objects.get(pk=self.leaf.pk).headcount, 3)
+
+    def test_transfer_and_delete_employee(self):
+        employee = self.employees[0]
+        employee.department = self.right
+        employee.save()
+        self.assert_headcounts({"Root": 3, "Left": 2, "Right": 1, "Leaf": 2})
+
+        self.employees[1].delete()
+        self.assert_headcounts({"Root": 2, "Left": 1, "Right": 1, "Leaf": 1})
+
+    def test_move_subtree(self):
+        self.leaf.move_to(self.right)
+        self.assert_headcounts({"Root": 3, "Left": 0, "Right": 3, "Leaf": 3})
+        self.assertEqual(
+            Department.objects.get(pk=self.leaf.pk).path,
+            f"/{self.root.pk}/{self.right.pk}/{self.leaf.pk}/",
+        )
+
+    def test_stale_save_does_not_move_headcount_twice(self):
+        stale = Department.objects.get(pk=self.leaf.pk)
+        Department.objects.get(pk=self.leaf.pk).move_to(self.right)
+
+        stale.name = "Leaf"
+        stale.parent = self.right
+        stale.save()
+        self.assert_headcounts({"Root": 3, "Left": 0, "Right": 3, "Leaf": 3})
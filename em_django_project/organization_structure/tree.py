@@ -0,0 +1,97 @@
+"""
+Материализованные пути дерева подразделений.
+
+Каждое подразделение хранит путь от корня ("/1/5/9/") и глубину. Путь
+поддерживается Department.save(); модуль пересчитывает пути по полю parent
+целиком — для миграции, проверки согласованности и восстановления.
+"""
+
+from collections import defaultdict
+
+
+def subtree_range(path: str) -> dict:
+    """
+    Условие «путь лежит в поддереве path» в виде диапазона по индексу.
+
+    Пути состоят из цифр и «/», поэтому все пути поддерева "/1/5/" лежат
+    в диапазоне ["/1/5/", "/1/50"): «/» предшествует «0». В отличие от LIKE,
+    диапазон использует индекс по path в любой базе с бинарным сравнением строк.
+    """
+    return {"path__gte": path, "path__lt": path[:-1] + "0"}
+
+
+def path_ids(path: str) -> list[int]:
+    """Идентификаторы подразделений пути от корня, включая последнее."""
+    return [int(part) for part in path.strip("/").split("/") if part]
+
+
+def build_paths(rows) -> tuple[dict[int, tuple[str, int]], set[int]]:
+    """
+    Строит пути подразделений по списку смежности за O(n).
+
+    Аргументы:
+    - rows: пары (id, parent_id).
+
+    Возвращает:
+    - Кортеж (словарь id -> (путь, глубина), id подразделений в циклах).
+      Подразделения, не достижимые от корней, входят в цикл parent
+      или лежат под ним.
+    """
+    children = defaultdict(list)
+    ids = set()
+    for department_id, parent_id in rows:
+        ids.add(department_id)
+        children[parent_id].append(department_id)
+    # Родитель, отсутствующий в выборке, считается корнем.
+    roots = [
+        department_id
+        for parent_id, child_ids in children.items()
+        if parent_id is None or parent_id not in ids
+        for department_id in child_ids
+    ]
+    paths = {}
+    stack = [(department_id, "/", 0) for department_id in roots]
+    while stack:
+        department_id, parent_path, depth = stack.pop()
+        path = f"{parent_path}{department_id}/"
+        paths[department_id] = (path, depth)
+        stack.extend(
+            (child_id, path, depth + 1) for child_id in children[department_id]
+        )
+    return paths, ids - paths.keys()
+
+
+def find_mismatches(department_model) -> tuple[list, set[int]]:
+    """
+    Сравнивает сохраненные пути с пересчитанными по полю parent.
+
+    Возвращает:
+    - Кортеж (подразделения с неверным путем или глубиной,
+      id подразделений в циклах).
+    """
+    rows = list(
+        department_model.objects.values_list("id", "parent_id", "path", "depth")
+    )
+    paths, cyclic = build_paths((row[0], row[1]) for row in rows)
+    mismatched = []
+    for department_id, _, path, depth in rows:
+        expected = paths.get(department_id)
+        if expected is not None and expected != (path, depth):
+            mismatched.append(
+                department_model(id=department_id, path=expected[0], depth=expected[1])
+            )
+    return mismatched, cyclic
+
+
+def repair(department_model, batch_size: int = 1000) -> tuple[int, set[int]]:
+    """
+    Перезаписывает неверные пути пересчитанными.
+
+    Возвращает:
+    - Кортеж (количество исправленных подразделений, id подразделений в циклах).
+    """
+    mismatched, cyclic = find_mismatches(department_model)
+    department_model.objects.bulk_update(
+        mismatched, ["path", "depth"], batch_size=batch_size
+    )
+    return len(mismatched), cyclic
@@ -1,13 +1,36 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import DepartmentViewSet, EmployeeViewSet, PositionViewSet
+from .async_views import DepartmentAsyncView, EmployeeAsyncView, PositionAsyncView
+from .views import (
+    DepartmentViewSet,
+    EmployeeViewSet,
+    OrganizationImportView,
+    OrganizationTreeView,
+    PositionViewSet,
+)
 
 router = DefaultRouter()
 router.register(r"department", DepartmentViewSet)
 router.register(r"position", PositionViewSet)
 router.register(r"employee", EmployeeViewSet)
 
+async_urlpatterns = []
+for prefix, view in (
+    ("department", DepartmentAsyncView),
+    ("position", PositionAsyncView),
+    ("employee", EmployeeAsyncView),
+):
+    async_urlpatterns += [
+        path(f"{prefix}/", view.as_view(), name=f"{prefix}-async-list"),
+        path(f"{prefix}/<str:pk>/", view.as_view(), name=f"{prefix}-async-detail"),
+    ]
+
 urlpatterns = [
+    path("api/v1/tree/", OrganizationTreeView.as_view(), name="organization-tree"),
+    path(
+        "api/v1/import/", OrganizationImportView.as_view(), name="organization-import"
+    ),
     path("api/v1/", include(router.urls)),
+    path("async/api/v1/", include(async_urlpatterns)),
 ]
@@ -1,12 +1,36 @@
-from rest_framework import viewsets
+import codecs
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from em_django_project.conditional import ConditionalRequestMixin, make_etag
+from em_django_project.dynamic_fields import DynamicFieldsViewMixin
+from em_django_project.tenancy import TenantScopedMixin
 
+from . import importer, reporting, snapshot
 from .models import Department, Employee, Position
-from .serializers import (DepartmentSerializer, EmployeeSerializer,
-                          PositionSerializer)
+from .serializers import (
+    DepartmentMoveSerializer,
+    DepartmentSerializer,
+    EmployeeSerializer,
+    PositionSerializer,
+    ReportingEmployeeSerializer,
+)
 
 
-class DepartmentViewSet(viewsets.ModelViewSet):
+class DepartmentViewSet(
+    DynamicFieldsViewMixin,
+    TenantScopedMixin,
+    ConditionalRequestMixin,
+    viewsets.ModelViewSet,
+):
     """
     API endpoint, позволяющий просматривать, создавать, редактировать и удалять подразделения компании.
 
@@ -17,14 +41,57 @@ class DepartmentViewSet(viewsets.ModelViewSet):
     - update: Обновление подразделения по ID.
     - partial_update: Частичное обновление подразделения по ID.
     - destroy: Удаление подразделения по ID.
+    - move: Перенос подразделения со всем поддеревом под другого родителя.
+
+    Параметры чтения: fields — поля ответа через запятую; expand — встроить
+    связанные объекты (manager, parent).
+    Поддерживаются условные запросы: ETag / Last-Modified, If-None-Match и If-Match.
+    Доступны только данные компании текущего пользователя.
     """
 
     queryset = Department.objects.all()
     serializer_class = DepartmentSerializer
     permission_classes = [IsAuthenticated, IsAdminUser]
+    query_budget = {"move": 14}
+
+    @action(url_path="move", detail=True, methods=["post"])
+    def move(self, request: Request, pk=None) -> Response:
+        """
+        Переносит подразделение вместе с поддеревом под другого родителя.
+
+        Количество запросов не зависит от размера ветки: пути поддерева
+        обновляются одним UPDATE в транзакции с блокировкой строк.
+        Поддерживается If-Match.
 
+        Аргументы:
+        - request: Объект запроса с полем parent (ID нового родителя или null).
+        - pk: ID подразделения.
 
-class PositionViewSet(viewsets.ModelViewSet):
+        Возвращает:
+        - Response с перенесенным подразделением.
+        - 400, если новый родитель лежит в поддереве подразделения.
+        """
+        response = self._write_with_precondition(self._move, request, pk=pk)
+        if response.status_code == status.HTTP_200_OK:
+            response["ETag"] = self.get_object_etag(self.get_object_version())
+        return response
+
+    def _move(self, request: Request, pk=None) -> Response:
+        department = self.get_object()
+        serializer = DepartmentMoveSerializer(
+            department, data=request.data, context=self.get_serializer_context()
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(data=DepartmentSerializer(department).data)
+
+
+class PositionViewSet(
+    DynamicFieldsViewMixin,
+    TenantScopedMixin,
+    ConditionalRequestMixin,
+    viewsets.ModelViewSet,
+):
     """
     API endpoint, позволяющий просматривать, создавать, редактировать и удалять должности в компании.
 
@@ -35,6 +102,11 @@ class PositionViewSet(viewsets.ModelViewSet):
     - update: Обновление должности по ID.
     - partial_update: Частичное обновление должности по ID.
     - destroy: Удаление должности по ID.
+
+    Параметры чтения: fields — поля ответа через запятую; expand — встроить
+    связанные объекты (department).
+    Поддерживаются условные запросы: ETag / Last-Modified, If-None-Match и If-Match.
+    Доступны только данные компании текущего пользователя.
     """
 
     queryset = Position.objects.all()
@@ -42,7 +114,12 @@ class PositionViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated, IsAdminUser]
 
 
-class EmployeeViewSet(viewsets.ModelViewSet):
+class EmployeeViewSet(
+    DynamicFieldsViewMixin,
+    TenantScopedMixin,
+    ConditionalRequestMixin,
+    viewsets.ModelViewSet,
+):
     """
     API endpoint, позволяющий просматривать, создавать, редактировать и удалять сотрудников в компании.
 
@@ -53,8 +130,151 @@ class EmployeeViewSet(viewsets.ModelViewSet):
     - update: Обновление данных сотрудника по ID.
     - partial_update: Частичное обновление данных сотрудника по ID.
     - destroy: Удаление сотрудника по ID.
+    - subordinates: Прямые и косвенные подчиненные сотрудника.
+    - managers: Цепочка руководителей сотрудника до верхнего уровня.
+    - span: Охват управления сотрудника.
+
+    Параметры чтения: fields — поля ответа через запятую; expand — встроить
+    связанные объекты (user, department, position, manager).
+    Поддерживаются условные запросы: ETag / Last-Modified, If-None-Match и If-Match.
+    Доступны только данные компании текущего пользователя.
     """
 
     queryset = Employee.objects.all()
     serializer_class = EmployeeSerializer
     permission_classes = [IsAuthenticated, IsAdminUser]
+
+    @action(url_path="subordinates", detail=True, methods=["get"])
+    def subordinates(self, request: Request, pk=None) -> Response:
+        """
+        Возвращает всех подчиненных сотрудника на любой глубине.
+
+        Аргументы:
+        - request: Объект запроса.
+        - pk: ID сотрудника.
+
+        Возвращает:
+        - Response со списком сотрудников и уровнем подчинения (depth).
+        """
+        employee = self.get_object()
+        serializer = ReportingEmployeeSerializer(
+            reporting.get_subordinates(employee.pk), many=True
+        )
+        return Response(data=serializer.data)
+
+    @action(url_path="managers", detail=True, methods=["get"])
+    def managers(self, request: Request, pk=None) -> Response:
+        """
+        Возвращает цепочку руководителей сотрудника до верхнего уровня.
+
+        Аргументы:
+        - request: Объект запроса.
+        - pk: ID сотрудника.
+
+        Возвращает:
+        - Response со списком руководителей от непосредственного к верхнему.
+        """
+        employee = self.get_object()
+        serializer = ReportingEmployeeSerializer(
+            reporting.get_managers(employee.pk), many=True
+        )
+        return Response(data=serializer.data)
+
+    @action(url_path="span", detail=True, methods=["get"])
+    def span(self, request: Request, pk=None) -> Response:
+        """
+        Возвращает охват управления сотрудника.
+
+        Аргументы:
+        - request: Объект запроса.
+        - pk: ID сотрудника.
+
+        Возвращает:
+        - Response с количеством прямых (direct) и всех (total) подчиненных
+          и количеством уровней подчинения (depth).
+        """
+        employee = self.get_object()
+        return Response(data=reporting.get_span_of_control(employee.pk))
+
+
+class OrganizationTreeView(APIView):
+    """
+    API endpoint, возвращающий оргструктуру компании пользователя одним деревом.
+
+    Ответ: подразделения с вложенными дочерними подразделениями (children),
+    должностями (positions) и сотрудниками должностей (employees).
+    Ответ берется из кэшированного снимка оргструктуры компании;
+    по версии снимка поддерживается If-None-Match.
+    """
+
+    permission_classes = [IsAuthenticated, IsAdminUser]
+    query_budget = {"get": 4}
+
+    def get(self, request):
+        """
+        Возвращает дерево оргструктуры компании текущего пользователя.
+
+        Аргументы:
+        - request: Объект запроса.
+
+        Возвращает:
+        - JSON-ответ с деревом подразделений или 304, если снимок не изменился.
+        """
+        company_id = request.user.company_id
+        version, body = snapshot.get_snapshot(company_id)
+        # Без кэша версии нет: ETag считается по самому снимку.
+        etag = make_etag("org-tree", company_id, body if version is None else version)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(
+                body, content_type="application/json; charset=utf-8"
+            )
+        response["ETag"] = etag
+        return response
+
+
+class OrganizationImportView(APIView):
+    """
+    API endpoint для массового импорта оргструктуры компании из CSV-
+    или JSON-файла.
+
+    Формат файла описан в organization_structure.importer. Подразделения,
+    должности, пользователи и сотрудники создаются пакетно в одной транзакции;
+    при ошибках в строках ничего не записывается.
+    """
+
+    permission_classes = [IsAuthenticated, IsAdminUser]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request: Request) -> Response:
+        """
+        Импортирует оргструктуру в компанию текущего пользователя.
+
+        Аргументы:
+        - request: Объект запроса с файлом в поле file. Формат — поле
+          file_format (csv или json), по умолчанию по расширению файла.
+
+        Возвращает:
+        - 201 с количеством созданных объектов.
+        - 400 с ошибками по номерам строк файла.
+        """
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response(data="file is required", status=status.HTTP_400_BAD_REQUEST)
+        default_format = "json" if upload.name.lower().endswith(".json") else "csv"
+        file_format = request.data.get("file_format") or default_format
+        if file_format not in importer.IMPORT_FORMATS:
+            return Response(
+                data=f"file_format must be one of {importer.IMPORT_FORMATS}",
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        source = (
+            upload if file_format == "json" else codecs.iterdecode(upload, "utf-8-sig")
+        )
+        report = importer.import_org_structure(
+            source, request.user.company_id, file_format
+        )
+        status_code = (
+            status.HTTP_400_BAD_REQUEST if report["errors"] else status.HTTP_201_CREATED
+        )
+        return Response(data=report, status=status_code)
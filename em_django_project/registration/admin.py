@@ -1,5 +1,5 @@
 from django.contrib import admin
-from registration.models import AccountInvite, Company, User
+from registration.models import AccountInvite, Company, OutboxEmail, User
 
 
 @admin.register(Company)
@@ -24,5 +24,12 @@ class UserAdmin(admin.ModelAdmin):
 
 @admin.register(AccountInvite)
 class AccountInviteAdmin(admin.ModelAdmin):
-    list_display = ("account", "invite_token")
+    list_display = ("account", "invite_token", "created_at", "expires_at")
     search_fields = ("account",)
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ("subject", "to", "status", "attempts", "next_attempt_at")
+    search_fields = ("subject",)
+    list_filter = ("status",)
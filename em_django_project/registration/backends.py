@@ -0,0 +1,35 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from . import hashing
+
+UserModel = get_user_model()
+
+
+class PooledPasswordBackend(ModelBackend):
+    """
+    ModelBackend, проверяющий пароль в пуле хеширования (см. hashing).
+
+    Используется входом по JWT (TokenObtainPairView) и админкой: поток
+    запроса не занимает процессор на PBKDF2, а при перегрузке пула
+    запрос получает 503 с Retry-After (в админке — через
+    hashing.HashingPoolBusyMiddleware).
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Хеширование и для несуществующего пользователя: время ответа
+            # не выдает, зарегистрирована ли почта.
+            hashing.make_password(password)
+            return None
+        if hashing.verify_user_password(user, password) and self.user_can_authenticate(
+            user
+        ):
+            return user
+        return None
@@ -0,0 +1,208 @@
+"""
+Хеширование паролей вне потока запроса.
+
+PBKDF2 занимает сотни миллисекунд процессора на каждый пароль, и при
+потоке входов запросы начинают ждать друг друга. Хеширование и проверка
+паролей выполняются в ограниченном пуле процессов (PASSWORD_HASH_POOL_SIZE):
+
+- одновременно в пуле не больше PASSWORD_HASH_MAX_PENDING заданий;
+- если место не освободилось за PASSWORD_HASH_WAIT_TIMEOUT секунд,
+  запрос получает 503 с Retry-After вместо того, чтобы копить очередь.
+
+Пул создается при первом обращении в каждом процессе сервера. Процессы пула
+запускаются через forkserver (или spawn, где его нет), а не fork: копия
+многопоточного процесса сервера могла бы унаследовать захваченные другими
+потоками блокировки. Текущие PASSWORD_HASHERS передаются процессам пула
+при запуске. Если процесс пула завершился (OOM, kill), пул пересоздается,
+и задание повторяется один раз.
+
+При PASSWORD_HASH_POOL_SIZE = 0 хеширование выполняется в потоке запроса.
+"""
+
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.http import HttpResponse
+from django.utils.deprecation import MiddlewareMixin
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+_lock = threading.Lock()
+_pool = None
+_pool_pid = None
+_slots = None
+
+
+class HashingPoolBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Password hashing is overloaded, try again later."
+    default_code = "hashing_pool_busy"
+
+    def __init__(self):
+        super().__init__()
+        # exception_handler DRF передает wait в заголовок Retry-After.
+        self.wait = settings.PASSWORD_HASH_RETRY_AFTER
+
+
+class HashingPoolBusyMiddleware(MiddlewareMixin):
+    """
+    Отвечает 503 с Retry-After на HashingPoolBusy в представлениях Django
+    (вход в админку). Представления DRF обрабатывают исключение сами.
+    """
+
+    def process_exception(self, request, exception) -> HttpResponse | None:
+        if not isinstance(exception, HashingPoolBusy):
+            return None
+        response = HttpResponse(
+            exception.detail,
+            status=exception.status_code,
+            content_type="text/plain; charset=utf-8",
+        )
+        response["Retry-After"] = str(exception.wait)
+        return response
+
+
+def _init_worker(password_hashers: list[str]) -> None:
+    # Процесс пула читает настройки заново и не видит изменений,
+    # сделанных в родителе после запуска (override_settings).
+    settings.PASSWORD_HASHERS = password_hashers
+
+
+def _get_pool() -> tuple[ProcessPoolExecutor, threading.BoundedSemaphore]:
+    global _pool, _pool_pid, _slots
+    with _lock:
+        # После fork процесса сервера пул родителя недоступен: создается свой.
+        if _pool_pid != os.getpid():
+            _pool = None
+            _pool_pid = os.getpid()
+            _slots = threading.BoundedSemaphore(settings.PASSWORD_HASH_MAX_PENDING)
+        if _pool is None:
+            methods = multiprocessing.get_all_start_methods()
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_POOL_SIZE,
+                mp_context=multiprocessing.get_context(
+                    "forkserver" if "forkserver" in methods else "spawn"
+                ),
+                initializer=_init_worker,
+                initargs=(list(settings.PASSWORD_HASHERS),),
+            )
+        return _pool, _slots
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    """Забывает сломанный пул: следующее обращение создаст новый."""
+    global _pool
+    with _lock:
+        if _pool is pool:
+            _pool = None
+
+
+def shutdown_pool() -> None:
+    """Останавливает пул; следующий вызов создаст новый с текущими настройками."""
+    global _pool, _pool_pid
+    with _lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.shutdown()
+        _pool = _pool_pid = None
+
+
+def _with_pool(run):
+    """
+    Вызывает run(pool, slots). Если пул сломан (BrokenProcessPool),
+    сбрасывает его и повторяет вызов один раз с новым пулом.
+    """
+    for retry in (True, False):
+        pool, slots = _get_pool()
+        try:
+            return run(pool, slots)
+        except BrokenProcessPool:
+            _discard_pool(pool)
+            if not retry:
+                raise
+
+
+def _submit(pool, slots, function, *args) -> Future:
+    """
+    Ставит задание в пул, если в нем есть место.
+
+    Исключения:
+    - HashingPoolBusy, если место не освободилось за PASSWORD_HASH_WAIT_TIMEOUT.
+    """
+    if not slots.acquire(timeout=settings.PASSWORD_HASH_WAIT_TIMEOUT):
+        raise HashingPoolBusy()
+    try:
+        future = pool.submit(function, *args)
+    except BaseException:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    return future
+
+
+def _run(function, *args):
+    if not settings.PASSWORD_HASH_POOL_SIZE:
+        return function(*args)
+    return _with_pool(
+        lambda pool, slots: _submit(pool, slots, function, *args).result()
+    )
+
+
+def _make_passwords(passwords: list[str]) -> list[str]:
+    return [hashers.make_password(password) for password in passwords]
+
+
+def make_password(password: str) -> str:
+    """Хеширует пароль в пуле (аналог django.contrib.auth.hashers.make_password)."""
+    return _run(hashers.make_password, password)
+
+
+def check_password(password: str, encoded: str) -> bool:
+    """Проверяет пароль по хешу в пуле (аналог hashers.check_password)."""
+    return _run(hashers.check_password, password, encoded)
+
+
+def make_passwords(passwords: list[str]) -> list[str]:
+    """
+    Хеширует пакет паролей, распределяя его по процессам пула.
+
+    Аргументы:
+    - passwords: пароли в открытом виде.
+
+    Возвращает:
+    - Хеши в том же порядке.
+    """
+    if not passwords or not settings.PASSWORD_HASH_POOL_SIZE:
+        return _make_passwords(passwords)
+    size = math.ceil(len(passwords) / settings.PASSWORD_HASH_POOL_SIZE)
+
+    def run(pool, slots) -> list[str]:
+        futures = [
+            _submit(pool, slots, _make_passwords, passwords[start : start + size])
+            for start in range(0, len(passwords), size)
+        ]
+        return [encoded for future in futures for encoded in future.result()]
+
+    return _with_pool(run)
+
+
+def verify_user_password(user, password: str) -> bool:
+    """
+    Проверяет пароль пользователя в пуле.
+
+    Как и User.check_password, при устаревших параметрах хеширования
+    сохраняет пароль, перехешированный текущим алгоритмом.
+    """
+    if not check_password(password, user.password):
+        return False
+    preferred = hashers.get_hasher()
+    hasher = hashers.identify_hasher(user.password)
+    if hasher.algorithm != preferred.algorithm or preferred.must_update(user.password):
+        user.password = make_password(password)
+        user.save(update_fields=["password"])
+    return True
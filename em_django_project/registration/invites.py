@@ -0,0 +1,90 @@
+"""
+Жизненный цикл приглашений для регистрации.
+
+- issue() выдает приглашение одним атомарным INSERT ... ON CONFLICT:
+  новая строка вставляется, истекшее приглашение перевыпускается, а для
+  действующего ничего не меняется. Параллельные запросы с одной почтой
+  не приводят ни к ошибке уникальности, ни к двум действующим кодам.
+  Запрос использует ON CONFLICT ... DO UPDATE ... RETURNING: нужен SQLite
+  не ниже 3.35 (RETURNING) или PostgreSQL; MySQL такой синтаксис
+  не поддерживает.
+- is_valid() проверяет код по индексу (account, invite_token, expires_at),
+  не читая саму таблицу.
+- purge() удаляет истекшие приглашения пачками ограниченного размера.
+"""
+
+import secrets
+import string
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import AccountInvite, invite_expires_at
+
+TOKEN_ALPHABET = string.ascii_uppercase + string.digits
+TOKEN_LENGTH = 10
+
+
+def _generate_token() -> str:
+    return "".join(secrets.choice(TOKEN_ALPHABET) for _ in range(TOKEN_LENGTH))
+
+
+def issue(account: str) -> str | None:
+    """
+    Выдает приглашение для почты.
+
+    Аргументы:
+    - account: почта приглашаемого.
+
+    Возвращает:
+    - Код приглашения или None, если для почты уже есть действующее приглашение.
+    """
+    now = timezone.now()
+    token = _generate_token()
+    table = connection.ops.quote_name(AccountInvite._meta.db_table)
+    adapt = connection.ops.adapt_datetimefield_value
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {table} (account, invite_token, created_at, expires_at)
+            VALUES (%s, %s, %s, %s)
+            ON CONFLICT (account) DO UPDATE SET
+                invite_token = EXCLUDED.invite_token,
+                created_at = EXCLUDED.created_at,
+                expires_at = EXCLUDED.expires_at
+            WHERE {table}.expires_at <= %s
+            RETURNING invite_token
+            """,
+            [account, token, adapt(now), adapt(invite_expires_at()), adapt(now)],
+        )
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def is_valid(account: str, invite_token: str) -> bool:
+    """Проверяет, что код приглашения верен и не истек."""
+    return AccountInvite.objects.filter(
+        account=account, invite_token=invite_token, expires_at__gt=timezone.now()
+    ).exists()
+
+
+def purge(batch_size: int | None = None) -> int:
+    """
+    Удаляет истекшие приглашения пачками по индексу expires_at.
+
+    Возвращает:
+    - Количество удаленных приглашений.
+    """
+    batch_size = batch_size or settings.REGISTRATION_INVITE_PURGE_BATCH_SIZE
+    now = timezone.now()
+    deleted = 0
+    while True:
+        ids = list(
+            AccountInvite.objects.filter(expires_at__lte=now)
+            .order_by("expires_at")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        deleted += AccountInvite.objects.filter(id__in=ids).delete()[0]
@@ -0,0 +1,108 @@
+import statistics
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from registration import hashing
+
+PASSWORD = "benchmark-password"
+
+
+def _worker(encoded: str, deadline: float, latencies: list, rejected: list) -> None:
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        try:
+            hashing.check_password(PASSWORD, encoded)
+        except hashing.HashingPoolBusy:
+            rejected.append(1)
+            continue
+        latencies.append(time.perf_counter() - started)
+
+
+def _run(encoded: str, concurrency: int, duration: float) -> dict:
+    latencies, rejected = [], []
+    deadline = time.monotonic() + duration
+    threads = [
+        threading.Thread(target=_worker, args=(encoded, deadline, latencies, rejected))
+        for _ in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    latencies.sort()
+    return {
+        "logins": len(latencies),
+        "rps": len(latencies) / duration,
+        "p50": statistics.median(latencies) * 1000 if latencies else 0,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0,
+        "rejected": len(rejected),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Нагрузочный тест проверки паролей при входе: входов в секунду, p50/p99 "
+        "задержки и отказы (503) для разных алгоритмов хеширования и размеров "
+        "пула процессов. Размер пула 0 — проверка в потоке запроса."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--hasher",
+            action="append",
+            dest="hashers",
+            help="Класс хешера, например django.contrib.auth.hashers."
+            "PBKDF2PasswordHasher; можно указать несколько раз.",
+        )
+        parser.add_argument(
+            "--pool-size",
+            action="append",
+            type=int,
+            dest="pool_sizes",
+            help="Размер пула процессов; можно указать несколько раз.",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=32,
+            help="Количество одновременных входов.",
+        )
+        parser.add_argument(
+            "--duration", type=float, default=10, help="Длительность каждого теста, с."
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'hasher':24} {'pool':>5} {'logins':>8} {'logins/s':>9} "
+            f"{'p50, ms':>9} {'p99, ms':>9} {'rejected':>9}"
+        )
+        for hasher in options["hashers"] or settings.PASSWORD_HASHERS[:1]:
+            for pool_size in options["pool_sizes"] or (
+                0,
+                settings.PASSWORD_HASH_POOL_SIZE,
+            ):
+                with override_settings(
+                    PASSWORD_HASHERS=[hasher],
+                    PASSWORD_HASH_POOL_SIZE=pool_size,
+                    PASSWORD_HASH_MAX_PENDING=4 * max(pool_size, 1),
+                ):
+                    # Пул создается заново, чтобы процессы унаследовали хешер.
+                    hashing.shutdown_pool()
+                    try:
+                        result = _run(
+                            hashers.make_password(PASSWORD),
+                            options["concurrency"],
+                            options["duration"],
+                        )
+                    finally:
+                        hashing.shutdown_pool()
+                self.stdout.write(
+                    f"{hasher.rsplit('.', 1)[-1]:24} {pool_size:>5} "
+                    f"{result['logins']:>8} {result['rps']:>9.1f} "
+                    f"{result['p50']:>9.1f} {result['p99']:>9.1f} "
+                    f"{result['rejected']:>9}"
+                )
@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from registration import invites
+
+
+class Command(BaseCommand):
+    help = "Удаляет истекшие приглашения для регистрации."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.REGISTRATION_INVITE_PURGE_BATCH_SIZE,
+            help="Количество приглашений, удаляемых за один запрос.",
+        )
+
+    def handle(self, *args, **options):
+        deleted = invites.purge(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired invites"))
@@ -0,0 +1,49 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from registration import outbox
+
+
+class Command(BaseCommand):
+    help = (
+        "Отправляет письма из очереди пачками через одно соединение "
+        "с почтовым сервером."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Работать постоянно, повторяя проход с интервалом --interval.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=settings.EMAIL_OUTBOX_INTERVAL,
+            help="Интервал между проходами в секундах.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+            help="Количество писем, отправляемых за одну пачку.",
+        )
+        parser.add_argument(
+            "--backend",
+            help=(
+                "Почтовый бэкенд вместо EMAIL_BACKEND, например "
+                "django.core.mail.backends.console.EmailBackend."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            count = outbox.drain(
+                batch_size=options["batch_size"], backend=options["backend"]
+            )
+            if count:
+                self.stdout.write(f"Processed {count} emails")
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
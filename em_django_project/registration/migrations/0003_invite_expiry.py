@@ -0,0 +1,33 @@
+# Generated by Django 5.0.4 on 2026-10-18 17:01
+
+import registration.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("registration", "0002_outbox_email"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="accountinvite",
+            name="expires_at",
+            field=models.DateTimeField(
+                default=registration.models.invite_expires_at,
+                verbose_name="Действует до",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="accountinvite",
+            index=models.Index(
+                fields=["account", "invite_token", "expires_at"],
+                name="invite_lookup_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="accountinvite",
+            index=models.Index(fields=["expires_at"], name="invite_expires_at_idx"),
+        ),
+    ]
@@ -1,5 +1,9 @@
+from datetime import timedelta
+
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 
 class Company(models.Model):
@@ -15,6 +19,8 @@ class Company(models.Model):
 
 
 class User(AbstractUser):
+    tenant_field = "company"
+
     first_name = models.CharField(
         "Имя",
         max_length=150,
@@ -52,10 +58,16 @@ class User(AbstractUser):
         verbose_name_plural = "Пользователи"
 
 
+def invite_expires_at():
+    """Срок действия нового приглашения: REGISTRATION_INVITE_TTL секунд."""
+    return timezone.now() + timedelta(seconds=settings.REGISTRATION_INVITE_TTL)
+
+
 class AccountInvite(models.Model):
     account = models.EmailField("Почта", max_length=254, unique=True)
     invite_token = models.CharField("Токен", max_length=10)
     created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField("Действует до", default=invite_expires_at)
 
     def __str__(self):
         return self.account
@@ -63,3 +75,55 @@ class AccountInvite(models.Model):
     class Meta:
         verbose_name = "Приглашение"
         verbose_name_plural = "Приглашения"
+        indexes = [
+            # Проверка кода при регистрации читает только этот индекс.
+            models.Index(
+                fields=["account", "invite_token", "expires_at"],
+                name="invite_lookup_idx",
+            ),
+            models.Index(fields=["expires_at"], name="invite_expires_at_idx"),
+        ]
+
+
+class OutboxEmail(models.Model):
+    """
+    Письмо в очереди на отправку (outbox).
+
+    Запросы только добавляют строку в таблицу в своей транзакции;
+    отправкой занимается команда send_outbox (см. registration.outbox).
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_SENT = "sent"
+    STATUS_DEAD = "dead"
+    STATUS_CHOICES = (
+        (STATUS_PENDING, "Ожидает отправки"),
+        (STATUS_SENT, "Отправлено"),
+        (STATUS_DEAD, "Не доставлено"),
+    )
+
+    subject = models.CharField("Тема", max_length=255)
+    body = models.TextField("Текст")
+    from_email = models.CharField("Отправитель", max_length=254)
+    to = models.JSONField("Получатели")
+    status = models.CharField(
+        "Статус", max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING
+    )
+    attempts = models.PositiveSmallIntegerField("Попытки", default=0)
+    next_attempt_at = models.DateTimeField("Следующая попытка", default=timezone.now)
+    last_error = models.TextField("Последняя ошибка", blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField("Отправлено", null=True, blank=True)
+
+    def __str__(self):
+        return self.subject
+
+    class Meta:
+        verbose_name = "Письмо в очереди"
+        verbose_name_plural = "Очередь писем"
+        indexes = [
+            models.Index(
+                fields=["status", "next_attempt_at", "id"],
+                name="outbox_status_next_attempt_idx",
+            ),
+        ]
@@ -0,0 +1,171 @@
+"""
+Очередь исходящих писем (outbox).
+
+Запросы не обращаются к почтовому серверу: enqueue() записывает письма
+в таблицу OutboxEmail в текущей транзакции, поэтому время ответа
+не зависит от SMTP, а письмо не теряется, если сервер недоступен.
+
+Команда send_outbox разбирает очередь пачками. Строки пачки захватываются
+на время аренды (next_attempt_at сдвигается на EMAIL_OUTBOX_LEASE_TIMEOUT),
+после чего письма отправляются через одно соединение с почтовым сервером.
+Неудачная попытка откладывает письмо с экспоненциально растущей задержкой,
+после EMAIL_OUTBOX_MAX_ATTEMPTS попыток письмо получает статус dead.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(messages) -> int:
+    """
+    Ставит письма в очередь одним INSERT.
+
+    Аргументы:
+    - messages: объекты EmailMessage.
+
+    Возвращает:
+    - Количество поставленных в очередь писем.
+    """
+    rows = [
+        OutboxEmail(
+            subject=message.subject,
+            body=message.body,
+            from_email=message.from_email,
+            to=list(message.to),
+        )
+        for message in messages
+    ]
+    OutboxEmail.objects.bulk_create(rows, batch_size=settings.EMAIL_OUTBOX_BATCH_SIZE)
+    return len(rows)
+
+
+def _claim(batch_size: int, now) -> list[OutboxEmail]:
+    """
+    Захватывает пачку писем, срок отправки которых наступил.
+
+    Строки, захваченные другим обработчиком, пропускаются (SKIP LOCKED),
+    а аренда не дает повторно взять письмо, пока идет отправка.
+    """
+    with transaction.atomic():
+        emails = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboxEmail.STATUS_PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at", "id")[:batch_size]
+        )
+        if emails:
+            OutboxEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+                attempts=F("attempts") + 1,
+                next_attempt_at=now
+                + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_TIMEOUT),
+            )
+    for email in emails:
+        email.attempts += 1
+    return emails
+
+
+def _deliver(emails: list[OutboxEmail], backend: str | None) -> tuple[list, list]:
+    """
+    Отправляет письма через одно соединение.
+
+    Возвращает:
+    - Кортеж (отправленные письма, пары (письмо, ошибка)).
+    """
+    connection = get_connection(backend)
+    try:
+        connection.open()
+    except Exception as error:
+        logger.exception("Failed to connect to the mail server")
+        return [], [(email, error) for email in emails]
+    sent, failed = [], []
+    try:
+        for email in emails:
+            message = EmailMessage(
+                subject=email.subject,
+                body=email.body,
+                from_email=email.from_email,
+                to=email.to,
+                connection=connection,
+            )
+            try:
+                message.send()
+            except Exception as error:
+                failed.append((email, error))
+            else:
+                sent.append(email)
+    finally:
+        connection.close()
+    return sent, failed
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def _record(sent: list, failed: list, now) -> None:
+    if sent:
+        OutboxEmail.objects.filter(pk__in=[email.pk for email in sent]).update(
+            status=OutboxEmail.STATUS_SENT, sent_at=now, last_error=""
+        )
+    for email, error in failed:
+        email.last_error = f"{type(error).__name__}: {error}"
+        if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            email.status = OutboxEmail.STATUS_DEAD
+            logger.error(
+                "Email %s to %s failed %s times and was given up",
+                email.pk,
+                email.to,
+                email.attempts,
+            )
+        else:
+            email.next_attempt_at = now + _retry_delay(email.attempts)
+    OutboxEmail.objects.bulk_update(
+        [email for email, _ in failed], ["status", "next_attempt_at", "last_error"]
+    )
+
+
+def send_batch(batch_size: int, backend: str | None = None, now=None) -> int:
+    """
+    Отправляет одну пачку писем из очереди.
+
+    Аргументы:
+    - batch_size: максимальное количество писем в пачке.
+    - backend: путь к почтовому бэкенду; по умолчанию EMAIL_BACKEND.
+    - now: текущий момент.
+
+    Возвращает:
+    - Количество обработанных писем (отправленных и отложенных).
+    """
+    now = now or timezone.now()
+    emails = _claim(batch_size, now)
+    if not emails:
+        return 0
+    sent, failed = _deliver(emails, backend)
+    _record(sent, failed, timezone.now())
+    return len(emails)
+
+
+def drain(batch_size: int | None = None, backend: str | None = None) -> int:
+    """
+    Отправляет все письма, срок отправки которых наступил.
+
+    Возвращает:
+    - Количество обработанных писем.
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    now = timezone.now()
+    total = 0
+    while True:
+        processed = send_batch(batch_size, backend=backend, now=now)
+        total += processed
+        if processed < batch_size:
+            return total
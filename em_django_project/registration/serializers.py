@@ -1,6 +1,6 @@
-from django.contrib.auth.hashers import make_password
 from rest_framework import serializers
 
+from . import hashing
 from .models import AccountInvite, Company, User
 
 
@@ -39,15 +39,31 @@ class UserSerializer(serializers.ModelSerializer):
         :param value: password of a user
         :return: a hashed version of the password
         """
-        return make_password(value)
+        return hashing.make_password(value)
 
     def create(self, validated_data):
         company = validated_data.pop("company")
         validated_data["username"] = " "
-        user = User.objects.create_user(**validated_data, company=company)
+        # Пароль уже захеширован в validate_password: create_user захешировал
+        # бы его повторно, причем в потоке запроса.
+        user = User.objects.create(**validated_data, company=company)
         return user
 
 
+class BulkInviteUserSerializer(serializers.ModelSerializer):
+    """
+    Пользователь пакетного приглашения.
+
+    Проверяет только поля: уникальность почты проверяется одним запросом
+    для всего пакета, а пароль хешируется отдельно.
+    """
+
+    class Meta:
+        model = User
+        fields = ("first_name", "last_name", "account", "password", "is_staff")
+        extra_kwargs = {"account": {"validators": []}}
+
+
 class AccountInviteSerializer(serializers.ModelSerializer):
 
     class Meta:
@@ -1,28 +1,34 @@
-import random
-import string
-
-from django.contrib.auth.hashers import check_password
+from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage
 from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
 from django.http import QueryDict
 from django.shortcuts import get_object_or_404
 from rest_framework import status
 
-from .models import AccountInvite, Company, User
-from .serializers import AccountInviteSerializer, UserSerializer
+from . import hashing, invites, outbox
+from .models import Company, User
+from .serializers import BulkInviteUserSerializer, UserSerializer
+
+BULK_MODE_ALL_OR_NOTHING = "all_or_nothing"
+BULK_MODE_PARTIAL = "partial"
+BULK_MODES = (BULK_MODE_ALL_OR_NOTHING, BULK_MODE_PARTIAL)
 
 
 def check_account(query_params: QueryDict) -> tuple:
     """
-    Проверяет, существует ли аккаунт.
+    Проверяет почту и выдает приглашение для регистрации.
 
     Аргументы:
     - query_params: параметры запроса.
 
     Возвращает:
-    - (False, str), если аккаунт существует или указан не валидный email.
-    - (True, None), если аккаунт с таким email не существует.
+    - (False, str), если указан не валидный email, аккаунт уже
+      зарегистрирован или для почты уже есть действующее приглашение
+      (код повторно не выдается, пока прежний не истечет).
+    - (True, str) с кодом приглашения, если приглашение выдано
+      (в том числе повторно после истечения прежнего).
     """
     account = query_params.get("account")
     try:
@@ -30,36 +36,48 @@ def check_account(query_params: QueryDict) -> tuple:
     except ValidationError:
         return False, "Invalid email address"
 
-    try:
-        AccountInvite.objects.get(account=account)
+    if User.objects.filter(account=account).exists():
         return False, "Account with this email already exist"
-    except AccountInvite.DoesNotExist:
-        return True, None
+    invite_token = invites.issue(account)
+    if invite_token is None:
+        return False, "Invite for this email is already pending"
+    return True, invite_token
 
 
-def create_invite_token(query_params: QueryDict) -> str | None:
+def build_invite_email(account: str, invite_token: str | None = None) -> EmailMessage:
     """
-    Создает токен приглашения для регистрации.
+    Собирает письмо с приглашением для регистрации.
 
     Аргументы:
-    - query_params: параметры запроса.
+    - account: почта приглашаемого.
+    - invite_token: токен приглашения (необязательно).
 
     Возвращает:
-    - Строку с токеном приглашения.
+    - Объект EmailMessage.
     """
-    account = query_params.get("account")
-    invite_token = "".join(random.choices(string.ascii_uppercase + string.digits, k=10))
-    account_invite_serializer = AccountInviteSerializer(
-        data={"account": account, "invite_token": invite_token}
+    subject = "Подтверждение регистрации"
+    if invite_token:
+        message = (
+            f"Для завершения регистрации введите код подтверждения: {invite_token}"
+        )
+    else:
+        message = (
+            "Для завершения регистрации перейдите по ссылке и введите пароль: "
+            f"http://127.0.0.1:8000/auth/api/v1/confirm-registration/?account={account}"
+        )
+    return EmailMessage(
+        subject=subject,
+        body=message,
+        from_email=settings.EMAIL_HOST_USER,
+        to=[account],
     )
-    if account_invite_serializer.is_valid():
-        account_invite_serializer.save()
-        return invite_token
 
 
 def send_invite_email(params: dict, invite_token: str | None = None) -> None:
     """
-    Отправляет электронное письмо с приглашением для регистрации.
+    Ставит в очередь письмо с приглашением для регистрации.
+
+    Письмо отправляет команда send_outbox, запрос не ждет почтовый сервер.
 
     Аргументы:
     - params: параметры запроса.
@@ -68,27 +86,7 @@ def send_invite_email(params: dict, invite_token: str | None = None) -> None:
     Возвращает:
     - None.
     """
-    account = params.get("account")
-    subject = "Подтверждение регистрации"
-    if invite_token:
-        message = (
-            f"Для завершения регистрации введите код подтверждения: {invite_token}"
-        )
-    else:
-        message = (
-            "Для завершения регистрации перейдите по ссылке и введите пароль: "
-            f"http://127.0.0.1:8000/auth/api/v1/confirm-registration/?account={account}"
-        )
-    from_email = "email@example.com"
-    recipient_list = [account]
-    try:
-        send_mail(subject, message, from_email, recipient_list)
-    except Exception as e:
-        print(f"Произошла ошибка при отправке письма: {e}")
-
-    print(
-        f"Тема: {subject}, Сообщение: {message}, От: {from_email}, Кому: {recipient_list}"
-    )
+    outbox.enqueue([build_invite_email(params.get("account"), invite_token)])
 
 
 def confirm_account(request_data: dict) -> bool:
@@ -100,15 +98,11 @@ def confirm_account(request_data: dict) -> bool:
 
     Возвращает:
     - True, если учетная запись подтверждена.
-    - False, если учетная запись или токен недействительны.
+    - False, если учетная запись или токен недействительны или приглашение истекло.
     """
     account = request_data.get("account")
     invite_token = request_data.get("invite_token")
-    try:
-        AccountInvite.objects.get(account=account, invite_token=invite_token)
-        return True
-    except AccountInvite.DoesNotExist:
-        return False
+    return invites.is_valid(account, invite_token)
 
 
 def create_company(company_name: str) -> tuple:
@@ -182,6 +176,156 @@ def create_user(request_data: dict, user: User) -> tuple:
         return serializer_user.errors, status.HTTP_400_BAD_REQUEST
 
 
+def _validate_invites(items: list) -> tuple[list, list]:
+    """
+    Проверяет элементы пакетного приглашения без хеширования паролей.
+
+    Уникальность почты проверяется одним запросом для всего пакета.
+
+    Возвращает:
+    - Кортеж (сериализаторы, ошибки по каждому элементу).
+    """
+    serializers = [BulkInviteUserSerializer(data=item) for item in items]
+    errors = [
+        {} if serializer.is_valid() else dict(serializer.errors)
+        for serializer in serializers
+    ]
+    accounts = [
+        (
+            User.objects.normalize_email(serializer.validated_data["account"])
+            if not item_errors
+            else None
+        )
+        for serializer, item_errors in zip(serializers, errors)
+    ]
+    existing = set(
+        User.objects.filter(
+            account__in=[account for account in accounts if account]
+        ).values_list("account", flat=True)
+    )
+    seen = set()
+    for account, item_errors in zip(accounts, errors):
+        if account is None:
+            continue
+        if account in existing:
+            item_errors["account"] = ["User with this account already exists"]
+        elif account in seen:
+            item_errors["account"] = ["Duplicate account in request"]
+        seen.add(account)
+    return serializers, errors
+
+
+def invite_users(request_data: dict, user: User) -> tuple:
+    """
+    Пакетно создает неактивных пользователей компании и ставит в очередь
+    письма с приглашением.
+
+    Пароли хешируются параллельно в пуле процессов (см. hashing),
+    пользователи вставляются через bulk_create, письма ставятся в очередь
+    одним INSERT.
+
+    Аргументы:
+    - request_data: данные запроса: items — список пользователей
+      (first_name, last_name, account, password, is_staff), mode —
+      all_or_nothing (по умолчанию) или partial.
+    - user: объект текущего пользователя.
+
+    Возвращает:
+    - Кортеж с результатами по каждому элементу и статусом HTTP.
+    """
+    if not isinstance(request_data, dict):
+        return "Request body must be an object", status.HTTP_400_BAD_REQUEST
+    items = request_data.get("items")
+    mode = request_data.get("mode", BULK_MODE_ALL_OR_NOTHING)
+    if not isinstance(items, list) or not items:
+        return "items must be a non-empty list", status.HTTP_400_BAD_REQUEST
+    if len(items) > settings.REGISTRATION_INVITE_MAX_USERS:
+        return (
+            f"No more than {settings.REGISTRATION_INVITE_MAX_USERS} items are allowed",
+            status.HTTP_400_BAD_REQUEST,
+        )
+    if mode not in BULK_MODES:
+        return f"mode must be one of {BULK_MODES}", status.HTTP_400_BAD_REQUEST
+
+    serializers, errors = _validate_invites(items)
+    pending = {
+        index: serializer.validated_data
+        for index, (serializer, item_errors) in enumerate(zip(serializers, errors))
+        if not item_errors
+    }
+    if any(errors) and mode == BULK_MODE_ALL_OR_NOTHING:
+        pending = {}
+    passwords = dict(
+        zip(
+            pending,
+            hashing.make_passwords([data["password"] for data in pending.values()]),
+        )
+    )
+    while True:
+        users = {
+            index: User(
+                username=" ",
+                first_name=data["first_name"],
+                last_name=data["last_name"],
+                account=User.objects.normalize_email(data["account"]),
+                password=passwords[index],
+                is_staff=data.get("is_staff", False),
+                is_active=False,
+                company_id=user.company_id,
+            )
+            for index, data in pending.items()
+        }
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(
+                    users.values(), batch_size=settings.REGISTRATION_INVITE_BATCH_SIZE
+                )
+                outbox.enqueue(
+                    build_invite_email(new_user.account) for new_user in users.values()
+                )
+            break
+        except IntegrityError:
+            # Почту успел занять параллельный запрос после проверки
+            # уникальности: такие элементы становятся ошибками.
+            taken = set(
+                User.objects.filter(
+                    account__in=[new_user.account for new_user in users.values()]
+                ).values_list("account", flat=True)
+            )
+            if not taken:
+                raise
+            for index, new_user in users.items():
+                if new_user.account in taken:
+                    errors[index]["account"] = ["User with this account already exists"]
+            pending = {
+                index: data
+                for index, data in pending.items()
+                if not errors[index] and mode == BULK_MODE_PARTIAL
+            }
+
+    results = []
+    for index, item_errors in enumerate(errors):
+        if item_errors:
+            results.append({"index": index, "status": "error", "errors": item_errors})
+        elif index not in users:
+            results.append({"index": index, "status": "skipped"})
+        else:
+            results.append(
+                {
+                    "index": index,
+                    "status": "created",
+                    "id": users[index].pk,
+                    "account": users[index].account,
+                }
+            )
+
+    if not any(errors):
+        return results, status.HTTP_201_CREATED
+    if mode == BULK_MODE_ALL_OR_NOTHING or not users:
+        return results, status.HTTP_400_BAD_REQUEST
+    return results, status.HTTP_207_MULTI_STATUS
+
+
 def activate_user(request_data: dict, query_params: QueryDict) -> tuple:
     """
     Активирует пользователя.
@@ -195,7 +339,7 @@ def activate_user(request_data: dict, query_params: QueryDict) -> tuple:
     """
     user = get_object_or_404(User, account=query_params.get("account"))
     entered_password = request_data.get("password")
-    is_correct_password = check_password(entered_password, user.password)
+    is_correct_password = hashing.verify_user_password(user, entered_password)
     if is_correct_password:
         user.is_active = True
         user.save()
@@ -0,0 +1,275 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+from io import StringIO
+from smtplib import SMTPException
+from unittest import mock
+
+from django.core import mail
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from em_django_project.testing import TEST_SETTINGS, create_user
+
+from . import hashing, invites, outbox
+from .models import AccountInvite, Company, OutboxEmail, User
+
+CHECK_ACCOUNT_URL = "/auth/api/v1/check_account/"
+INVITE_USERS_URL = "/auth/api/v1/invite_users/"
+LOGIN_URL = "/auth/api/v1/login/"
+
+
+def invite_item(account: str) -> dict:
+    return {
+        "first_name": "First",
+        "last_name": "Last",
+        "account": account,
+        "password": "password",
+    }
+
+
+@override_settings(**TEST_SETTINGS)
+class InviteIssueTests(TestCase):
+    def test_issue_keeps_active_invite(self):
+        token = invites.issue("new@example.com")
+        self.assertIsNotNone(token)
+        self.assertIsNone(invites.issue("new@example.com"))
+        self.assertTrue(invites.is_valid("new@example.com", token))
+        self.assertEqual(AccountInvite.objects.count(), 1)
+
+    def test_issue_replaces_expired_invite(self):
+        token = invites.issue("new@example.com")
+        AccountInvite.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertFalse(invites.is_valid("new@example.com", token))
+
+        new_token = invites.issue("new@example.com")
+        self.assertIsNotNone(new_token)
+        self.assertTrue(invites.is_valid("new@example.com", new_token))
+        self.assertEqual(AccountInvite.objects.count(), 1)
+
+    def test_purge_deletes_only_expired_invites(self):
+        invites.issue("expired@example.com")
+        AccountInvite.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        invites.issue("active@example.com")
+        self.assertEqual(invites.purge(batch_size=1), 1)
+        self.assertEqual(
+            list(AccountInvite.objects.values_list("account", flat=True)),
+            ["active@example.com"],
+        )
+
+    def test_check_account_refuses_registered_account(self):
+        company = Company.objects.create(company_name="Company")
+        create_user(company, "user@example.com")
+        response = APIClient().get(CHECK_ACCOUNT_URL, {"account": "user@example.com"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, "Account with this email already exist")
+        self.assertFalse(AccountInvite.objects.exists())
+
+    def test_check_account_reports_pending_invite(self):
+        client = APIClient()
+        response = client.get(CHECK_ACCOUNT_URL, {"account": "new@example.com"})
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+
+        response = client.get(CHECK_ACCOUNT_URL, {"account": "new@example.com"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, "Invite for this email is already pending")
+
+
+@override_settings(**TEST_SETTINGS)
+class InviteUsersTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = Company.objects.create(company_name="Company")
+        cls.admin = create_user(cls.company, "admin@example.com", is_staff=True)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_invite_users(self):
+        response = self.client.post(
+            INVITE_USERS_URL,
+            {"items": [invite_item("a@example.com"), invite_item("b@example.com")]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        users = User.objects.filter(account__in=["a@example.com", "b@example.com"])
+        self.assertEqual(users.count(), 2)
+        self.assertFalse(users.filter(is_active=True).exists())
+        self.assertTrue(all(user.company_id == self.company.pk for user in users))
+        self.assertEqual(OutboxEmail.objects.count(), 2)
+
+    def test_all_or_nothing_writes_nothing_on_error(self):
+        response = self.client.post(
+            INVITE_USERS_URL,
+            {"items": [invite_item("a@example.com"), invite_item("admin@example.com")]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(User.objects.filter(account="a@example.com").exists())
+        self.assertFalse(OutboxEmail.objects.exists())
+
+    def test_partial_writes_valid_items(self):
+        response = self.client.post(
+            INVITE_USERS_URL,
+            {
+                "mode": "partial",
+                "items": [invite_item("a@example.com"), invite_item("invalid")],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(
+            [result["status"] for result in response.data], ["created", "error"]
+        )
+        self.assertTrue(User.objects.filter(account="a@example.com").exists())
+
+    def test_body_must_be_object(self):
+        response = self.client.post(
+            INVITE_USERS_URL, [invite_item("a@example.com")], format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(
+    **TEST_SETTINGS,
+    REST_FRAMEWORK={
+        "DEFAULT_AUTHENTICATION_CLASSES": (
+            "rest_framework_simplejwt.authentication.JWTAuthentication",
+        ),
+        "DEFAULT_THROTTLE_RATES": {"login.ip": "5/min", "login.account": "2/min"},
+    },
+)
+class ThrottlingTests(TestCase):
+    def setUp(self):
+        caches["throttle"].clear()
+        self.client = APIClient()
+
+    def login(self, account: str):
+        return self.client.post(
+            LOGIN_URL, {"account": account, "password": "wrong"}, format="json"
+        )
+
+    def test_account_limit(self):
+        codes = [self.login("user@example.com").status_code for _ in range(3)]
+        self.assertEqual(
+            codes,
+            [
+                status.HTTP_401_UNAUTHORIZED,
+                status.HTTP_401_UNAUTHORIZED,
+                status.HTTP_429_TOO_MANY_REQUESTS,
+            ],
+        )
+        response = self.login("user@example.com")
+        self.assertGreater(int(response["Retry-After"]), 0)
+        # Другая почта ограничивается своим счетчиком.
+        self.assertEqual(
+            self.login("other@example.com").status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+
+    def test_ip_limit(self):
+        codes = [
+            self.login(f"user{number}@example.com").status_code for number in range(6)
+        ]
+        self.assertEqual(codes.count(status.HTTP_429_TOO_MANY_REQUESTS), 1)
+        self.assertEqual(codes[-1], status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_cache_failure_allows_request(self):
+        with mock.patch.object(
+            caches["throttle"], "get_many", side_effect=ConnectionError
+        ), self.assertLogs("em_django_project.throttling", "ERROR"):
+            codes = [self.login("user@example.com").status_code for _ in range(3)]
+        self.assertEqual(codes, [status.HTTP_401_UNAUTHORIZED] * 3)
+
+
+@override_settings(**TEST_SETTINGS, EMAIL_OUTBOX_MAX_ATTEMPTS=2)
+class OutboxTests(TestCase):
+    send_messages = "django.core.mail.backends.locmem.EmailBackend.send_messages"
+
+    def enqueue(self, *accounts: str) -> None:
+        outbox.enqueue(
+            mail.EmailMessage(subject="Subject", body="Body", to=[account])
+            for account in accounts
+        )
+
+    def test_send_outbox_delivers_in_batches(self):
+        self.enqueue("a@example.com", "b@example.com", "c@example.com")
+        self.assertEqual(mail.outbox, [])
+
+        call_command("send_outbox", "--batch-size", "2", stdout=StringIO())
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox),
+            ["a@example.com", "b@example.com", "c@example.com"],
+        )
+        self.assertEqual(
+            set(OutboxEmail.objects.values_list("status", flat=True)),
+            {OutboxEmail.STATUS_SENT},
+        )
+
+    def test_failed_email_is_retried_then_given_up(self):
+        self.enqueue("a@example.com")
+        with mock.patch(self.send_messages, side_effect=SMTPException("down")):
+            self.assertEqual(outbox.drain(), 1)
+            email = OutboxEmail.objects.get()
+            self.assertEqual(email.status, OutboxEmail.STATUS_PENDING)
+            self.assertEqual(email.attempts, 1)
+            self.assertIn("down", email.last_error)
+            self.assertGreater(email.next_attempt_at, timezone.now())
+            # Отложенное письмо не отправляется до наступления срока.
+            self.assertEqual(outbox.drain(), 0)
+
+            OutboxEmail.objects.update(next_attempt_at=timezone.now())
+            with self.assertLogs("registration.outbox", "ERROR"):
+                outbox.drain()
+        email.refresh_from_db()
+        self.assertEqual(email.status, OutboxEmail.STATUS_DEAD)
+        self.assertEqual(email.attempts, 2)
+        self.assertEqual(mail.outbox, [])
+
+
+@override_settings(**{**TEST_SETTINGS, "PASSWORD_HASH_POOL_SIZE": 1})
+class HashingPoolTests(TestCase):
+    def setUp(self):
+        hashing.shutdown_pool()
+        self.addCleanup(hashing.shutdown_pool)
+
+    def test_pool_hashes_and_checks_passwords(self):
+        encoded = hashing.make_password("password")
+        self.assertTrue(encoded.startswith("md5$"))
+        self.assertTrue(hashing.check_password("password", encoded))
+        self.assertFalse(hashing.check_password("wrong", encoded))
+        passwords = ["first", "second", "third"]
+        for password, encoded in zip(passwords, hashing.make_passwords(passwords)):
+            self.assertTrue(hashing.check_password(password, encoded))
+
+    def test_broken_pool_is_recreated(self):
+        pool, _ = hashing._get_pool()
+        with self.assertRaises(BrokenProcessPool):
+            pool.submit(os._exit, 1).result()
+        # Первая попытка попадает в сломанный пул, повтор — в новый.
+        self.assertTrue(
+            hashing.check_password("password", hashing.make_password("password"))
+        )
+        self.assertIsNot(hashing._get_pool()[0], pool)
+
+    @override_settings(PASSWORD_HASH_MAX_PENDING=1, PASSWORD_HASH_WAIT_TIMEOUT=0)
+    def test_busy_pool_returns_retry_after(self):
+        caches["throttle"].clear()
+        company = Company.objects.create(company_name="Company")
+        create_user(company, "user@example.com")
+        _, slots = hashing._get_pool()
+        slots.acquire()
+        self.addCleanup(slots.release)
+
+        response = APIClient().post(
+            LOGIN_URL,
+            {"account": "user@example.com", "password": "password"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response["Retry-After"], "1")
@@ -4,6 +4,9 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework_simplejwt.views import TokenObtainPairView
+
+from em_django_project.throttling import AccountRateThrottle, IPRateThrottle
 
 from . import services
 
@@ -17,11 +20,23 @@ class RegistrationViewSet(viewsets.ViewSet):
     - sign_up: регистрация нового пользователя.
     - sign_up_complete: завершение регистрации и создание компании и администратора.
     - create_user: создание нового пользователя.
+    - invite_users: пакетное создание пользователей с приглашениями.
     - confirm_registration: подтверждение регистрации.
     - update_user: обновление информации о пользователе.
+
+    check_account, sign_up и confirm_registration ограничены по частоте
+    для IP-адреса и почты (см. em_django_project.throttling).
     """
 
-    @action(url_path="check_account", detail=False, methods=["get"])
+    throttle_classes = [IPRateThrottle, AccountRateThrottle]
+    throttle_scope = None
+
+    @action(
+        url_path="check_account",
+        detail=False,
+        methods=["get"],
+        throttle_scope="check_account",
+    )
     def check_account(self, request: Request) -> HttpResponseRedirect | Response:
         """
         Проверяет существование аккаунта.
@@ -31,23 +46,21 @@ class RegistrationViewSet(viewsets.ViewSet):
 
         Возвращает:
         - HttpResponseRedirect на страницу регистрации, если аккаунт не существует.
-        - Response с сообщением об ошибке, если аккаунт уже существует или указан невалидный email.
+        - Response с сообщением об ошибке, если аккаунт уже существует, для почты
+          уже есть действующее приглашение или указан невалидный email.
         """
-        account_check, message = services.check_account(
+        account_check, result = services.check_account(
             query_params=request.query_params
         )
         if account_check:
-            invite_token = services.create_invite_token(
-                query_params=request.query_params
-            )
-            services.send_invite_email(
-                params=request.query_params, invite_token=invite_token
-            )
+            services.send_invite_email(params=request.query_params, invite_token=result)
             return HttpResponseRedirect("/auth/api/v1/sign-up/")
         else:
-            return Response(data=message, status=status.HTTP_400_BAD_REQUEST)
+            return Response(data=result, status=status.HTTP_400_BAD_REQUEST)
 
-    @action(url_path="sign-up", detail=False, methods=["post"])
+    @action(
+        url_path="sign-up", detail=False, methods=["post"], throttle_scope="sign_up"
+    )
     def sign_up(self, request: Request) -> HttpResponseRedirect | Response:
         """
         Регистрирует нового пользователя.
@@ -102,7 +115,36 @@ class RegistrationViewSet(viewsets.ViewSet):
         )
         return Response(data=response, status=status_code)
 
-    @action(url_path="confirm-registration", detail=False, methods=["patch"])
+    @action(
+        url_path="invite_users",
+        detail=False,
+        methods=["post"],
+        permission_classes=[IsAuthenticated, IsAdminUser],
+    )
+    def invite_users(self, request: Request) -> Response:
+        """
+        Пакетно создает пользователей компании и рассылает приглашения.
+
+        Аргументы:
+        - request: объект запроса с полями items (список пользователей, не более
+          REGISTRATION_INVITE_MAX_USERS) и mode (all_or_nothing или partial).
+
+        Возвращает:
+        - Response с результатом по каждому элементу: 201, если созданы все
+          пользователи; 400, если ничего не создано; 207, если в режиме
+          partial создана только часть.
+        """
+        response, status_code = services.invite_users(
+            request_data=request.data, user=request.user
+        )
+        return Response(data=response, status=status_code)
+
+    @action(
+        url_path="confirm-registration",
+        detail=False,
+        methods=["patch"],
+        throttle_scope="confirm_registration",
+    )
     def confirm_registration(self, request: Request) -> Response:
         """
         Подтверждает регистрацию пользователя.
@@ -136,3 +178,13 @@ class RegistrationViewSet(viewsets.ViewSet):
         """
         response, status_code = services.update_user(request.data, request.user)
         return Response(data=response, status=status_code)
+
+
+class LoginView(TokenObtainPairView):
+    """
+    Вход по почте и паролю (JWT), ограниченный по частоте для IP-адреса
+    и почты.
+    """
+
+    throttle_classes = [IPRateThrottle, AccountRateThrottle]
+    throttle_scope = "login"
@@ -1,4 +1,5 @@
 from django.contrib import admin
+from tasks import search
 from tasks.models import Task
 
 
@@ -12,12 +13,19 @@ class TaskAdmin(admin.ModelAdmin):
         "status",
         "estimated_time",
     )
+    # title и description ищутся по индексу FTS5 в get_search_results.
     search_fields = (
-        "title",
-        "description",
         "author__first_name",
         "author__last_name",
         "assignee__first_name",
         "assignee__last_name",
     )
     list_filter = ("status", "deadline")
+
+    def get_search_results(self, request, queryset, search_term):
+        results, may_have_duplicates = super().get_search_results(
+            request, queryset, search_term
+        )
+        if search_term:
+            results |= search.search_tasks(queryset, search_term)
+        return results, may_have_duplicates
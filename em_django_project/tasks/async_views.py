@@ -0,0 +1,32 @@
+from django.db.models import QuerySet
+from rest_framework.request import Request
+
+from em_django_project.async_api import AsyncReadOnlyView
+
+from . import filters
+from .pagination import TaskCursorPagination
+from .serializers import TaskSerializer
+from .views import get_task_queryset
+
+
+class TaskAsyncView(AsyncReadOnlyView):
+    """
+    Асинхронный эндпоинт для чтения задач под ASGI.
+
+    Доступные действия:
+    - GET /tasks/async/api/v1/: список задач с теми же фильтрами, сортировками
+      и курсорной пагинацией, что и у TaskViewSet.
+    - GET /tasks/async/api/v1/<id>/: получение задачи по ID.
+
+    Права доступа:
+    - Только аутентифицированные пользователи.
+    """
+
+    serializer_class = TaskSerializer
+    pagination_class = TaskCursorPagination
+
+    def get_queryset(self, request: Request) -> QuerySet:
+        queryset = get_task_queryset()
+        if self.action == "list":
+            queryset = filters.filter_tasks(queryset, request.query_params)
+        return queryset
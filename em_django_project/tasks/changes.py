@@ -0,0 +1,161 @@
+"""
+Журнал изменений задач и выдача изменений для синхронизации клиентов.
+
+Клиент хранит непрозрачный токен — позицию в журнале TaskChange —
+и запрашивает изменения после нее: актуальные версии измененных задач
+и идентификаторы удаленных. Если нужные записи уже удалены сжатием
+журнала, клиент должен выполнить полную синхронизацию.
+
+Позиция — id записи, а id выдаются при вставке, не при фиксации:
+при параллельных транзакциях запись с меньшим id может стать видна
+позже записи с большим, и клиент, уже продвинувшийся дальше, потерял бы
+ее. Поэтому выдается только непрерывный префикс журнала до первой записи
+моложе TASKS_CHANGES_SETTLE_SECONDS: запись с меньшим id вставлена
+не позже нее и к этому моменту зафиксирована, если транзакции пишущих
+запросов короче этого интервала. На SQLite записи фиксируются по одной
+и в порядке id, там гарантия безусловная.
+"""
+
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Min, Q
+from django.utils import timezone
+
+from .models import TaskChange, TaskChangeLogState
+
+
+class ChangesExpired(Exception):
+    """Токен указывает на сжатую часть журнала, нужна полная синхронизация."""
+
+
+class InvalidToken(Exception):
+    """Токен синхронизации поврежден."""
+
+
+def encode_token(change_id: int) -> str:
+    return urlsafe_b64encode(f"c={change_id}".encode()).decode()
+
+
+def decode_token(token: str) -> int:
+    try:
+        prefix, change_id = urlsafe_b64decode(token.encode()).decode().split("=")
+        if prefix != "c":
+            raise ValueError
+        return int(change_id)
+    except (TypeError, ValueError, UnicodeError):
+        raise InvalidToken
+
+
+def _settled_before() -> datetime:
+    """Момент, записи до которого выдаются клиентам."""
+    return timezone.now() - timedelta(seconds=settings.TASKS_CHANGES_SETTLE_SECONDS)
+
+
+def current_token(company_id: int) -> str:
+    """Возвращает токен позиции журнала компании перед неустоявшимися записями."""
+    positions = TaskChange.objects.filter(company_id=company_id).aggregate(
+        last_id=Max("id"),
+        unsettled_id=Min("id", filter=Q(created_at__gt=_settled_before())),
+    )
+    last_id = positions["last_id"]
+    if positions["unsettled_id"] is not None:
+        last_id = positions["unsettled_id"] - 1
+    if last_id is None:
+        last_id = (
+            TaskChangeLogState.objects.filter(pk=1)
+            .values_list("compacted_through", flat=True)
+            .first()
+        )
+    return encode_token(last_id or 0)
+
+
+def record(company_id: int, task_ids, action: str = TaskChange.ACTION_UPSERT) -> None:
+    """
+    Добавляет записи в журнал изменений.
+
+    Аргументы:
+    - company_id: ID компании задач.
+    - task_ids: идентификаторы измененных задач.
+    - action: upsert (создание или изменение) или delete.
+    """
+    TaskChange.objects.bulk_create(
+        [
+            TaskChange(task_id=task_id, company_id=company_id, action=action)
+            for task_id in task_ids
+        ],
+        batch_size=settings.TASKS_BULK_BATCH_SIZE,
+    )
+
+
+def read_changes(company_id: int, since: int, limit: int) -> tuple[dict, int, bool]:
+    """
+    Читает страницу журнала компании после позиции since.
+
+    Несколько записей об одной задаче сворачиваются в последнюю. Страница
+    обрывается перед первой записью моложе TASKS_CHANGES_SETTLE_SECONDS
+    (см. описание модуля); остаток клиент получит следующим запросом.
+
+    Аргументы:
+    - company_id: ID компании.
+    - since: id последней полученной клиентом записи.
+    - limit: максимальное количество записей журнала в странице.
+
+    Возвращает:
+    - Кортеж (действия по задачам, id последней прочитанной записи, есть ли еще).
+    """
+    compacted_through = (
+        TaskChangeLogState.objects.filter(pk=1)
+        .values_list("compacted_through", flat=True)
+        .first()
+        or 0
+    )
+    if since < compacted_through:
+        raise ChangesExpired
+    entries = list(
+        TaskChange.objects.filter(company_id=company_id, id__gt=since)
+        .order_by("id")
+        .values_list("id", "task_id", "action", "created_at")[: limit + 1]
+    )
+    settled_before = _settled_before()
+    for index, entry in enumerate(entries):
+        if entry[3] > settled_before:
+            entries = entries[:index]
+            has_more = False
+            break
+    else:
+        has_more = len(entries) > limit
+    entries = entries[:limit]
+    actions = {task_id: action for _, task_id, action, _ in entries}
+    last_id = entries[-1][0] if entries else since
+    return actions, last_id, has_more
+
+
+def compact(older_than: datetime, batch_size: int) -> int:
+    """
+    Удаляет записи журнала старше older_than пачками ограниченного размера.
+
+    Возвращает:
+    - Количество удаленных записей.
+    """
+    threshold = TaskChange.objects.filter(created_at__lt=older_than).aggregate(
+        last_id=Max("id")
+    )["last_id"]
+    if threshold is None:
+        return 0
+    with transaction.atomic():
+        state, _ = TaskChangeLogState.objects.select_for_update().get_or_create(pk=1)
+        state.compacted_through = max(state.compacted_through, threshold)
+        state.save()
+    deleted = 0
+    while True:
+        ids = list(
+            TaskChange.objects.filter(id__lte=threshold)
+            .order_by("id")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        deleted += TaskChange.objects.filter(id__in=ids).delete()[0]
@@ -0,0 +1,142 @@
+"""
+Сканер просроченных задач.
+
+Каждый проход читает открытые задачи, срок которых наступил после
+сохраненной отметки (DeadlineScanState) и не позже текущего момента,
+пачками по индексу (status, deadline, id). Задачи пачки помечаются
+overdue_notified_at, напоминания ответственным ставятся в очередь писем
+(registration.outbox) и отметка сдвигается на последнюю задачу пачки —
+все в одной транзакции, поэтому напоминание не теряется и не дублируется
+при сбое между пометкой задач и отправкой.
+
+Если задача оказалась позади отметки (создана с уже прошедшим сроком,
+срок перенесли на момент до отметки, задачу переоткрыли после срока),
+rewind() возвращает отметку к этой задаче, и следующий проход ее не
+пропустит.
+"""
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from registration import outbox
+
+from .models import DeadlineScanState, Task
+
+
+def overdue_q(now=None) -> Q:
+    """Условие «задача просрочена»: открыта и срок уже прошел."""
+    return Q(status__in=Task.OPEN_STATUSES, deadline__lt=now or timezone.now())
+
+
+def _build_reminders(tasks: list[dict]) -> list[EmailMessage]:
+    return [
+        EmailMessage(
+            subject=f"Просрочена задача: {task['title']}",
+            body=(
+                f"Срок выполнения задачи «{task['title']}» (ID {task['id']}) "
+                f"истек {timezone.localtime(task['deadline']):%d.%m.%Y %H:%M}."
+            ),
+            from_email=settings.EMAIL_HOST_USER,
+            to=[task["assignee__account"]],
+        )
+        for task in tasks
+        if task["assignee__account"]
+    ]
+
+
+def send_reminders(tasks: list[dict]) -> None:
+    """Ставит напоминания ответственным в очередь писем одним INSERT."""
+    outbox.enqueue(_build_reminders(tasks))
+
+
+def rewind(tasks) -> None:
+    """
+    Возвращает отметку сканера к задачам, оказавшимся позади нее.
+
+    Вызывается после сохранения задач. Задача учитывается, если она открыта,
+    ее срок уже наступил и напоминания о нем еще не было. Отметка только
+    уменьшается, одним условным UPDATE.
+
+    Аргументы:
+    - tasks: сохраненные задачи.
+    """
+    now = timezone.now()
+    # Срок мог быть передан строкой: приводится так же, как при записи в базу.
+    to_datetime = Task._meta.get_field("deadline").get_prep_value
+    positions = []
+    for task in tasks:
+        if task.status not in Task.OPEN_STATUSES:
+            continue
+        deadline = to_datetime(task.deadline)
+        notified_at = to_datetime(task.overdue_notified_at)
+        if deadline <= now and (notified_at is None or notified_at < deadline):
+            positions.append((deadline, task.pk))
+    if not positions:
+        return
+    deadline, task_id = min(positions)
+    DeadlineScanState.objects.filter(
+        Q(last_deadline__gt=deadline)
+        | Q(last_deadline=deadline, last_task_id__gte=task_id),
+        pk=1,
+    ).update(last_deadline=deadline, last_task_id=task_id - 1, updated_at=now)
+
+
+def scan_batch(batch_size: int, now=None) -> int:
+    """
+    Обрабатывает одну пачку задач, срок которых наступил после отметки.
+
+    Аргументы:
+    - batch_size: максимальное количество задач в пачке.
+    - now: момент, до которого ищутся просроченные задачи.
+
+    Возвращает:
+    - Количество обработанных задач.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        state, _ = DeadlineScanState.objects.select_for_update().get_or_create(pk=1)
+        queryset = Task.objects.filter(overdue_q(now))
+        if state.last_deadline is not None:
+            queryset = queryset.filter(
+                Q(deadline__gt=state.last_deadline)
+                | Q(deadline=state.last_deadline, id__gt=state.last_task_id)
+            )
+        # Задача, срок которой перенесли после напоминания, напоминается
+        # снова: если новый срок позади отметки, ее вернул rewind().
+        not_notified = Q(overdue_notified_at__isnull=True) | Q(
+            overdue_notified_at__lt=F("deadline")
+        )
+        tasks = list(
+            queryset.filter(not_notified)
+            .order_by("deadline", "id")
+            .values("id", "title", "deadline", "assignee__account")[:batch_size]
+        )
+        if not tasks:
+            return 0
+        Task.objects.filter(pk__in=[task["id"] for task in tasks]).update(
+            overdue_notified_at=now
+        )
+        state.last_deadline = tasks[-1]["deadline"]
+        state.last_task_id = tasks[-1]["id"]
+        state.save()
+        send_reminders(tasks)
+    return len(tasks)
+
+
+def scan(batch_size: int | None = None, now=None) -> int:
+    """
+    Обрабатывает все задачи, срок которых наступил после отметки.
+
+    Возвращает:
+    - Количество обработанных задач.
+    """
+    batch_size = batch_size or settings.TASKS_DEADLINE_SCAN_BATCH_SIZE
+    now = now or timezone.now()
+    total = 0
+    while True:
+        processed = scan_batch(batch_size, now=now)
+        total += processed
+        if processed < batch_size:
+            return total
@@ -0,0 +1,100 @@
+from datetime import datetime
+
+from django.db.models import QuerySet
+from django.http import QueryDict
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from . import deadlines, search
+from .models import Task
+
+STATUSES = {value for value, _ in Task.STATUS_CHOICES}
+
+
+def _parse_int(query_params: QueryDict, name: str) -> int | None:
+    value = query_params.get(name)
+    if value in (None, ""):
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError({name: "Must be an integer"})
+
+
+def _parse_datetime(query_params: QueryDict, name: str):
+    value = query_params.get(name)
+    if value in (None, ""):
+        return None
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            parsed = datetime.combine(parse_date(value), datetime.min.time())
+    except (TypeError, ValueError):
+        raise ValidationError({name: "Must be an ISO 8601 date or datetime"})
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def filter_tasks(queryset: QuerySet, query_params: QueryDict) -> QuerySet:
+    """
+    Фильтрует задачи по параметрам запроса.
+
+    Каждый фильтр обслуживается индексом:
+    - status: статус или несколько статусов через запятую — (status, deadline, id).
+    - author, assignee: ID пользователя — индексы внешних ключей.
+    - deadline_after, deadline_before: границы срока выполнения
+      (включительно) — (deadline, id).
+    - observer, executor: ID пользователя — индексы промежуточных таблиц M2M.
+    - overdue: true — только просроченные открытые задачи, false — остальные;
+      (status, deadline, id).
+    - q: полнотекстовый поиск по title и description — FTS5 (см. tasks/search.py).
+
+    Аргументы:
+    - queryset: исходный набор задач.
+    - query_params: параметры запроса.
+
+    Возвращает:
+    - Отфильтрованный QuerySet.
+    """
+    statuses = query_params.get("status")
+    if statuses:
+        statuses = statuses.split(",")
+        unknown = set(statuses) - STATUSES
+        if unknown:
+            raise ValidationError({"status": f"Unknown statuses: {sorted(unknown)}"})
+        queryset = queryset.filter(status__in=statuses)
+
+    for name in ("author", "assignee"):
+        user_id = _parse_int(query_params, name)
+        if user_id is not None:
+            queryset = queryset.filter(**{f"{name}_id": user_id})
+
+    for name, relation in (("observer", "observers"), ("executor", "executors")):
+        user_id = _parse_int(query_params, name)
+        if user_id is not None:
+            through = getattr(Task, relation).through
+            queryset = queryset.filter(
+                id__in=through.objects.filter(user_id=user_id).values("task_id")
+            )
+
+    deadline_after = _parse_datetime(query_params, "deadline_after")
+    if deadline_after is not None:
+        queryset = queryset.filter(deadline__gte=deadline_after)
+    deadline_before = _parse_datetime(query_params, "deadline_before")
+    if deadline_before is not None:
+        queryset = queryset.filter(deadline__lte=deadline_before)
+
+    overdue = query_params.get("overdue")
+    if overdue in ("true", "1"):
+        queryset = queryset.filter(deadlines.overdue_q())
+    elif overdue in ("false", "0"):
+        queryset = queryset.exclude(deadlines.overdue_q())
+    elif overdue:
+        raise ValidationError({"overdue": "Must be true or false"})
+
+    query = query_params.get("q", "").strip()
+    if query:
+        queryset = search.search_tasks(queryset, query)
+    return queryset
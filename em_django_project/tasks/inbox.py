@@ -0,0 +1,103 @@
+"""
+Инкрементальное обновление входящих задач пользователей (TaskInbox).
+
+Строки TaskInbox пересчитываются только для затронутых задач и ролей:
+сохранение задачи обновляет роли author/assignee и копии статуса и срока,
+изменение observers/executors — соответствующую роль.
+"""
+
+from django.conf import settings
+
+from .models import Task, TaskInbox
+
+M2M_ROLES = {
+    "observers": TaskInbox.ROLE_OBSERVER,
+    "executors": TaskInbox.ROLE_EXECUTOR,
+}
+FK_ROLES = {
+    "author_id": TaskInbox.ROLE_AUTHOR,
+    "assignee_id": TaskInbox.ROLE_ASSIGNEE,
+}
+ALL_ROLES = tuple(FK_ROLES.values()) + tuple(M2M_ROLES.values())
+
+
+def sync_tasks(task_ids, roles=ALL_ROLES) -> None:
+    """
+    Пересчитывает строки TaskInbox для задач.
+
+    Аргументы:
+    - task_ids: идентификаторы задач.
+    - roles: роли, строки которых нужно пересчитать.
+    """
+    task_ids = list(task_ids)
+    if not task_ids:
+        return
+    TaskInbox.objects.filter(task_id__in=task_ids, role__in=roles).delete()
+    tasks = {
+        task["id"]: task
+        for task in Task.objects.filter(pk__in=task_ids).values(
+            "id", "author_id", "assignee_id", "status", "deadline"
+        )
+    }
+
+    rows = []
+    for task in tasks.values():
+        for field, role in FK_ROLES.items():
+            if role in roles and task[field] is not None:
+                rows.append((task["id"], task[field], role))
+    for relation, role in M2M_ROLES.items():
+        if role not in roles:
+            continue
+        through = getattr(Task, relation).through
+        for task_id, user_id in through.objects.filter(
+            task_id__in=tasks.keys()
+        ).values_list("task_id", "user_id"):
+            rows.append((task_id, user_id, role))
+
+    TaskInbox.objects.bulk_create(
+        [
+            TaskInbox(
+                task_id=task_id,
+                user_id=user_id,
+                role=role,
+                status=tasks[task_id]["status"],
+                deadline=tasks[task_id]["deadline"],
+            )
+            for task_id, user_id, role in rows
+        ],
+        batch_size=settings.TASKS_BULK_BATCH_SIZE,
+    )
+
+
+def sync_saved_task(task: Task) -> None:
+    """
+    Обновляет TaskInbox после сохранения задачи: роли author/assignee
+    и копии статуса и срока выполнения для остальных ролей.
+    """
+    sync_tasks([task.pk], roles=tuple(FK_ROLES.values()))
+    TaskInbox.objects.filter(task_id=task.pk).exclude(
+        status=task.status, deadline=task.deadline
+    ).update(status=task.status, deadline=task.deadline)
+
+
+def rebuild(batch_size: int = 1000) -> int:
+    """
+    Полностью перестраивает TaskInbox пакетами задач.
+
+    Возвращает:
+    - Количество обработанных задач.
+    """
+    TaskInbox.objects.all().delete()
+    count = 0
+    last_id = 0
+    while True:
+        task_ids = list(
+            Task.objects.filter(pk__gt=last_id)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not task_ids:
+            return count
+        sync_tasks(task_ids)
+        count += len(task_ids)
+        last_id = task_ids[-1]
@@ -0,0 +1,138 @@
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+from registration.models import User
+from rest_framework_simplejwt.tokens import AccessToken
+
+DEFAULT_PATHS = (
+    "/tasks/api/v1/",
+    "/tasks/async/api/v1/",
+    "/organizations/api/v1/employee/",
+    "/organizations/async/api/v1/employee/",
+)
+
+
+async def _read_response(reader: asyncio.StreamReader) -> int:
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Connection closed")
+    status_code = int(status_line.split()[1])
+    content_length = None
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            content_length = int(value.strip())
+    if content_length is None:
+        raise ConnectionError("Response without Content-Length")
+    await reader.readexactly(content_length)
+    return status_code
+
+
+async def _worker(host, port, request: bytes, deadline: float, latencies, errors):
+    reader = writer = None
+    while time.monotonic() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            started = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status_code = await _read_response(reader)
+            latencies.append(time.perf_counter() - started)
+            if status_code >= 400:
+                errors.append(status_code)
+        except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError):
+            errors.append(0)
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def _run(url: str, token: str, connections: int, duration: float) -> dict:
+    parts = urlsplit(url)
+    if parts.scheme != "http":
+        raise CommandError("Only http:// URLs are supported")
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    request = (
+        f"GET {path} HTTP/1.1\r\n"
+        f"Host: {parts.netloc}\r\n"
+        f"Authorization: Bearer {token}\r\n"
+        "Accept: application/json\r\n"
+        "Connection: keep-alive\r\n\r\n"
+    ).encode()
+    latencies, errors = [], []
+    deadline = time.monotonic() + duration
+    await asyncio.gather(
+        *(
+            _worker(
+                parts.hostname, parts.port or 80, request, deadline, latencies, errors
+            )
+            for _ in range(connections)
+        )
+    )
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / duration,
+        "p50": statistics.median(latencies) * 1000 if latencies else 0,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0,
+        "errors": len(errors),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Нагрузочный тест эндпоинтов чтения: сравнивает синхронные ViewSet "
+        "и асинхронные представления по запросам в секунду и p99 задержки. "
+        "Сервер нужно запустить отдельно, например: "
+        "uvicorn em_django_project.asgi:application --workers 1"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument(
+            "--account", required=True, help="Почта пользователя для JWT-токена."
+        )
+        parser.add_argument("--connections", type=int, default=500)
+        parser.add_argument(
+            "--duration", type=float, default=10, help="Длительность каждого теста, с."
+        )
+        parser.add_argument(
+            "--path",
+            action="append",
+            dest="paths",
+            help="Проверяемый путь; можно указать несколько раз.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(account=options["account"])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['account']} does not exist")
+        token = str(AccessToken.for_user(user))
+
+        self.stdout.write(
+            f"{'path':45} {'requests':>9} {'req/s':>9} {'p50, ms':>9} "
+            f"{'p99, ms':>9} {'errors':>7}"
+        )
+        for path in options["paths"] or DEFAULT_PATHS:
+            result = asyncio.run(
+                _run(
+                    options["base_url"].rstrip("/") + path,
+                    token,
+                    options["connections"],
+                    options["duration"],
+                )
+            )
+            self.stdout.write(
+                f"{path:45} {result['requests']:>9} {result['rps']:>9.1f} "
+                f"{result['p50']:>9.1f} {result['p99']:>9.1f} {result['errors']:>7}"
+            )
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from tasks import inbox
+
+
+class Command(BaseCommand):
+    help = "Перестраивает входящие задачи пользователей (TaskInbox)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Количество задач, пересчитываемых за один проход.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = inbox.rebuild(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt inbox for {count} tasks"))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from tasks import search
+
+
+class Command(BaseCommand):
+    help = "Перестраивает индекс полнотекстового поиска задач (FTS5)."
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            self.stdout.write("Full-text index is not used with this database")
+            return
+        count = search.rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} tasks"))
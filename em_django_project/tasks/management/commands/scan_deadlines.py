@@ -0,0 +1,40 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from tasks import deadlines
+
+
+class Command(BaseCommand):
+    help = (
+        "Находит задачи с истекшим сроком и ставит напоминания ответственным "
+        "в очередь писем (отправляет команда send_outbox)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Работать постоянно, повторяя проход с интервалом --interval.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=settings.TASKS_DEADLINE_SCAN_INTERVAL,
+            help="Интервал между проходами в секундах.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.TASKS_DEADLINE_SCAN_BATCH_SIZE,
+            help="Количество задач, обрабатываемых за одну пачку.",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            count = deadlines.scan(batch_size=options["batch_size"])
+            if count:
+                self.stdout.write(f"Processed {count} overdue tasks")
+            if not options["loop"]:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,90 @@
+# Generated by Django 5.0.4 on 2026-10-18 16:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0003_task_search_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TaskInbox",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "role",
+                    models.CharField(
+                        choices=[
+                            ("author", "Author"),
+                            ("assignee", "Assignee"),
+                            ("observer", "Observer"),
+                            ("executor", "Executor"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("New", "New"),
+                            ("In Progress", "In Progress"),
+                            ("Done", "Done"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("deadline", models.DateTimeField()),
+                (
+                    "task",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="inbox",
+                        to="tasks.task",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="inbox",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Входящая задача",
+                "verbose_name_plural": "Входящие задачи",
+                "indexes": [
+                    models.Index(
+                        fields=["user", "deadline", "id"],
+                        name="inbox_user_deadline_idx",
+                    ),
+                    models.Index(
+                        fields=["user", "status", "deadline", "id"],
+                        name="inbox_user_status_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="taskinbox",
+            constraint=models.UniqueConstraint(
+                fields=("task", "user", "role"), name="task_inbox_unique_role"
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.0.4 on 2026-10-18 16:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0005_task_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeadlineScanState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("last_deadline", models.DateTimeField(blank=True, null=True)),
+                ("last_task_id", models.BigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Состояние сканера сроков",
+                "verbose_name_plural": "Состояния сканера сроков",
+            },
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="overdue_notified_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
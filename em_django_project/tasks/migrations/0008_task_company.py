@@ -0,0 +1,79 @@
+# Generated by Django 5.0.4 on 2026-10-18 16:44
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_company(apps, schema_editor):
+    Task = apps.get_model("tasks", "Task")
+    TaskChange = apps.get_model("tasks", "TaskChange")
+    User = apps.get_model("registration", "User")
+
+    def user_company(field):
+        return Subquery(
+            User.objects.filter(pk=OuterRef(field)).values("company_id")[:1]
+        )
+
+    Task.objects.update(
+        company_id=Coalesce(user_company("author_id"), user_company("assignee_id"))
+    )
+    TaskChange.objects.update(
+        company_id=Subquery(
+            Task.objects.filter(pk=OuterRef("task_id")).values("company_id")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("registration", "0001_initial"),
+        ("tasks", "0007_task_change_log"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="task",
+            name="task_deadline_id_idx",
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="company",
+            field=models.ForeignKey(
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="tasks",
+                to="registration.company",
+            ),
+        ),
+        migrations.AddField(
+            model_name="taskchange",
+            name="company_id",
+            field=models.BigIntegerField(null=True),
+        ),
+        migrations.RunPython(fill_company, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["company", "deadline", "id"], name="task_company_deadline_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["company", "status", "deadline", "id"],
+                name="task_company_status_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="taskchange",
+            index=models.Index(
+                fields=["company_id", "id"], name="task_change_company_idx"
+            ),
+        ),
+    ]
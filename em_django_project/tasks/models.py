@@ -1,8 +1,10 @@
 from django.db import models
-from registration.models import User
+from registration.models import Company, User
 
 
 class Task(models.Model):
+    tenant_field = "company"
+
     title = models.CharField(max_length=100)
     description = models.TextField()
     author = models.ForeignKey(
@@ -19,12 +21,163 @@ class Task(models.Model):
         ("In Progress", "In Progress"),
         ("Done", "Done"),
     )
+    OPEN_STATUSES = ("New", "In Progress")
     status = models.CharField(max_length=20, choices=STATUS_CHOICES)
     estimated_time = models.PositiveIntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+    overdue_notified_at = models.DateTimeField(null=True, blank=True)
+    # Компания задачи; задачи без автора и ответственного, созданные
+    # до разделения данных по компаниям, остаются без компании.
+    company = models.ForeignKey(
+        Company,
+        related_name="tasks",
+        on_delete=models.CASCADE,
+        null=True,
+        editable=False,
+    )
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        # Задачи, созданные не через API (админка, скрипты), получают
+        # компанию автора или ответственного.
+        user_id = self.author_id or self.assignee_id
+        if self.company_id is None and user_id is not None:
+            self.company_id = (
+                User.objects.filter(pk=user_id)
+                .values_list("company_id", flat=True)
+                .first()
+            )
+        super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = "Задача"
         verbose_name_plural = "Задачи"
+        indexes = [
+            models.Index(
+                fields=["company", "deadline", "id"], name="task_company_deadline_idx"
+            ),
+            models.Index(
+                fields=["company", "status", "deadline", "id"],
+                name="task_company_status_idx",
+            ),
+            models.Index(
+                fields=["status", "deadline", "id"], name="task_status_deadline_id_idx"
+            ),
+        ]
+
+
+class DeadlineScanState(models.Model):
+    """
+    Отметка сканера просроченных задач (high-water mark).
+
+    Хранит позицию (deadline, task_id) последней обработанной задачи:
+    каждый проход сканера читает только задачи, срок которых наступил
+    после этой позиции.
+    """
+
+    last_deadline = models.DateTimeField(null=True, blank=True)
+    last_task_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.last_deadline} / {self.last_task_id}"
+
+    class Meta:
+        verbose_name = "Состояние сканера сроков"
+        verbose_name_plural = "Состояния сканера сроков"
+
+
+class TaskInbox(models.Model):
+    """
+    Денормализованный «входящий» список задач пользователя.
+
+    Одна строка на каждую роль пользователя в задаче. Статус и срок
+    выполнения копируются из задачи, чтобы экран «мои задачи» читался одним
+    индексированным запросом без объединения четырех связей Task.
+    Поддерживается сигналами (см. tasks/inbox.py).
+    """
+
+    ROLE_AUTHOR = "author"
+    ROLE_ASSIGNEE = "assignee"
+    ROLE_OBSERVER = "observer"
+    ROLE_EXECUTOR = "executor"
+    ROLE_CHOICES = (
+        (ROLE_AUTHOR, "Author"),
+        (ROLE_ASSIGNEE, "Assignee"),
+        (ROLE_OBSERVER, "Observer"),
+        (ROLE_EXECUTOR, "Executor"),
+    )
+    user = models.ForeignKey(User, related_name="inbox", on_delete=models.CASCADE)
+    task = models.ForeignKey(Task, related_name="inbox", on_delete=models.CASCADE)
+    role = models.CharField(max_length=10, choices=ROLE_CHOICES)
+    status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES)
+    deadline = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.user} — {self.task} ({self.role})"
+
+    class Meta:
+        verbose_name = "Входящая задача"
+        verbose_name_plural = "Входящие задачи"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["task", "user", "role"], name="task_inbox_unique_role"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["user", "deadline", "id"], name="inbox_user_deadline_idx"
+            ),
+            models.Index(
+                fields=["user", "status", "deadline", "id"],
+                name="inbox_user_status_idx",
+            ),
+        ]
+
+
+class TaskChange(models.Model):
+    """
+    Запись журнала изменений задач для инкрементальной синхронизации.
+
+    Журнал только дополняется: каждое создание, изменение (включая состав
+    observers/executors) и удаление задачи добавляет строку. Клиенты читают
+    записи после последнего полученного id; старые записи удаляет
+    compact_task_changes.
+    """
+
+    ACTION_UPSERT = "upsert"
+    ACTION_DELETE = "delete"
+    ACTION_CHOICES = (
+        (ACTION_UPSERT, "Upsert"),
+        (ACTION_DELETE, "Delete"),
+    )
+    task_id = models.BigIntegerField()
+    company_id = models.BigIntegerField(null=True)
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.action} {self.task_id}"
+
+    class Meta:
+        verbose_name = "Изменение задачи"
+        verbose_name_plural = "Изменения задач"
+        indexes = [
+            models.Index(fields=["company_id", "id"], name="task_change_company_idx"),
+        ]
+
+
+class TaskChangeLogState(models.Model):
+    """Граница сжатия журнала: записи с id не больше compacted_through удалены."""
+
+    compacted_through = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return str(self.compacted_through)
+
+    class Meta:
+        verbose_name = "Состояние журнала изменений"
+        verbose_name_plural = "Состояния журнала изменений"
@@ -0,0 +1,17 @@
+from em_django_project.pagination import KeysetCursorPagination
+
+
+class TaskCursorPagination(KeysetCursorPagination):
+    """
+    Пагинация списка задач.
+
+    Сортировки (параметр ``ordering``, допускается префикс ``-``):
+    - deadline: по сроку выполнения, индекс (deadline, id).
+    - status: по статусу и сроку выполнения, индекс (status, deadline, id).
+    """
+
+    orderings = {
+        "deadline": ("deadline", "id"),
+        "status": ("status", "deadline", "id"),
+    }
+    default_ordering = "deadline"
@@ -0,0 +1,105 @@
+"""
+Полнотекстовый поиск задач по title и description.
+
+На SQLite поиск выполняется по теневой таблице FTS5 ``tasks_task_fts``
+(rowid = id задачи), которая создается миграцией и синхронизируется
+сигналами при сохранении и удалении задач (см. tasks/signals.py).
+На других СУБД используется поиск подстроки.
+"""
+
+import re
+
+from django.db import connection
+from django.db.models import Q, QuerySet
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = "tasks_task_fts"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def is_available() -> bool:
+    """Возвращает True, если база данных поддерживает индекс FTS5."""
+    return connection.vendor == "sqlite"
+
+
+def build_match_query(query: str) -> str:
+    """
+    Преобразует пользовательский ввод в запрос FTS5.
+
+    Каждое слово ищется как префикс, все слова должны присутствовать
+    в задаче. Служебный синтаксис FTS5 во вводе не интерпретируется.
+    """
+    return " ".join(f'"{token}"*' for token in _TOKEN_RE.findall(query))
+
+
+def search_tasks(queryset: QuerySet, query: str) -> QuerySet:
+    """
+    Фильтрует задачи по полнотекстовому запросу.
+
+    Аргументы:
+    - queryset: исходный набор задач.
+    - query: строка поиска.
+
+    Возвращает:
+    - QuerySet задач, в title или description которых встречаются все слова.
+    """
+    match = build_match_query(query)
+    if not match:
+        return queryset.none()
+    if not is_available():
+        condition = Q()
+        for token in _TOKEN_RE.findall(query):
+            condition &= Q(title__icontains=token) | Q(description__icontains=token)
+        return queryset.filter(condition)
+    return queryset.filter(
+        id__in=RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]
+        )
+    )
+
+
+def index_tasks(tasks) -> None:
+    """Добавляет или обновляет задачи в индексе поиска."""
+    if not is_available():
+        return
+    rows = [(task.pk, task.title, task.description) for task in tasks]
+    if not rows:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(row[0],) for row in rows]
+        )
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, description) VALUES (%s, %s, %s)",
+            rows,
+        )
+
+
+def unindex_tasks(task_ids) -> None:
+    """Удаляет задачи из индекса поиска."""
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"DELETE FROM {FTS_TABLE} WHERE rowid = %s",
+            [(task_id,) for task_id in task_ids],
+        )
+
+
+def rebuild_index() -> int:
+    """
+    Полностью перестраивает индекс поиска по таблице задач.
+
+    Возвращает:
+    - Количество проиндексированных задач.
+    """
+    if not is_available():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, description) "
+            "SELECT id, title, description FROM tasks_task"
+        )
+        return cursor.rowcount
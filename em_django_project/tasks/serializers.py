@@ -1,10 +1,92 @@
 from rest_framework import serializers
 
-from .models import Task
+from em_django_project.tenancy import TenantScopedSerializerMixin
 
+from .models import Task, TaskInbox
 
-class TaskSerializer(serializers.ModelSerializer):
+
+class TaskSerializer(TenantScopedSerializerMixin, serializers.ModelSerializer):
+
+    class Meta:
+        model = Task
+        fields = (
+            "id",
+            "title",
+            "description",
+            "author",
+            "assignee",
+            "observers",
+            "executors",
+            "deadline",
+            "status",
+            "estimated_time",
+        )
+
+
+class TaskBulkItemSerializer(serializers.ModelSerializer):
+    """
+    Сериализатор одной задачи в пакетном запросе.
+
+    Ссылки на пользователей принимаются как идентификаторы без обращения
+    к базе: существование пользователей проверяется одним запросом
+    на весь пакет в services.bulk_save_tasks.
+
+    Элемент с id заменяет задачу целиком, поэтому в нем обязательны
+    и связи: пропущенное поле иначе обнулило бы ответственного или
+    удалило бы наблюдателей и исполнителей.
+    """
+
+    RELATION_FIELDS = ("author", "assignee", "observers", "executors")
+
+    id = serializers.IntegerField(required=False, min_value=1)
+    author = serializers.IntegerField(allow_null=True, required=False, min_value=1)
+    assignee = serializers.IntegerField(allow_null=True, required=False, min_value=1)
+    observers = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, default=list
+    )
+    executors = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, default=list
+    )
 
     class Meta:
         model = Task
-        fields = "__all__"
+        fields = TaskSerializer.Meta.fields
+
+    def validate(self, attrs: dict) -> dict:
+        if attrs.get("id") is not None:
+            missing = [
+                field
+                for field in self.RELATION_FIELDS
+                if field not in self.initial_data
+            ]
+            if missing:
+                raise serializers.ValidationError(
+                    {
+                        field: ["This field is required when updating a task."]
+                        for field in missing
+                    }
+                )
+        return attrs
+
+    def get_user_ids(self) -> set[int]:
+        """Возвращает идентификаторы всех пользователей, на которых ссылается задача."""
+        data = self.validated_data
+        user_ids = set(data["observers"]) | set(data["executors"])
+        user_ids.update(
+            data[field]
+            for field in ("author", "assignee")
+            if data.get(field) is not None
+        )
+        return user_ids
+
+
+class TaskInboxSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = TaskInbox
+        fields = (
+            "task",
+            "role",
+            "status",
+            "deadline",
+        )
@@ -0,0 +1,202 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from registration.models import User
+from rest_framework import status
+
+from . import changes, deadlines, inbox, search, stats
+from .models import Task
+from .serializers import TaskBulkItemSerializer
+
+BULK_MODE_ALL_OR_NOTHING = "all_or_nothing"
+BULK_MODE_PARTIAL = "partial"
+BULK_MODES = (BULK_MODE_ALL_OR_NOTHING, BULK_MODE_PARTIAL)
+
+TASK_BULK_FIELDS = (
+    "title",
+    "description",
+    "author_id",
+    "assignee_id",
+    "deadline",
+    "status",
+    "estimated_time",
+    "updated_at",
+)
+
+
+def _validate_bulk_items(items: list, company_id: int) -> tuple[list, list]:
+    """
+    Валидирует элементы пакета.
+
+    Аргументы:
+    - items: список словарей с данными задач.
+    - company_id: ID компании: пользователи и изменяемые задачи должны
+      относиться к ней.
+
+    Возвращает:
+    - Кортеж (serializers, errors): сериализаторы элементов (None для
+      невалидных) и ошибки по индексам элементов.
+    """
+    serializers = []
+    errors = [None] * len(items)
+    for index, item in enumerate(items):
+        serializer = TaskBulkItemSerializer(data=item)
+        if serializer.is_valid():
+            serializers.append(serializer)
+        else:
+            serializers.append(None)
+            errors[index] = serializer.errors
+
+    user_ids = set()
+    task_ids = set()
+    for serializer in filter(None, serializers):
+        user_ids |= serializer.get_user_ids()
+        if "id" in serializer.validated_data:
+            task_ids.add(serializer.validated_data["id"])
+    existing_users = set(
+        User.objects.filter(pk__in=user_ids, company_id=company_id).values_list(
+            "pk", flat=True
+        )
+    )
+    existing_tasks = set(
+        Task.objects.filter(pk__in=task_ids, company_id=company_id).values_list(
+            "pk", flat=True
+        )
+    )
+
+    for index, serializer in enumerate(serializers):
+        if serializer is None:
+            continue
+        item_errors = {}
+        missing_users = serializer.get_user_ids() - existing_users
+        if missing_users:
+            item_errors["users"] = [f"Users do not exist: {sorted(missing_users)}"]
+        task_id = serializer.validated_data.get("id")
+        if task_id is not None and task_id not in existing_tasks:
+            item_errors["id"] = [f"Task {task_id} does not exist"]
+        if item_errors:
+            serializers[index] = None
+            errors[index] = item_errors
+    return serializers, errors
+
+
+def _write_bulk_items(serializers: list, company_id: int) -> list:
+    """
+    Записывает валидные элементы пакета: новые задачи через bulk_create,
+    существующие через bulk_update, связи observers/executors — пакетной
+    вставкой в промежуточные таблицы.
+
+    Возвращает:
+    - Список задач в порядке элементов (None для пропущенных элементов).
+    """
+    now = timezone.now()
+    tasks = []
+    to_create = []
+    to_update = []
+    for serializer in serializers:
+        if serializer is None:
+            tasks.append(None)
+            continue
+        data = serializer.validated_data
+        task = Task(
+            pk=data.get("id"),
+            title=data["title"],
+            description=data["description"],
+            author_id=data.get("author"),
+            assignee_id=data.get("assignee"),
+            deadline=data["deadline"],
+            status=data["status"],
+            estimated_time=data["estimated_time"],
+            updated_at=now,
+            company_id=company_id,
+        )
+        (to_update if task.pk else to_create).append(task)
+        tasks.append(task)
+
+    batch_size = settings.TASKS_BULK_BATCH_SIZE
+    Task.objects.bulk_create(to_create, batch_size=batch_size)
+    Task.objects.bulk_update(to_update, TASK_BULK_FIELDS, batch_size=batch_size)
+
+    for relation in ("observers", "executors"):
+        through = getattr(Task, relation).through
+        through.objects.filter(task_id__in=[task.pk for task in to_update]).delete()
+        through.objects.bulk_create(
+            [
+                through(task_id=task.pk, user_id=user_id)
+                for task, serializer in zip(tasks, serializers)
+                if task is not None
+                for user_id in dict.fromkeys(serializer.validated_data[relation])
+            ],
+            batch_size=batch_size,
+        )
+    # bulk_create/bulk_update не отправляют post_save и m2m_changed, поэтому
+    # индекс поиска и входящие задачи обновляются явно.
+    written = to_create + to_update
+    search.index_tasks(written)
+    inbox.sync_tasks(task.pk for task in written)
+    stats.invalidate_companies([company_id])
+    changes.record(company_id, (task.pk for task in written))
+    deadlines.rewind(written)
+    return tasks
+
+
+def bulk_save_tasks(request_data: dict, company_id: int) -> tuple:
+    """
+    Пакетно создает и обновляет задачи компании.
+
+    Аргументы:
+    - request_data: данные запроса: items — список задач (элемент с id
+      заменяет существующую задачу целиком, включая author, assignee,
+      observers и executors; без id — создает новую), mode —
+      all_or_nothing (по умолчанию) или partial.
+    - company_id: ID компании текущего пользователя.
+
+    Возвращает:
+    - Кортеж с результатами по каждому элементу и статусом HTTP.
+    """
+    if not isinstance(request_data, dict):
+        return "Request body must be an object", status.HTTP_400_BAD_REQUEST
+    items = request_data.get("items")
+    mode = request_data.get("mode", BULK_MODE_ALL_OR_NOTHING)
+    if not isinstance(items, list) or not items:
+        return "items must be a non-empty list", status.HTTP_400_BAD_REQUEST
+    if len(items) > settings.TASKS_BULK_MAX_ITEMS:
+        return (
+            f"No more than {settings.TASKS_BULK_MAX_ITEMS} items are allowed",
+            status.HTTP_400_BAD_REQUEST,
+        )
+    if mode not in BULK_MODES:
+        return f"mode must be one of {BULK_MODES}", status.HTTP_400_BAD_REQUEST
+
+    serializers, errors = _validate_bulk_items(items, company_id)
+    has_errors = any(errors)
+    if has_errors and mode == BULK_MODE_ALL_OR_NOTHING:
+        serializers = [None] * len(items)
+        tasks = serializers
+    else:
+        with transaction.atomic():
+            tasks = _write_bulk_items(serializers, company_id)
+
+    results = []
+    for index, (serializer, task, item_errors) in enumerate(
+        zip(serializers, tasks, errors)
+    ):
+        if item_errors:
+            results.append({"index": index, "status": "error", "errors": item_errors})
+        elif task is None:
+            results.append({"index": index, "status": "skipped"})
+        else:
+            is_update = "id" in serializer.validated_data
+            results.append(
+                {
+                    "index": index,
+                    "status": "updated" if is_update else "created",
+                    "id": task.pk,
+                }
+            )
+
+    if not has_errors:
+        return results, status.HTTP_200_OK
+    if mode == BULK_MODE_ALL_OR_NOTHING:
+        return results, status.HTTP_400_BAD_REQUEST
+    return results, status.HTTP_207_MULTI_STATUS
@@ -0,0 +1,103 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import changes, deadlines, inbox, search, stats
+from .models import Task, TaskChange, TaskInbox
+
+
+@receiver(post_save, sender=Task)
+def index_saved_task(sender, instance: Task, **kwargs) -> None:
+    """Обновляет задачу в индексе полнотекстового поиска."""
+    search.index_tasks([instance])
+
+
+@receiver(post_delete, sender=Task)
+def unindex_deleted_task(sender, instance: Task, **kwargs) -> None:
+    """Удаляет задачу из индекса полнотекстового поиска."""
+    search.unindex_tasks([instance.pk])
+
+
+@receiver(post_save, sender=Task)
+def update_inbox_on_save(sender, instance: Task, **kwargs) -> None:
+    """Обновляет входящие задачи авторов и ответственных."""
+    inbox.sync_saved_task(instance)
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def invalidate_stats(sender, instance: Task, **kwargs) -> None:
+    """Сбрасывает кэш статистики загрузки компании задачи."""
+    stats.invalidate_companies([instance.company_id])
+
+
+@receiver(post_save, sender=Task)
+def record_saved_task(sender, instance: Task, **kwargs) -> None:
+    """Добавляет изменение задачи в журнал синхронизации."""
+    changes.record(instance.company_id, [instance.pk])
+
+
+@receiver(post_save, sender=Task)
+def rewind_deadline_scan(sender, instance: Task, **kwargs) -> None:
+    """Возвращает сканер сроков к задаче, оказавшейся позади его отметки."""
+    deadlines.rewind([instance])
+
+
+@receiver(post_delete, sender=Task)
+def record_deleted_task(sender, instance: Task, **kwargs) -> None:
+    """Добавляет удаление задачи в журнал синхронизации."""
+    changes.record(instance.company_id, [instance.pk], action=TaskChange.ACTION_DELETE)
+
+
+def update_inbox_on_members_change(
+    sender, instance, action: str, reverse: bool, pk_set, **kwargs
+) -> None:
+    """
+    Обновляет входящие задачи при изменении observers или executors.
+
+    При прямом изменении (task.observers.add(...)) instance — задача,
+    при обратном (user.observed_tasks.add(...)) — пользователь,
+    а pk_set содержит идентификаторы задач.
+    """
+    role = inbox.M2M_ROLES[
+        "observers" if sender is Task.observers.through else "executors"
+    ]
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            inbox.sync_tasks([instance.pk], roles=(role,))
+    elif action in ("post_add", "post_remove"):
+        inbox.sync_tasks(pk_set, roles=(role,))
+    elif action == "pre_clear":
+        TaskInbox.objects.filter(user=instance, role=role).delete()
+
+
+def touch_tasks_on_members_change(
+    sender, instance, action: str, reverse: bool, pk_set, **kwargs
+) -> None:
+    """
+    Обновляет updated_at задач при изменении observers или executors,
+    чтобы изменился их ETag, и добавляет изменения в журнал синхронизации.
+    """
+    if action in ("post_add", "post_remove") and not pk_set:
+        return
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            task_ids = [instance.pk]
+        else:
+            return
+    elif action in ("post_add", "post_remove"):
+        task_ids = list(pk_set)
+    elif action == "pre_clear":
+        task_ids = list(
+            sender.objects.filter(user_id=instance.pk).values_list("task_id", flat=True)
+        )
+    else:
+        return
+    Task.objects.filter(pk__in=task_ids).update(updated_at=timezone.now())
+    # И задача, и пользователь (при обратном изменении) относятся к одной компании.
+    changes.record(instance.company_id, task_ids)
+
+
+for through in (Task.observers.through, Task.executors.through):
+    m2m_changed.connect(update_inbox_on_members_change, sender=through)
+    m2m_changed.connect(touch_tasks_on_members_change, sender=through)
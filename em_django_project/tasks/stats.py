@@ -0,0 +1,71 @@
+"""
+Статистика загрузки сотрудников по задачам.
+
+Статистика компании считается одним агрегирующим запросом с группировкой
+по (assignee, status) и хранится в версионированном кэше компании
+(em_django_project.versioned_cache): при изменении задач версия
+увеличивается, и следующее чтение пересчитывает статистику. Если кэш
+недоступен, статистика считается по базе при каждом запросе.
+"""
+
+from django.conf import settings
+from django.db.models import Count, Sum
+
+from em_django_project.versioned_cache import VersionedCache
+
+from .models import Task
+
+workload_stats = VersionedCache("tasks:stats")
+
+
+def compute_workload_stats(company_id: int) -> list[dict]:
+    """
+    Считает количество задач и суммарное оценочное время по статусам
+    для каждого ответственного компании.
+
+    Аргументы:
+    - company_id: ID компании.
+
+    Возвращает:
+    - Список словарей вида {"assignee": id, "total": {...}, "statuses": {...}}.
+    """
+    rows = (
+        Task.objects.filter(company_id=company_id, assignee__isnull=False)
+        .values("assignee_id", "status")
+        .annotate(count=Count("id"), estimated_time=Sum("estimated_time"))
+        .order_by("assignee_id", "status")
+    )
+    stats = {}
+    for row in rows:
+        entry = stats.setdefault(
+            row["assignee_id"],
+            {
+                "assignee": row["assignee_id"],
+                "total": {"count": 0, "estimated_time": 0},
+                "statuses": {},
+            },
+        )
+        entry["statuses"][row["status"]] = {
+            "count": row["count"],
+            "estimated_time": row["estimated_time"],
+        }
+        entry["total"]["count"] += row["count"]
+        entry["total"]["estimated_time"] += row["estimated_time"]
+    return list(stats.values())
+
+
+def get_workload_stats(company_id: int) -> list[dict]:
+    """Возвращает статистику компании из кэша, пересчитывая ее при промахе."""
+    version = workload_stats.get_version(company_id)
+    stats = workload_stats.get(company_id, version)
+    if stats is None:
+        stats = compute_workload_stats(company_id)
+        workload_stats.set(
+            company_id, version, stats, settings.TASKS_STATS_CACHE_TIMEOUT
+        )
+    return stats
+
+
+def invalidate_companies(company_ids) -> None:
+    """Сбрасывает кэш статистики компаний после фиксации текущей транзакции."""
+    workload_stats.invalidate(company_ids)
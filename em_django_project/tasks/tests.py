@@ -0,0 +1,375 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from registration.models import Company, User
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from em_django_project.query_budget import assert_max_queries
+from em_django_project.testing import TEST_SETTINGS, broken_cache, create_user
+
+from . import changes
+from .models import Task, TaskChange, TaskChangeLogState
+from .views import TaskViewSet
+
+LIST_URL = "/tasks/api/v1/"
+
+
+def create_tasks(user: User, count: int, deadline=None, **fields) -> list[Task]:
+    deadline = deadline or timezone.now() + timedelta(days=1)
+    tasks = []
+    for number in range(count):
+        task = Task.objects.create(
+            title=f"Task {number}",
+            description="Description",
+            author=user,
+            assignee=user,
+            deadline=deadline,
+            status=fields.get("status", "New"),
+            estimated_time=1,
+        )
+        task.observers.add(user)
+        task.executors.add(user)
+        tasks.append(task)
+    return tasks
+
+
+@override_settings(**TEST_SETTINGS)
+class TaskTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = Company.objects.create(company_name="Company")
+        cls.user = create_user(cls.company, "user@example.com")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+
+class TaskQueryBudgetTests(TaskTestCase):
+    def assert_list_queries(self, page_size: int) -> None:
+        with assert_max_queries(TaskViewSet.query_budget["list"]):
+            response = self.client.get(LIST_URL, {"page_size": page_size})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), page_size)
+
+    def test_list_queries_do_not_depend_on_page_size(self):
+        create_tasks(self.user, 30)
+        self.assert_list_queries(1)
+        self.assert_list_queries(30)
+
+    def test_retrieve_within_budget(self):
+        task = create_tasks(self.user, 1)[0]
+        with assert_max_queries(TaskViewSet.query_budget["retrieve"]):
+            response = self.client.get(f"{LIST_URL}{task.pk}/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["observers"], [self.user.pk])
+
+
+class TaskConditionalRequestTests(TaskTestCase):
+    def setUp(self):
+        super().setUp()
+        self.task = create_tasks(self.user, 1)[0]
+        self.url = f"{LIST_URL}{self.task.pk}/"
+
+    def test_retrieve_not_modified(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_list_not_modified_until_task_changes(self):
+        etag = self.client.get(LIST_URL)["ETag"]
+        response = self.client.get(LIST_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.task.title = "Changed"
+        self.task.save()
+        response = self.client.get(LIST_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_etag_covers_pagination(self):
+        params = {"page_size": 2}
+        create_tasks(self.user, 1)
+        response = self.client.get(LIST_URL, params)
+        self.assertIsNone(response.data["next"])
+        etag = response["ETag"]
+
+        # Новая задача попадает только на следующую страницу.
+        create_tasks(self.user, 1)
+        response = self.client.get(LIST_URL, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(response.data["next"])
+
+        etag = response["ETag"]
+        Task.objects.order_by("-deadline", "-id").first().delete()
+        response = self.client.get(LIST_URL, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data["next"])
+
+    def test_update_with_stale_etag_fails(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.patch(
+            self.url, {"title": "First"}, format="json", HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.patch(
+            self.url, {"title": "Second"}, format="json", HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.title, "First")
+
+    def test_invalid_pk_is_not_found(self):
+        response = self.client.get(f"{LIST_URL}abc/")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TaskPaginationTests(TaskTestCase):
+    def collect_pages(self, params: dict) -> list[int]:
+        ids = []
+        response = self.client.get(LIST_URL, params)
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids += [task["id"] for task in response.data["results"]]
+            if response.data["next"] is None:
+                return ids
+            response = self.client.get(response.data["next"])
+
+    def test_pages_follow_composite_key_without_gaps(self):
+        now = timezone.now()
+        # Одинаковые сроки: порядок внутри них задает id.
+        create_tasks(self.user, 4, deadline=now + timedelta(days=2))
+        create_tasks(self.user, 3, deadline=now + timedelta(days=1))
+        create_tasks(self.user, 3, deadline=now + timedelta(days=1), status="Done")
+
+        expected = list(
+            Task.objects.order_by("deadline", "id").values_list("id", flat=True)
+        )
+        self.assertEqual(self.collect_pages({"page_size": 3}), expected)
+
+        expected = list(
+            Task.objects.order_by("-status", "-deadline", "-id").values_list(
+                "id", flat=True
+            )
+        )
+        self.assertEqual(
+            self.collect_pages({"page_size": 4, "ordering": "-status"}), expected
+        )
+
+    def test_previous_page_returns_same_tasks(self):
+        create_tasks(self.user, 6)
+        first = self.client.get(LIST_URL, {"page_size": 2})
+        second = self.client.get(first.data["next"])
+        previous = self.client.get(second.data["previous"])
+        self.assertEqual(previous.data["results"], first.data["results"])
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get(LIST_URL, {"cursor": "invalid"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TaskBulkTests(TaskTestCase):
+    url = f"{LIST_URL}bulk/"
+
+    def item(self, **fields) -> dict:
+        return {
+            "title": "Task",
+            "description": "Description",
+            "author": self.user.pk,
+            "assignee": self.user.pk,
+            "observers": [self.user.pk],
+            "executors": [],
+            "deadline": (timezone.now() + timedelta(days=1)).isoformat(),
+            "status": "New",
+            "estimated_time": 1,
+            **fields,
+        }
+
+    def test_create_and_update(self):
+        task = create_tasks(self.user, 1)[0]
+        response = self.client.post(
+            self.url,
+            {"items": [self.item(), self.item(id=task.pk, title="Updated")]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [result["status"] for result in response.data], ["created", "updated"]
+        )
+        task.refresh_from_db()
+        self.assertEqual(task.title, "Updated")
+        self.assertEqual(list(task.observers.all()), [self.user])
+        self.assertFalse(task.executors.exists())
+        created = Task.objects.get(pk=response.data[0]["id"])
+        self.assertEqual(created.company_id, self.company.pk)
+
+    def test_update_requires_relations(self):
+        task = create_tasks(self.user, 1)[0]
+        item = self.item(id=task.pk, title="Updated")
+        del item["assignee"], item["executors"]
+        response = self.client.post(self.url, {"items": [item]}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.data[0]["errors"]), {"assignee", "executors"})
+        task.refresh_from_db()
+        self.assertEqual(task.title, "Task 0")
+        self.assertEqual(task.assignee, self.user)
+        self.assertTrue(task.executors.exists())
+
+    def test_invalid_user_ids_are_item_errors(self):
+        other = create_user(
+            Company.objects.create(company_name="Other"), "other@example.com"
+        )
+        response = self.client.post(
+            self.url,
+            {
+                "mode": "partial",
+                "items": [
+                    self.item(),
+                    self.item(author=0),
+                    self.item(observers=[other.pk]),
+                ],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(
+            [result["status"] for result in response.data],
+            ["created", "error", "error"],
+        )
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_all_or_nothing_writes_nothing_on_error(self):
+        response = self.client.post(
+            self.url,
+            {"items": [self.item(), self.item(assignee=0)]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Task.objects.exists())
+
+    def test_body_must_be_object(self):
+        response = self.client.post(self.url, [self.item()], format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TaskExportTests(TaskTestCase):
+    url = f"{LIST_URL}export/"
+
+    def test_sync_export(self):
+        create_tasks(self.user, 2)
+        response = self.client.get(self.url, {"file_format": "ndjson"})
+        self.assertFalse(response.is_async)
+        self.assertEqual(len(b"".join(response.streaming_content).splitlines()), 2)
+
+    async def test_asgi_export_streams_asynchronously(self):
+        await Task.objects.acreate(
+            title="Task",
+            description="Description",
+            author=self.user,
+            assignee=self.user,
+            deadline=timezone.now(),
+            estimated_time=1,
+        )
+        response = await self.async_client.get(
+            self.url,
+            headers={"Authorization": f"Bearer {AccessToken.for_user(self.user)}"},
+        )
+        self.assertTrue(response.is_async)
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(len(content.splitlines()), 2)
+
+
+class TaskStatsTests(TaskTestCase):
+    url = f"{LIST_URL}stats/"
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_stats_invalidated_after_commit(self):
+        create_tasks(self.user, 2)
+        response = self.client.get(self.url)
+        self.assertEqual(response.data[0]["total"], {"count": 2, "estimated_time": 2})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_tasks(self.user, 1, status="Done")
+        response = self.client.get(self.url)
+        self.assertEqual(response.data[0]["total"], {"count": 3, "estimated_time": 3})
+        self.assertEqual(response.data[0]["statuses"]["Done"]["count"], 1)
+
+    def test_cache_outage_falls_back_to_database(self):
+        with mock.patch(
+            "em_django_project.versioned_cache.cache", broken_cache()
+        ), self.assertLogs("em_django_project.versioned_cache", "ERROR"):
+            with self.captureOnCommitCallbacks(execute=True):
+                create_tasks(self.user, 2)
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]["total"]["count"], 2)
+
+
+@override_settings(TASKS_CHANGES_SETTLE_SECONDS=0)
+class TaskChangesTests(TaskTestCase):
+    url = f"{LIST_URL}changes/"
+
+    def test_changes_after_token(self):
+        kept, removed = create_tasks(self.user, 2)
+        token = self.client.get(self.url).data["next"]
+
+        kept.title = "Changed"
+        kept.save()
+        removed_id = removed.pk
+        removed.delete()
+        response = self.client.get(self.url, {"since": token})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([task["id"] for task in response.data["changed"]], [kept.pk])
+        self.assertEqual(response.data["deleted"], [removed_id])
+        self.assertFalse(response.data["has_more"])
+
+        response = self.client.get(self.url, {"since": response.data["next"]})
+        self.assertEqual(response.data["changed"], [])
+        self.assertEqual(response.data["deleted"], [])
+
+    @override_settings(TASKS_CHANGES_SETTLE_SECONDS=60)
+    def test_page_stops_before_unsettled_entry(self):
+        token = self.client.get(self.url).data["next"]
+        first, second, third = create_tasks(self.user, 3)
+        # Запись second еще может ждать записей с меньшим id из других
+        # транзакций, поэтому ни она, ни более поздние записи не выдаются.
+        old = timezone.now() - timedelta(minutes=5)
+        TaskChange.objects.exclude(task_id=second.pk).update(created_at=old)
+
+        response = self.client.get(self.url, {"since": token})
+        self.assertEqual([task["id"] for task in response.data["changed"]], [first.pk])
+        self.assertFalse(response.data["has_more"])
+        first_change = TaskChange.objects.filter(task_id=first.pk).latest("id")
+        self.assertEqual(changes.decode_token(response.data["next"]), first_change.pk)
+        self.assertEqual(
+            changes.decode_token(self.client.get(self.url).data["next"]),
+            first_change.pk,
+        )
+
+        TaskChange.objects.update(created_at=old)
+        response = self.client.get(self.url, {"since": response.data["next"]})
+        self.assertEqual(
+            [task["id"] for task in response.data["changed"]], [second.pk, third.pk]
+        )
+
+    def test_compacted_token_is_gone(self):
+        create_tasks(self.user, 1)
+        token = self.client.get(self.url).data["next"]
+        TaskChangeLogState.objects.create(
+            pk=1, compacted_through=changes.decode_token(token) + 1
+        )
+        response = self.client.get(self.url, {"since": token})
+        self.assertEqual(response.status_code, status.HTTP_410_GONE)
+
+    def test_invalid_token(self):
+        response = self.client.get(self.url, {"since": "invalid"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
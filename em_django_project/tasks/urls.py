@@ -1,9 +1,13 @@
 from django.urls import path
 from rest_framework.routers import DefaultRouter
 
+from .async_views import TaskAsyncView
 from .views import TaskViewSet
 
 router = DefaultRouter()
 router.register(r"api/v1", TaskViewSet)
 
-urlpatterns = router.urls
+urlpatterns = [
+    path("async/api/v1/", TaskAsyncView.as_view(), name="task-async-list"),
+    path("async/api/v1/<str:pk>/", TaskAsyncView.as_view(), name="task-async-detail"),
+] + router.urls
@@ -1,11 +1,32 @@
-from rest_framework import viewsets
+from django.conf import settings
+from django.db.models import Prefetch, QuerySet
+from django.http import StreamingHttpResponse
+from registration.models import User
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.response import Response
 
-from .models import Task
-from .serializers import TaskSerializer
+from em_django_project.conditional import ConditionalRequestMixin
+from em_django_project.tenancy import TenantScopedMixin, scope_to_company
 
+from . import changes, export, filters, services, stats
+from .models import Task, TaskChange, TaskInbox
+from .pagination import TaskCursorPagination
+from .serializers import TaskInboxSerializer, TaskSerializer
 
-class TaskViewSet(viewsets.ModelViewSet):
+
+def get_task_queryset() -> QuerySet:
+    """Возвращает задачи с предзагруженными идентификаторами observers и executors."""
+    users = User.objects.only("id")
+    return Task.objects.prefetch_related(
+        Prefetch("observers", queryset=users),
+        Prefetch("executors", queryset=users),
+    )
+
+
+class TaskViewSet(TenantScopedMixin, ConditionalRequestMixin, viewsets.ModelViewSet):
     """
     API endpoint, который позволяет просматривать, создавать, редактировать и удалять задачи.
 
@@ -16,6 +37,11 @@ class TaskViewSet(viewsets.ModelViewSet):
     - update: Обновление задачи по ID.
     - partial_update: Частичное обновление задачи по ID.
     - destroy: Удаление задачи по ID.
+    - bulk: Пакетное создание и обновление задач.
+    - inbox: Задачи текущего пользователя во всех ролях.
+    - stats: Статистика загрузки сотрудников компании.
+    - export: Потоковая выгрузка задач в CSV или NDJSON.
+    - changes: Изменения задач после токена синхронизации.
 
     Каждая задача содержит следующую информацию:
     - title: Заголовок задачи.
@@ -28,10 +54,205 @@ class TaskViewSet(viewsets.ModelViewSet):
     - status: Текущий статус задачи (Новое, В процессе, Завершено).
     - estimated_time: Оценочное время для выполнения задачи.
 
+    Список задач отдается постранично курсорной пагинацией (без COUNT(*)):
+    - ordering: deadline (по умолчанию) или status, с префиксом "-" — по убыванию.
+    - page_size: размер страницы (не более 500).
+    - cursor: непрозрачный курсор из ссылок next/previous.
+
+    Фильтры списка (параметры запроса):
+    - status: статус или несколько статусов через запятую.
+    - author, assignee, observer, executor: ID пользователя.
+    - deadline_after, deadline_before: границы срока выполнения (ISO 8601).
+    - overdue: true — только просроченные открытые задачи.
+    - q: полнотекстовый поиск по заголовку и описанию.
+
+    Условные запросы:
+    - list, retrieve: заголовок ETag (и Last-Modified для retrieve); при
+      совпадении If-None-Match возвращается 304 (для retrieve — без
+      сериализации, для list — без тела: ETag считается по странице).
+    - update, partial_update, destroy: If-Match, при несовпадении — 412.
+
     Права доступа:
     - Только аутентифицированные пользователи могут получить доступ к этому ViewSet.
+    - Пользователь видит и изменяет только задачи своей компании.
     """
 
-    queryset = Task.objects.all()
+    queryset = get_task_queryset()
     serializer_class = TaskSerializer
+    pagination_class = TaskCursorPagination
     permission_classes = [IsAuthenticated]
+    # Аутентификация + задачи + observers + executors
+    # (+ версия задачи для retrieve).
+    query_budget = {"list": 4, "retrieve": 5, "inbox": 2, "stats": 2, "changes": 6}
+
+    def get_queryset(self) -> QuerySet:
+        """
+        Возвращает задачи с предзагруженными observers и executors.
+
+        Для M2M-полей достаточно идентификаторов пользователей, поэтому
+        каждая связь загружается одним запросом по промежуточной таблице
+        без чтения строк пользователей целиком. Количество запросов не зависит
+        от размера страницы. Задачи ограничены компанией пользователя.
+        """
+        queryset = super().get_queryset()
+        if self.action == "list":
+            queryset = filters.filter_tasks(queryset, self.request.query_params)
+        return queryset
+
+    @action(url_path="bulk", detail=False, methods=["post"])
+    def bulk(self, request: Request) -> Response:
+        """
+        Пакетно создает и обновляет задачи.
+
+        Аргументы:
+        - request: объект запроса с полями items (список задач, не более
+          TASKS_BULK_MAX_ITEMS) и mode (all_or_nothing или partial).
+
+        Возвращает:
+        - Response с результатом по каждому элементу: 200, если все элементы
+          записаны; 400, если в режиме all_or_nothing есть ошибки и ничего
+          не записано; 207, если в режиме partial записана только часть.
+        """
+        response, status_code = services.bulk_save_tasks(
+            request_data=request.data, company_id=request.user.company_id
+        )
+        return Response(data=response, status=status_code)
+
+    @action(url_path="inbox", detail=False, methods=["get"])
+    def inbox(self, request: Request) -> Response:
+        """
+        Возвращает задачи текущего пользователя во всех ролях.
+
+        Читается денормализованная таблица TaskInbox одним индексированным
+        запросом; пагинация и сортировки такие же, как у списка задач.
+
+        Аргументы:
+        - request: объект запроса. Параметры: role (author, assignee,
+          observer, executor) и status — через запятую.
+
+        Возвращает:
+        - Response со страницей записей (task, role, status, deadline).
+        """
+        queryset = TaskInbox.objects.filter(user=request.user)
+        for name in ("role", "status"):
+            values = request.query_params.get(name)
+            if values:
+                queryset = queryset.filter(**{f"{name}__in": values.split(",")})
+        page = self.paginate_queryset(queryset)
+        serializer = TaskInboxSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(url_path="stats", detail=False, methods=["get"])
+    def stats(self, request: Request) -> Response:
+        """
+        Возвращает статистику загрузки сотрудников компании текущего пользователя.
+
+        Для каждого ответственного — количество задач и суммарное оценочное
+        время по статусам и в целом. Результат кэшируется и сбрасывается
+        при изменении задач компании.
+
+        Аргументы:
+        - request: объект запроса.
+
+        Возвращает:
+        - Response со списком статистики по ответственным.
+        """
+        return Response(data=stats.get_workload_stats(request.user.company_id))
+
+    @action(url_path="export", detail=False, methods=["get"])
+    def export(self, request: Request) -> StreamingHttpResponse | Response:
+        """
+        Выгружает задачи в CSV или NDJSON потоком.
+
+        Аргументы:
+        - request: объект запроса. Параметр file_format — csv (по умолчанию)
+          или ndjson; поддерживаются те же фильтры, что и у списка задач.
+
+        Возвращает:
+        - StreamingHttpResponse с выгрузкой.
+        - Response с сообщением об ошибке, если формат не поддерживается.
+        """
+        file_format = request.query_params.get("file_format", "csv")
+        if file_format not in export.EXPORT_CONTENT_TYPES:
+            return Response(
+                data=f"file_format must be one of {tuple(export.EXPORT_CONTENT_TYPES)}",
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        queryset = filters.filter_tasks(
+            scope_to_company(Task.objects.all(), request.user.company_id),
+            request.query_params,
+        )
+        return export.export_tasks(
+            queryset,
+            file_format,
+            # WSGI-окружение всегда содержит wsgi.input, ASGI-запрос — нет.
+            asynchronous="wsgi.input" not in request.META,
+        )
+
+    @action(url_path="changes", detail=False, methods=["get"])
+    def changes(self, request: Request) -> Response:
+        """
+        Возвращает изменения задач после токена синхронизации.
+
+        Без параметра since возвращается только токен текущей позиции
+        журнала: клиент сохраняет его, загружает список задач целиком
+        и дальше запрашивает изменения после токена. Изменения последних
+        TASKS_CHANGES_SETTLE_SECONDS секунд выдаются следующими запросами,
+        чтобы не пропустить еще не зафиксированные записи с меньшим id.
+
+        Аргументы:
+        - request: объект запроса. Параметры: since — токен из предыдущего
+          ответа, limit — максимальное количество записей журнала.
+
+        Возвращает:
+        - Response с измененными задачами (changed), идентификаторами
+          удаленных задач (deleted), токеном следующего запроса (next)
+          и признаком has_more.
+        - 410, если журнал после токена уже сжат и нужна полная синхронизация.
+        """
+        since = request.query_params.get("since")
+        if not since:
+            return Response(
+                data={
+                    "changed": [],
+                    "deleted": [],
+                    "next": changes.current_token(request.user.company_id),
+                    "has_more": False,
+                }
+            )
+        try:
+            limit = min(
+                int(
+                    request.query_params.get("limit", settings.TASKS_CHANGES_PAGE_SIZE)
+                ),
+                settings.TASKS_CHANGES_PAGE_SIZE,
+            )
+            actions, last_id, has_more = changes.read_changes(
+                request.user.company_id, changes.decode_token(since), max(limit, 1)
+            )
+        except (ValueError, changes.InvalidToken):
+            return Response(
+                data="since and limit are invalid", status=status.HTTP_400_BAD_REQUEST
+            )
+        except changes.ChangesExpired:
+            return Response(
+                data="Changes are expired, full resync is required",
+                status=status.HTTP_410_GONE,
+            )
+
+        changed_ids = [
+            task_id
+            for task_id, task_action in actions.items()
+            if task_action == TaskChange.ACTION_UPSERT
+        ]
+        tasks = list(self.get_queryset().filter(pk__in=changed_ids).order_by("pk"))
+        existing_ids = {task.pk for task in tasks}
+        deleted = sorted(set(actions) - existing_ids)
+        return Response(
+            data={
+                "changed": TaskSerializer(tasks, many=True).data,
+                "deleted": deleted,
+                "next": changes.encode_token(last_id),
+                "has_more": has_more,
+            }
+        )